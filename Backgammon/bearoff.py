@@ -0,0 +1,214 @@
+import os
+import math
+import time
+import struct
+import argparse
+
+import numpy as np
+
+from board import WHITE, BLACK, BAR, SIGN, PATH, OPPONENT
+from dice import ROLLS
+
+POINTS = 6
+CHECKERS = 15
+MAX_ROLLS = 32
+POSITIONS = math.comb(CHECKERS + POINTS, POINTS)
+MAGIC = b'BOFF'
+HEADER = struct.Struct('<4sHHHI')
+
+# BINOMIALS[n][k] is n choose k, used for ranking the positions.
+BINOMIALS = [[math.comb(n, k) for k in range(0, POINTS + 1)] for n in range(0, CHECKERS + POINTS + 1)]
+
+
+def position_index(counts):
+    """
+    Ranks a one-sided home board position among every way of placing up to 15 checkers on the 6 home points.
+    Adding the borne-off checkers as a seventh pile, a position is one way of splitting 15 checkers into 7 piles,
+    which the combinatorial number system numbers from 0 to POSITIONS - 1 without any table.
+    :param counts: the number of checkers on the 1-point to the 6-point
+    :return: the index of the position, 0 being the position with no checkers left
+    """
+    index = 0
+    total = 0
+    for point in range(0, POINTS):
+        total += counts[point]
+        index += BINOMIALS[total + point][point + 1]
+    return index
+
+
+def home_counts(board, color):
+    """
+    Reads the home board of a colour, as long as all of its checkers that are not borne off are in it.
+    :param board: the Board holding the position
+    :param color: White or Black
+    :return: a tuple with the number of checkers on the 1-point to the 6-point, or None if a checker is elsewhere
+    """
+    cells = board.cells
+    sign = SIGN[color]
+    path = PATH[color]
+    if cells[BAR[color]] > 0:
+        return None
+    for i in range(0, 18):
+        if cells[path[i]] * sign > 0:
+            return None
+    return tuple(max(cells[path[24 - point]] * sign, 0) for point in range(1, POINTS + 1))
+
+
+def is_bearoff(board):
+    """
+    Checks if both colours have all of their checkers in their home boards, where the database plays perfectly.
+    :param board: the Board holding the position
+    :return: True if the position can be looked up for both colours and False otherwise
+    """
+    return home_counts(board, WHITE) is not None and home_counts(board, BLACK) is not None
+
+
+def bear_off_die(counts, die):
+    """
+    Lists the positions a single die can lead to while bearing off. A checker can move inside the home board,
+    leave from the point matching the die, or leave from the highest point when no checker sits above the die.
+    :param counts: the number of checkers on the 1-point to the 6-point
+    :param die: integer representing the value of the die
+    :return: a list of position tuples
+    """
+    positions = []
+    for point in range(die + 1, POINTS + 1):
+        if counts[point - 1] > 0:
+            moved = list(counts)
+            moved[point - 1] -= 1
+            moved[point - die - 1] += 1
+            positions.append(tuple(moved))
+
+    highest = max((point for point in range(1, POINTS + 1) if counts[point - 1] > 0), default=0)
+    if counts[die - 1] > 0 or 0 < highest < die:
+        point = die if counts[die - 1] > 0 else highest
+        moved = list(counts)
+        moved[point - 1] -= 1
+        positions.append(tuple(moved))
+    return positions
+
+
+def bear_off_roll(counts, dice):
+    """
+    Lists the positions a whole roll can lead to while bearing off. Every die can be played as long as a checker
+    is left, so no play has to be left out for using fewer dice.
+    :param counts: the number of checkers on the 1-point to the 6-point
+    :param dice: the two dice of the roll
+    :return: a set of position tuples
+    """
+    orders = [4 * [dice[0]]] if dice[0] == dice[1] else [dice, dice[::-1]]
+    reached = set()
+    for order in orders:
+        level = {counts}
+        for die in order:
+            following = set()
+            for position in level:
+                following.update(bear_off_die(position, die) if any(position) else [position])
+            level = following
+        reached.update(level)
+    return reached
+
+
+def generate_database(path):
+    """
+    Computes, for every home board position, the distribution of the number of rolls needed to bear off all of its
+    checkers when every roll is played so as to need as few rolls as possible on average, then writes it to a packed
+    binary file. Positions are handled by increasing pip count, as every play leads to a position with fewer pips.
+    The file holds a header, the expected numbers of rolls as float32 and the distributions as uint16 fractions of
+    65535, the last of the MAX_ROLLS entries also holding the longer bear-offs.
+    :param path: the path of the file
+    """
+    positions = [()]
+    for point in range(0, POINTS):
+        positions = [position + (count,) for position in positions
+                     for count in range(0, CHECKERS - sum(position) + 1)]
+    positions.sort(key=lambda position: sum((point + 1) * count for point, count in enumerate(position)))
+
+    probabilities = np.array([probability for dice, probability in ROLLS])
+    means = np.zeros(POSITIONS)
+    distributions = np.zeros((POSITIONS, MAX_ROLLS))
+    distributions[0, 0] = 1.0
+
+    for counts in positions[1:]:
+        following = [min((position_index(position) for position in bear_off_roll(counts, dice)),
+                         key=lambda index: means[index]) for dice, probability in ROLLS]
+        index = position_index(counts)
+        means[index] = 1 + probabilities @ means[following]
+        distributions[index, 1:] = probabilities @ distributions[following, :-1]
+        distributions[index, -1] += probabilities @ distributions[following, -1]
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, POINTS, CHECKERS, MAX_ROLLS, POSITIONS))
+        file.write(means.astype('<f4').tobytes())
+        file.write(np.round(distributions * 65535).astype('<u2').tobytes())
+
+
+class BearoffDatabase:
+    def __init__(self, path):
+        """
+        A one-sided bear-off database, memory-mapped from the file written by generate_database, so that opening it
+        reads nothing but the header and every lookup only touches the page holding the position.
+        :param path: the path of the file
+        """
+        with open(path, 'rb') as file:
+            magic, points, checkers, max_rolls, positions = HEADER.unpack(file.read(HEADER.size))
+        if (magic, points, checkers, max_rolls, positions) != (MAGIC, POINTS, CHECKERS, MAX_ROLLS, POSITIONS):
+            raise ValueError(f'{path} is not a bear-off database of this version.')
+
+        self.means = np.memmap(path, dtype='<f4', mode='r', offset=HEADER.size, shape=(POSITIONS,))
+        self.distributions = np.memmap(path, dtype='<u2', mode='r', offset=HEADER.size + 4 * POSITIONS,
+                                       shape=(POSITIONS, MAX_ROLLS))
+
+    def expected_rolls(self, counts):
+        """
+        Looks up the average number of rolls needed to bear off a home board position.
+        :param counts: the number of checkers on the 1-point to the 6-point
+        :return: the expected number of rolls
+        """
+        return float(self.means[position_index(counts)])
+
+    def distribution(self, counts):
+        """
+        Looks up the probabilities of bearing off a home board position in exactly 0, 1, 2, ... rolls.
+        :param counts: the number of checkers on the 1-point to the 6-point
+        :return: a 1-D array of MAX_ROLLS probabilities
+        """
+        return self.distributions[position_index(counts)] / 65535
+
+    def win_probability(self, board, color):
+        """
+        Computes the chance of the colour on roll to bear off first, both colours being in their home boards.
+        It wins in n rolls if its opponent needs at least n rolls, the opponent having rolled one time less.
+        :param board: the Board holding the position
+        :param color: the colour on roll, which has not rolled yet
+        :return: the probability of winning, or None if a checker of either colour is outside its home board
+        """
+        own = home_counts(board, color)
+        other = home_counts(board, OPPONENT[color])
+        if own is None or other is None:
+            return None
+        if not any(own):
+            return 1.0
+        if not any(other):
+            return 0.0
+
+        opponent = self.distribution(other)
+        return float(self.distribution(own) @ (1 - np.concatenate(([0.0], np.cumsum(opponent)[:-1]))))
+
+
+def main():
+    """
+    Command line entry point generating the bear-off database.
+    """
+    parser = argparse.ArgumentParser(description='Generates the one-sided bear-off database.')
+    parser.add_argument('--output', default='databases/bearoff.bin')
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    generate_database(arguments.output)
+    print(f'{POSITIONS} positions written to {arguments.output} in {time.perf_counter() - start:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
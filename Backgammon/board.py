@@ -0,0 +1,380 @@
+from array import array
+
+from zobrist import CELL_KEYS, zobrist_hash
+
+WHITE = 'White'
+BLACK = 'Black'
+
+BLACK_BAR = 24
+WHITE_BAR = 25
+WHITE_OFF = 26
+BLACK_OFF = 27
+CELLS = 28
+
+BAR = {WHITE: WHITE_BAR, BLACK: BLACK_BAR}
+OFF = {WHITE: WHITE_OFF, BLACK: BLACK_OFF}
+SIGN = {WHITE: 1, BLACK: -1}
+OPPONENT = {WHITE: BLACK, BLACK: WHITE}
+
+# The order in which each colour walks the 24 slots, from its farthest point to its 1-point.
+PATH = {WHITE: [(i + 12) % 24 for i in range(24)],
+        BLACK: [(11 - i) % 24 for i in range(24)]}
+PATH_INDEX = {WHITE: [(slot - 12) % 24 for slot in range(24)],
+              BLACK: [(11 - slot) % 24 for slot in range(24)]}
+
+INITIAL_CELLS = 28 * [0]
+for _slot, _count in ((12, 2), (23, 5), (4, 3), (6, 5)):
+    INITIAL_CELLS[_slot] = _count
+for _slot, _count in ((11, 2), (0, 5), (19, 3), (17, 5)):
+    INITIAL_CELLS[_slot] = -_count
+
+
+class Board:
+    __slots__ = ('cells', 'zobrist', 'pips')
+
+    def __init__(self, cells=None, zobrist=None, pips=None):
+        """
+        A headless board state which holds every rule of the game and needs no canvas to be evaluated.
+        The 24 points are kept in the same slot numbering as the GUI, White checkers being counted as positive
+        numbers and Black ones as negative numbers, while the bar and borne-off counters are plain counts.
+        The Zobrist hash of the position and the pip counts are only computed when they are first asked for, and are
+        then kept up to date by every move.
+        :param cells: a sequence of 28 integers to start from, the initial layout being used if none is given
+        :param zobrist: the Zobrist hash of the cells, if it is already known
+        :param pips: a dictionary holding the pip count of each colour, if they are already known
+        """
+        if cells is None:
+            cells = INITIAL_CELLS
+        self.cells = list(cells)
+        self.zobrist = zobrist
+        self.pips = pips
+
+    def copy(self):
+        """
+        Creates an independent board holding the same position.
+        :return: the new Board
+        """
+        return Board(self.cells, self.zobrist, None if self.pips is None else dict(self.pips))
+
+    def pack(self):
+        """
+        A compact representation of the position, for keeping many positions such as the history of a game.
+        :return: a bytes object holding the 28 cells as signed bytes
+        """
+        return array('b', self.cells).tobytes()
+
+    def key(self):
+        """
+        A hashable representation of the position, used for removing duplicate positions.
+        :return: a tuple of the 28 cells
+        """
+        return tuple(self.cells)
+
+    def zobrist_key(self):
+        """
+        Gets the Zobrist hash of the position, used as the key of the transposition table.
+        :return: a 64-bit integer
+        """
+        if self.zobrist is None:
+            self.zobrist = zobrist_hash(self.cells)
+        return self.zobrist
+
+    def checkers(self, color, slot):
+        """
+        Counts the checkers of a colour on a slot, the bar or the borne-off tray.
+        :param color: White or Black
+        :param slot: the slot's position on the board, or one of the bar/off indices
+        :return: the number of checkers of the given colour
+        """
+        if slot >= 24:
+            if slot == BAR[color] or slot == OFF[color]:
+                return self.cells[slot]
+            return 0
+        count = self.cells[slot] * SIGN[color]
+        return count if count > 0 else 0
+
+    def owner(self, slot):
+        """
+        Gets the colour which currently holds a slot.
+        :param slot: the slot's position on the board
+        :return: White, Black or None if the slot is empty
+        """
+        if self.cells[slot] > 0:
+            return WHITE
+        elif self.cells[slot] < 0:
+            return BLACK
+        return None
+
+    def is_open(self, color, slot):
+        """
+        Checks if a colour is allowed to land on a slot, meaning that the opponent holds at most one checker there.
+        :param color: White or Black
+        :param slot: the slot's position on the board
+        :return: True if the slot can be landed on and False otherwise
+        """
+        return self.cells[slot] * SIGN[color] >= -1
+
+    def is_blot(self, color, slot):
+        """
+        Checks if the opponent of a colour has a single checker on a slot, which would be hit when landed on.
+        :param color: White or Black
+        :param slot: the slot's position on the board
+        :return: True if the slot holds an enemy blot and False otherwise
+        """
+        return self.cells[slot] * SIGN[color] == -1
+
+    def distance(self, color, from_slot, to_slot):
+        """
+        Computes how many pips a colour travels when moving a checker between two slots.
+        :param color: White or Black
+        :param from_slot: the slot's position on the board, or the colour's bar index
+        :param to_slot: the slot's position on the board, or the colour's off index
+        :return: the number of pips, which is not positive if the move goes backwards
+        """
+        start = -1 if from_slot == BAR[color] else PATH_INDEX[color][from_slot]
+        end = 24 if to_slot == OFF[color] else PATH_INDEX[color][to_slot]
+        return end - start
+
+    def can_bear_off(self, color):
+        """
+        Checks if every checker of a colour is in its home board, which allows it to bear off.
+        :param color: White or Black
+        :return: True if the colour may bear off and False otherwise
+        """
+        if self.cells[BAR[color]] > 0:
+            return False
+        sign = SIGN[color]
+        path = PATH[color]
+        for i in range(0, 18):
+            if self.cells[path[i]] * sign > 0:
+                return False
+        return True
+
+    def destination(self, color, from_slot, die):
+        """
+        Computes where a checker would land when moved by a die, taking blocked points and bearing off into account.
+        :param color: White or Black
+        :param from_slot: the slot's position on the board, or the colour's bar index
+        :param die: integer representing the value of the die
+        :return: the slot's position, the colour's off index or -1 if the move is not possible
+        """
+        path = PATH[color]
+        if from_slot == BAR[color]:
+            to_slot = path[die - 1]
+            return to_slot if self.cells[to_slot] * SIGN[color] >= -1 else -1
+
+        end = PATH_INDEX[color][from_slot] + die
+        if end < 24:
+            to_slot = path[end]
+            return to_slot if self.cells[to_slot] * SIGN[color] >= -1 else -1
+
+        if not self.can_bear_off(color):
+            return -1
+        if end > 24:
+            sign = SIGN[color]
+            for i in range(18, PATH_INDEX[color][from_slot]):
+                if self.cells[path[i]] * sign > 0:
+                    return -1
+        return OFF[color]
+
+    def is_legal(self, color, from_slot, die):
+        """
+        Checks if a single checker move respects the rules, without looking at the remaining dice.
+        :param color: White or Black
+        :param from_slot: the slot's position on the board, or the colour's bar index
+        :param die: integer representing the value of the die
+        :return: the destination if the move is legal and -1 otherwise
+        """
+        if self.checkers(color, from_slot) == 0:
+            return -1
+        if self.cells[BAR[color]] > 0 and from_slot != BAR[color]:
+            return -1
+        return self.destination(color, from_slot, die)
+
+    def apply_move(self, color, from_slot, to_slot):
+        """
+        Moves a checker of the given colour, sending an enemy blot to the bar if there is one on the destination.
+        :param color: White or Black
+        :param from_slot: the slot's position on the board, or the colour's bar index
+        :param to_slot: the slot's position on the board, or the colour's off index
+        :return: True if an enemy checker was hit and False otherwise
+        """
+        cells = self.cells
+        sign = SIGN[color]
+        step = 1 if from_slot >= 24 else sign
+        hit = to_slot < 24 and cells[to_slot] == -sign
+
+        if self.zobrist is not None:
+            key = self.zobrist
+            key ^= CELL_KEYS[from_slot][cells[from_slot] + 15] ^ CELL_KEYS[from_slot][cells[from_slot] - step + 15]
+            if to_slot >= 24:
+                key ^= CELL_KEYS[to_slot][cells[to_slot] + 15] ^ CELL_KEYS[to_slot][cells[to_slot] + 16]
+            else:
+                landed = sign if hit else cells[to_slot] + sign
+                key ^= CELL_KEYS[to_slot][cells[to_slot] + 15] ^ CELL_KEYS[to_slot][landed + 15]
+                if hit:
+                    bar = BAR[OPPONENT[color]]
+                    key ^= CELL_KEYS[bar][cells[bar] + 15] ^ CELL_KEYS[bar][cells[bar] + 16]
+            self.zobrist = key
+
+        if self.pips is not None:
+            start = -1 if from_slot >= 24 else PATH_INDEX[color][from_slot]
+            end = 24 if to_slot >= 24 else PATH_INDEX[color][to_slot]
+            self.pips[color] -= end - start
+            if hit:
+                self.pips[OPPONENT[color]] += PATH_INDEX[OPPONENT[color]][to_slot] + 1
+
+        cells[from_slot] -= step
+        if to_slot >= 24:
+            cells[to_slot] += 1
+            return False
+
+        if hit:
+            cells[to_slot] = 0
+            cells[BAR[OPPONENT[color]]] += 1
+        cells[to_slot] += sign
+        return hit
+
+    def undo_move(self, color, from_slot, to_slot, hit):
+        """
+        Takes back a move made by apply_move, from the delta it returned, keeping the Zobrist hash and the pip counts
+        up to date the same way.
+        :param color: White or Black
+        :param from_slot: the slot the checker was moved from
+        :param to_slot: the slot the checker was moved to
+        :param hit: the value returned by apply_move, True if an enemy checker was hit
+        """
+        cells = self.cells
+        sign = SIGN[color]
+        step = 1 if from_slot >= 24 else sign
+
+        if self.zobrist is not None:
+            key = self.zobrist
+            key ^= CELL_KEYS[from_slot][cells[from_slot] + 15] ^ CELL_KEYS[from_slot][cells[from_slot] + step + 15]
+            if to_slot >= 24:
+                key ^= CELL_KEYS[to_slot][cells[to_slot] + 15] ^ CELL_KEYS[to_slot][cells[to_slot] + 14]
+            else:
+                left = -sign if hit else cells[to_slot] - sign
+                key ^= CELL_KEYS[to_slot][cells[to_slot] + 15] ^ CELL_KEYS[to_slot][left + 15]
+                if hit:
+                    bar = BAR[OPPONENT[color]]
+                    key ^= CELL_KEYS[bar][cells[bar] + 15] ^ CELL_KEYS[bar][cells[bar] + 14]
+            self.zobrist = key
+
+        if self.pips is not None:
+            start = -1 if from_slot >= 24 else PATH_INDEX[color][from_slot]
+            end = 24 if to_slot >= 24 else PATH_INDEX[color][to_slot]
+            self.pips[color] += end - start
+            if hit:
+                self.pips[OPPONENT[color]] -= PATH_INDEX[OPPONENT[color]][to_slot] + 1
+
+        cells[from_slot] += step
+        if to_slot >= 24:
+            cells[to_slot] -= 1
+        elif hit:
+            cells[to_slot] = -sign
+            cells[BAR[OPPONENT[color]]] -= 1
+        else:
+            cells[to_slot] -= sign
+
+    def apply_play(self, color, play):
+        """
+        Makes every move of a play, in order.
+        :param color: White or Black
+        :param play: a sequence of (from_slot, to_slot) pairs
+        :return: the tuple of the hit flags of the moves, which undo_play needs
+        """
+        return tuple(self.apply_move(color, from_slot, to_slot) for from_slot, to_slot in play)
+
+    def undo_play(self, color, play, hits):
+        """
+        Takes back a play made by apply_play, its moves being undone in the reverse order.
+        :param color: White or Black
+        :param play: a sequence of (from_slot, to_slot) pairs
+        :param hits: the tuple returned by apply_play
+        """
+        for i in range(len(play) - 1, -1, -1):
+            self.undo_move(color, play[i][0], play[i][1], hits[i])
+
+    def pip_count(self, color):
+        """
+        Gets the number of pips a colour still has to travel in order to bear off every checker.
+        :param color: White or Black
+        :return: the pip count
+        """
+        if self.pips is None:
+            self.pips = {WHITE: self.count_pips(WHITE), BLACK: self.count_pips(BLACK)}
+        return self.pips[color]
+
+    def count_pips(self, color):
+        """
+        Computes the pip count of a colour from scratch, by walking along its path.
+        :param color: White or Black
+        :return: the pip count
+        """
+        sign = SIGN[color]
+        path = PATH[color]
+        total = 25 * self.cells[BAR[color]]
+        for i in range(0, 24):
+            count = self.cells[path[i]] * sign
+            if count > 0:
+                total += (24 - i) * count
+        return total
+
+    def has_contact(self):
+        """
+        Checks if the two colours can still hit or block each other, which is the case as long as a checker is on the
+        bar or the rearmost checker of one colour has not yet passed the rearmost checker of the other one.
+        :return: True if there is contact and False if the game has become a pure race
+        """
+        cells = self.cells
+        if cells[WHITE_BAR] > 0 or cells[BLACK_BAR] > 0:
+            return True
+
+        # Both rearmost checkers are looked for along White's path, White walking it forwards and Black backwards.
+        path = PATH[WHITE]
+        white = 0
+        while white < 24 and cells[path[white]] <= 0:
+            white += 1
+        black = 23
+        while black >= 0 and cells[path[black]] >= 0:
+            black -= 1
+        return white < black
+
+    def winner(self):
+        """
+        Checks if one of the colours has borne off all of its checkers.
+        :return: White, Black or None if the game is still on-going
+        """
+        if self.cells[WHITE_OFF] == 15:
+            return WHITE
+        elif self.cells[BLACK_OFF] == 15:
+            return BLACK
+        return None
+
+    def result(self, color):
+        """
+        Computes how many points the winner collects: 1 for a plain win, 2 for a gammon and 3 for a backgammon.
+        :param color: the colour which has won the game
+        :return: the number of points won
+        """
+        loser = OPPONENT[color]
+        if self.cells[OFF[loser]] > 0:
+            return 1
+        if self.cells[BAR[loser]] > 0:
+            return 3
+        sign = SIGN[loser]
+        path = PATH[loser]
+        for i in range(0, 6):
+            if self.cells[path[i]] * sign > 0:
+                return 3
+        return 2
+
+
+def unpack_board(data):
+    """
+    Rebuilds a board from the representation made by Board.pack.
+    :param data: a bytes object holding the 28 cells as signed bytes
+    :return: the Board
+    """
+    return Board(array('b', data))
@@ -0,0 +1,99 @@
+import queue
+import threading
+
+from bots import choose_play
+
+
+class BotWorker:
+    def __init__(self, root, interval=16):
+        """
+        Lets the computer choose its play in a background thread, so that the tkinter event loop keeps handling events
+        and redrawing the window while the computer searches. The play is sent back through a thread-safe queue, which
+        is polled from the event loop with root.after, every search having its own cancellation token. A search only
+        starts once the one before it has stopped, the searches sharing the computer's transposition table.
+        :param root: the root of tkinter
+        :param interval: the time between two polls of the queue in milliseconds
+        """
+        self.root = root
+        self.interval = interval
+        self.results = queue.Queue()
+        self.token = None
+        self.pending = None
+        self.thread = None
+
+    def start(self, board, color, dice, game_mode, done, failed):
+        """
+        Starts choosing a play, cancelling the one being chosen if there is any.
+        :param board: the Board on which the computer moves, copied so that the game can go on changing its own
+        :param color: the colour played by the computer
+        :param dice: the list of dice to be played
+        :param game_mode: the GameMode deciding how strong the computer is
+        :param done: function called from the event loop with the chosen play
+        :param failed: function called from the event loop with the exception raised if no play could be chosen
+        """
+        self.cancel()
+        self.token = threading.Event()
+        self.thread = threading.Thread(target=self.work,
+                                       args=(self.token, board.copy(), color, list(dice), game_mode, self.thread),
+                                       daemon=True)
+        self.thread.start()
+        self.pending = self.root.after(self.interval, self.poll, done, failed)
+
+    def work(self, token, board, color, dice, game_mode, previous):
+        """
+        Chooses the play in the background thread and sends it to the queue, together with the token of its search.
+        :param token: the threading.Event cancelling the search
+        :param board: the Board on which the computer moves
+        :param color: the colour played by the computer
+        :param dice: the list of dice to be played
+        :param game_mode: the GameMode deciding how strong the computer is
+        :param previous: the thread of the search before, which has been cancelled and is waited for, or None
+        """
+        if previous is not None:
+            previous.join()
+        if token.is_set():
+            return
+        try:
+            self.results.put((token, choose_play(board, color, dice, game_mode, cancel=token), None))
+        except Exception as error:
+            self.results.put((token, None, error))
+
+    def poll(self, done, failed):
+        """
+        Checks the queue for the play, dropping those of cancelled searches, and polls again later if it is not there.
+        :param done: function called with the chosen play
+        :param failed: function called with the exception raised by the search
+        """
+        self.pending = None
+        while True:
+            try:
+                token, play, error = self.results.get_nowait()
+            except queue.Empty:
+                self.pending = self.root.after(self.interval, self.poll, done, failed)
+                return
+            if token is self.token:
+                break
+
+        self.token = None
+        if error is not None:
+            failed(error)
+        else:
+            done(play)
+
+    def cancel(self):
+        """
+        Stops the search going on, if there is any, its play being dropped whenever it is sent back.
+        """
+        if self.token is not None:
+            self.token.set()
+            self.token = None
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+
+    def busy(self):
+        """
+        Checks if a play is being chosen.
+        :return: True if the computer is searching and False otherwise
+        """
+        return self.token is not None
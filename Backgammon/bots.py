@@ -0,0 +1,98 @@
+import os
+import secrets
+
+from board import OPPONENT
+from game_modes import GameMode
+from network import load_network
+from move_generator import legal_positions
+from batch_evaluation import to_array, evaluate_batch
+from search import ExpectiminimaxSearch
+from bearoff import BearoffDatabase, home_counts, is_bearoff
+from race import evaluate_race
+from opening_book import OpeningBook
+
+HARD_TIME_BUDGET = 1.0
+# Two plies complete well within the budget, while a third one rarely finishes even the first play in a second.
+HARD_MAX_DEPTH = 2
+WEIGHTS_PATH = 'weights/network.npy'
+BEAROFF_PATH = 'databases/bearoff.bin'
+OPENING_BOOK_PATH = 'databases/opening_book.bin'
+
+
+def create_hard_search():
+    """
+    Creates the search used by the HARD computer, evaluating positions with the trained network when its weights
+    are available and with the static evaluation otherwise.
+    :return: the ExpectiminimaxSearch
+    """
+    if os.path.exists(WEIGHTS_PATH):
+        network = load_network(WEIGHTS_PATH)
+        return ExpectiminimaxSearch(evaluator=network.evaluate, batch_evaluator=network.evaluate_boards,
+                                    max_depth=HARD_MAX_DEPTH, time_budget=HARD_TIME_BUDGET)
+    return ExpectiminimaxSearch(max_depth=HARD_MAX_DEPTH, time_budget=HARD_TIME_BUDGET)
+
+
+# Kept between moves, so that its transposition table carries over from one turn to the next.
+hard_search = create_hard_search()
+bearoff_database = BearoffDatabase(BEAROFF_PATH) if os.path.exists(BEAROFF_PATH) else None
+opening_book = OpeningBook(OPENING_BOOK_PATH)
+
+
+def bearoff_play(board, color, dice):
+    """
+    Picks the play which leaves the opponent the lowest chance of bearing off first, looked up in the bear-off
+    database, and among those the one needing the fewest rolls on average.
+    :param board: the Board on which the computer moves, both colours having all their checkers home
+    :param color: the colour played by the computer
+    :param dice: the list of dice to be played
+    :return: a tuple of (from_slot, to_slot) pairs, which is empty when no die can be played
+    """
+    def value(candidate):
+        after = candidate[1]
+        return (-bearoff_database.win_probability(after, OPPONENT[color]),
+                -bearoff_database.expected_rolls(home_counts(after, color)))
+    return max(legal_positions(board, color, dice), key=value)[0]
+
+
+def race_play(board, color, dice):
+    """
+    Picks the play with the best race evaluation, looked up from the effective pip counts without any search.
+    :param board: the Board on which the computer moves, which has no contact left
+    :param color: the colour played by the computer
+    :param dice: the list of dice to be played
+    :return: a tuple of (from_slot, to_slot) pairs, which is empty when no die can be played
+    """
+    return max(legal_positions(board, color, dice), key=lambda candidate: evaluate_race(candidate[1], color))[0]
+
+
+def choose_play(board, color, dice, game_mode, rng=None, cancel=None):
+    """
+    Picks the play the computer makes for a roll, depending on its selected level of difficulty.
+    :param board: the Board on which the computer moves
+    :param color: the colour played by the computer
+    :param dice: the list of dice to be played
+    :param game_mode: the GameMode deciding how strong the computer is
+    :param rng: a random.Random-like object for the EASY computer's choices, the secrets module being used if none
+    is given
+    :param cancel: optional threading.Event stopping the HARD computer's search early, as when the game is left
+    :return: a tuple of (from_slot, to_slot) pairs, which is empty when no die can be played
+    """
+    if game_mode != GameMode.EASY:
+        if bearoff_database is not None and is_bearoff(board):
+            return bearoff_play(board, color, dice)
+        if not board.has_contact():
+            return race_play(board, color, dice)
+
+    if game_mode == GameMode.HARD:
+        play = opening_book.lookup(board, color, dice)
+        if play is not None:
+            return play
+        return hard_search.choose_play(board, color, dice, cancel)
+
+    candidates = list(legal_positions(board, color, dice))
+
+    if game_mode == GameMode.EASY:
+        return (secrets if rng is None else rng).choice(candidates)[0]
+
+    values = evaluate_batch(to_array(after for play, after in candidates), color)
+    return candidates[int(values.argmax())][0]
@@ -0,0 +1,75 @@
+import secrets
+
+import numpy as np
+
+# The 21 distinct outcomes of a roll, with their probabilities.
+ROLLS = [([first, second], 1 / 36 if first == second else 2 / 36)
+         for first in range(1, 7) for second in range(first, 7)]
+
+
+class DiceSource:
+    """
+    The interface of every source of dice: roll() returns the two dice of a roll as a tuple of integers.
+    """
+    def roll(self):
+        """
+        Rolls the two dice.
+        :return: a (first, second) tuple of integers between 1 and 6
+        """
+        raise NotImplementedError
+
+
+class SecureDice(DiceSource):
+    """
+    Dice drawn from the operating system's secure generator, one call per die, used for games against humans.
+    """
+    def roll(self):
+        """
+        Rolls the two dice with secrets.choice.
+        :return: a (first, second) tuple of integers between 1 and 6
+        """
+        return secrets.choice(range(1, 7)), secrets.choice(range(1, 7))
+
+
+class SeededDice(DiceSource):
+    def __init__(self, seed=None, block_size=4096):
+        """
+        Fast, reproducible dice for simulations, drawn in NumPy blocks and handed out one roll at a time.
+        :param seed: anything numpy.random.default_rng accepts, such as an integer or a list of integers
+        :param block_size: the number of dice drawn at once
+        """
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size - block_size % 2
+        self.values = []
+        self.index = 0
+
+    def roll(self):
+        """
+        Takes the next two dice of the current block, drawing a new block when it is used up.
+        :return: a (first, second) tuple of integers between 1 and 6
+        """
+        if self.index == len(self.values):
+            self.values = self.generator.integers(1, 7, size=self.block_size, dtype=np.int8).tolist()
+            self.index = 0
+        self.index += 2
+        return self.values[self.index - 2], self.values[self.index - 1]
+
+
+class ScriptedDice(DiceSource):
+    def __init__(self, rolls):
+        """
+        Dice replaying a fixed list of rolls, for replaying recorded games and for reproducing positions.
+        :param rolls: a sequence of (first, second) tuples
+        """
+        self.rolls = list(rolls)
+        self.index = 0
+
+    def roll(self):
+        """
+        Replays the next roll of the script.
+        :return: a (first, second) tuple of integers between 1 and 6
+        """
+        if self.index == len(self.rolls):
+            raise IndexError('The scripted dice have no rolls left.')
+        self.index += 1
+        return tuple(self.rolls[self.index - 1])
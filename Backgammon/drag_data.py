@@ -1,4 +1,6 @@
 class DragData:
+    __slots__ = ('from_slot', 'from_position', 'index', 'color', 'x', 'y')
+
     def __init__(self, from_slot=None, from_position=None, index=None, color=None, x=0, y=0):
         """
         DragData is meant to hold all the necessary information for handling the dragging of widgets on the tkinter canvas's surface.
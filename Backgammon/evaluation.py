@@ -0,0 +1,69 @@
+import math
+
+from board import BAR, OFF, SIGN, PATH, OPPONENT
+
+LOWER = -1.0
+UPPER = 1.0
+
+WEIGHTS = {'pips': 0.015, 'blots': -0.12, 'home_points': 0.1, 'prime': 0.08, 'anchors': 0.05, 'bar': -0.15,
+           'off': 0.03}
+
+
+def features(board, color):
+    """
+    Computes the cheap positional terms of one side of the board, looking at it from the colour's own path.
+    :param board: the Board to be inspected
+    :param color: White or Black
+    :return: a dictionary with the pip count, blots, made home points, longest prime, anchors, bar and off counters
+    """
+    cells = board.cells
+    sign = SIGN[color]
+    path = PATH[color]
+
+    pips = 25 * cells[BAR[color]]
+    blots = 0
+    home_points = 0
+    anchors = 0
+    prime = 0
+    run = 0
+    for i in range(0, 24):
+        count = cells[path[i]] * sign
+        if count > 0:
+            pips += (24 - i) * count
+        if count == 1:
+            blots += 1
+        if count >= 2:
+            run += 1
+            if run > prime:
+                prime = run
+            if i < 6:
+                anchors += 1
+            elif i >= 18:
+                home_points += 1
+        else:
+            run = 0
+
+    return {'pips': pips, 'blots': blots, 'home_points': home_points, 'prime': prime, 'anchors': anchors,
+            'bar': cells[BAR[color]], 'off': cells[OFF[color]]}
+
+
+def evaluate(board, color):
+    """
+    A cheap static evaluation of a position, used for ordering plays and at the leaves of the search.
+    Every term is taken as the difference between the two sides, so the value of a position for one colour is
+    always the opposite of its value for the other one.
+    :param board: the Board to be evaluated
+    :param color: the colour from whose point of view the position is evaluated
+    :return: a float between -1 (certain loss) and 1 (certain win)
+    """
+    winner = board.winner()
+    if winner is not None:
+        return UPPER if winner == color else LOWER
+
+    own = features(board, color)
+    other = features(board, OPPONENT[color])
+
+    score = WEIGHTS['pips'] * (other['pips'] - own['pips'])
+    for term in ('blots', 'home_points', 'prime', 'anchors', 'bar', 'off'):
+        score += WEIGHTS[term] * (own[term] - other[term])
+    return math.tanh(score)
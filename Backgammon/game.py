@@ -1,12 +1,27 @@
-import secrets
+import os
+import traceback
 
 from slot import Slot
+from geometry import BoardGeometry
+from board import Board
+from dice import SecureDice
+from bots import bearoff_database
+from bot_worker import BotWorker
+from bearoff import home_counts, is_bearoff
 from piece import Piece
 from status import Status
 from drag_data import DragData
-from PIL import Image, ImageTk
+from menus import Menu
 from ui_button import UIButton
 from game_modes import GameMode
+from move_generator import legal_plays, playable_dice, first_moves
+from simulation import dice_to_moves
+from record import RecordWriter, RECORD_PATH
+from snapshot import pack_snapshot, unpack_snapshot, write_snapshot, read_snapshot, SAVE_PATH
+
+# The computer's pieces slide to their new slots in ANIMATION_FRAMES frames of FRAME_INTERVAL milliseconds.
+ANIMATION_FRAMES = 12
+FRAME_INTERVAL = 16
 
 
 class Game:
@@ -23,6 +38,7 @@ class Game:
 
         self.turn_index = None
         self.status_index = None
+        self.hint_index = None
 
         self.diameter = None
         self.margin = None
@@ -31,47 +47,191 @@ class Game:
         self.y_up = None
         self.x_right = None
         self.y_down = None
+        self.geometry = None
 
-        self.slots = 26 * [Slot()]
-        self.white_pieces = 15 * [Piece(color='White')]
-        self.black_pieces = 15 * [Piece(color='Black')]
+        self.slots = [Slot(position=i) for i in range(0, 26)]
+        self.white_pieces = [Piece(position=i, color='White') for i in range(0, 15)]
+        self.black_pieces = [Piece(position=i, color='Black') for i in range(0, 15)]
+        self.checkers = {}
         self.drag_data = DragData()
 
         self.roll_button = UIButton()
         self.dice_1 = UIButton()
         self.dice_2 = UIButton()
+        self.dice_values = [1, 1]
         self.player_1 = []
         self.player_2 = []
 
+        self.board = Board()
+        self.dice = SecureDice()
         self.moves = []
         self.jail = {'White': [], 'Black': []}
 
-    def update_game(self, event):
+        self.played = []
+        self.recorder = None
+        self.recording = True
+
+        self.history = []
+        self.undone = []
+
+        self.worker = BotWorker(gui.root, FRAME_INTERVAL)
+        self.animation = []
+        self.frame = None
+
+    def update_game(self, width, height):
         """
-        Initialises the game with its default values.
-        :param event: widget representing the event which triggered this function's call (mainly used for getting the window's size)
+        Initialises the game with its default values the first time, and afterwards fits the existing items to the window.
+        :param width: the width of the window
+        :param height: the height of the window
         """
         self.diameter = 0.81 * self.gui.size / 12
         self.margin = 0.09 * self.gui.size / 24
-        self.width = event.widget.winfo_width()
-        self.height = event.widget.winfo_height()
+        self.width = width
+        self.height = height
+        self.geometry = BoardGeometry(self.x_left, self.y_up, self.x_right, self.y_down, self.gui.triangle_width,
+                                      self.margin + self.diameter)
 
-        if self.turn == 'none_1':
+        if self.status is None:
             self.new_game()
             self.gui.root.resizable(False, False)
+        else:
+            self.layout()
+
+    def layout(self):
+        """
+        Moves and restyles every item of the game to fit the window's size and theme, without creating any of them again.
+        """
+        self.update_player()
+        self.update_status()
+        self.update_hint()
+        self.draw_roll_button()
+        self.draw_dice()
+
+        for slot in self.slots[0:24]:
+            for height, piece in enumerate(slot.pieces):
+                self.gui.renderer.draw(piece.index, 'oval', self.piece_coordinates(slot.position, height),
+                                       fill=self.piece_fill(piece.color))
+        for color in ('White', 'Black'):
+            for height, piece in enumerate(self.jail[color]):
+                self.gui.renderer.draw(piece.index, 'oval', self.jail_coordinates(color, height),
+                                       fill=self.piece_fill(color))
 
     def new_game(self):
         """
         Initialises the game data with their respective default values.
         """
+        self.stop_computer()
+        self.discard_record()
+        self.recording = True
+        self.board = Board()
+        self.history = []
+        self.undone = []
         self.status = Status.ROLL
         self.update_player()
         self.update_status()
         self.draw_roll_button()
         self.update_dice(1, 1)
 
+        self.bind_checkers()
+        self.bind_keys()
         self.set_new_slots()
 
+    def bind_checkers(self):
+        """
+        Binds the dragging of the pieces once for the whole game, on the tag shared by every piece.
+        """
+        self.gui.main_canvas.tag_bind('checker', '<ButtonPress-1>', self.press)
+        self.gui.main_canvas.tag_bind('checker', '<ButtonRelease-1>', self.drag_stop)
+        self.gui.main_canvas.tag_bind('checker', '<B1-Motion>', self.drag)
+
+    def bind_keys(self):
+        """
+        Binds the shortcuts for saving the game, for loading the saved one and for taking back and replaying moves.
+        """
+        self.gui.root.bind('<Control-s>', lambda event: self.save())
+        self.gui.root.bind('<Control-o>', lambda event: self.load())
+        self.gui.root.bind('<Control-z>', lambda event: self.undo())
+        self.gui.root.bind('<Control-y>', lambda event: self.redo())
+
+    def snapshot(self):
+        """
+        Captures the state of the game, as a fixed-layout buffer of a few dozen bytes which holds no canvas items.
+        :return: the bytes of the snapshot
+        """
+        return pack_snapshot(self.board, self.dice_values, self.moves, self.turn, self.status)
+
+    def restore(self, data):
+        """
+        Brings the game back to a snapshot, going once over the cells of its board to give every piece its slot and move its canvas item there. Pieces borne off lose their items, which are created again when they come back. The computer moves at once if the game was saved with its pieces to move, in a game against another player.
+        :param data: the bytes of the snapshot
+        """
+        self.stop_computer()
+        self.board, self.dice_values, self.moves, self.turn, self.status = unpack_snapshot(data)
+        self.drag_data = DragData()
+        self.played = []
+        self.history = []
+        self.undone = []
+
+        for slot in self.slots:
+            slot.pieces = []
+        self.jail = {'White': [], 'Black': []}
+        used = {'White': 0, 'Black': 0}
+
+        for cell, value in enumerate(self.board.cells):
+            if cell < 24:
+                color = 'White' if value > 0 else 'Black'
+            else:
+                color = 'Black' if cell == 24 or cell == 27 else 'White'
+
+            for height in range(0, abs(value)):
+                piece = self.pieces(color)[used[color]]
+                used[color] += 1
+                piece.slot = cell
+                if cell >= 26:
+                    self.erase_checker(piece)
+                    continue
+
+                if cell >= 24:
+                    self.draw_checker(piece, self.jail_coordinates(color, height))
+                    self.jail[color].append(piece)
+                else:
+                    self.draw_checker(piece, self.piece_coordinates(cell, height))
+                self.slots[cell].pieces.append(piece)
+
+        # During the opening roll, the dice last rolled are those of the first player, which the second one has to beat.
+        self.player_1 = list(self.dice_values) if self.turn == 'none_2' else []
+        self.player_2 = []
+
+        self.update_player()
+        self.update_status()
+        self.update_hint()
+        self.update_dice(*self.dice_values)
+
+    def save(self):
+        """
+        Saves the game to a file, unless the computer is in the middle of its turn.
+        """
+        if self.status != Status.THINK:
+            write_snapshot(SAVE_PATH, self.snapshot())
+
+    def load(self):
+        """
+        Resumes the saved game, if there is one. The game in progress is dropped from the game record, and the resumed one is not recorded, the record of a game having to start from the initial position. Recording starts again with the next new game.
+        """
+        if os.path.exists(SAVE_PATH):
+            self.discard_record()
+            self.restore(read_snapshot(SAVE_PATH))
+            self.recording = False
+
+    def press(self, event):
+        """
+        Starts dragging the piece under the cursor.
+        :param event: event which triggered the function, used for getting the x and y coordinates of the cursor
+        """
+        index = self.gui.main_canvas.find_withtag('current')
+        if index and index[0] in self.checkers:
+            self.drag_start(event, self.checkers[index[0]])
+
     def update_player(self):
         """
         Updates the player text on the right of the screen according to which of the two's turn it is. Now it also supports Nicknames that have to be added at a previous step.
@@ -82,39 +242,36 @@ class Game:
         elif self.turn == 'none_2' or self.turn == 'Black':
             player_name = self.gui.player2.name
 
-        self.gui.main_canvas.delete(self.turn_index)
-
         font = 'Century ' + str(int(min(self.width / 32, self.height / 12))) + ' bold'
-        self.turn_index = self.gui.main_canvas.create_text(self.width - (self.width - self.gui.size) / 4,
-                                                           self.height / 2 - 0.05 * self.height,
-                                                           fill=self.gui.theme.font_color,
-                                                           font=font,
-                                                           text=player_name)
+        self.turn_index = self.gui.renderer.draw(self.turn_index, 'text',
+                                                 (self.width - (self.width - self.gui.size) / 4,
+                                                  self.height / 2 - 0.05 * self.height),
+                                                 tags=Menu.GAME_MENU.name,
+                                                 fill=self.gui.theme.font_color,
+                                                 font=font,
+                                                 text=player_name)
 
     def update_status(self):
         """
         Updates the status below the player with values such as Move and Roll in order to suggest to the human player what kind of action he is required to take now.
         """
-        self.gui.main_canvas.delete(self.status_index)
         font = 'Century ' + str(int(min(self.width / 32, self.height / 12))) + ' bold'
-        self.status_index = self.gui.main_canvas.create_text(self.width - (self.width - self.gui.size) / 4,
-                                                             self.height / 2 + 0.05 * self.height,
-                                                             fill=self.gui.theme.font_color,
-                                                             font=font,
-                                                             text=self.status.value)
+        self.status_index = self.gui.renderer.draw(self.status_index, 'text',
+                                                   (self.width - (self.width - self.gui.size) / 4,
+                                                    self.height / 2 + 0.05 * self.height),
+                                                   tags=Menu.GAME_MENU.name,
+                                                   fill=self.gui.theme.font_color,
+                                                   font=font,
+                                                   text=self.status.value)
 
     def draw_roll_button(self):
         """
-        This function is only called once and its role is to display the Roll button underneath the dices on the left of the screen.
+        Its role is to display the Roll button underneath the dices on the left of the screen, the click being bound when it is first drawn.
         """
-        self.roll_button.image = ImageTk.PhotoImage(
-            Image.open(self.gui.theme.roll_path).resize(
-                (int((self.width - self.gui.size) / 4), int(self.height * 0.15)), Image.ANTIALIAS))
-        self.roll_button.index = self.gui.main_canvas.create_image((self.width - self.gui.size) / 4,
-                                                                   self.height / 2 + 0.15 * self.height,
-                                                                   image=self.roll_button.image)
-
-        self.gui.main_canvas.tag_bind(self.roll_button.index, '<Button-1>', lambda event: self.roll())
+        self.gui.draw_button(self.roll_button, self.gui.theme.roll_path,
+                             ((self.width - self.gui.size) / 4, self.height * 0.15),
+                             ((self.width - self.gui.size) / 4, self.height / 2 + 0.15 * self.height),
+                             Menu.GAME_MENU.name, lambda event: self.roll())
 
     def update_dice(self, first, second):
         """
@@ -122,24 +279,25 @@ class Game:
         :param first: integer representing the value of the first die
         :param second: integer representing the value of the second die
         """
-        self.dice_1.image = ImageTk.PhotoImage(
-            Image.open(self.choose_dice_image(first)).resize((int(self.height * 0.12), int(self.height * 0.12)),
-                                                             Image.ANTIALIAS))
-        self.dice_1.index = self.gui.main_canvas.create_image((self.width - self.gui.size) / 6,
-                                                              self.height / 2 - 0.15 * self.height,
-                                                              image=self.dice_1.image)
-
-        self.dice_2.image = ImageTk.PhotoImage(
-            Image.open(self.choose_dice_image(second)).resize((int(self.height * 0.12), int(self.height * 0.12)),
-                                                              Image.ANTIALIAS))
-        self.dice_2.index = self.gui.main_canvas.create_image(
-            (self.width - self.gui.size) / 6 + int(self.height * 0.18),
-            self.height / 2 - 0.15 * self.height,
-            image=self.dice_2.image)
+        self.dice_values = [first, second]
+        self.draw_dice()
 
         if self.status == Status.MOVE and self.turn == 'Black' and self.gui.game_mode != GameMode.VS:
             self.computer_move()
 
+    def draw_dice(self):
+        """
+        Draws the images of the last values rolled, only swapping the images of the existing dice.
+        """
+        size = (self.height * 0.12, self.height * 0.12)
+        self.gui.draw_button(self.dice_1, self.choose_dice_image(self.dice_values[0]), size,
+                             ((self.width - self.gui.size) / 6, self.height / 2 - 0.15 * self.height),
+                             Menu.GAME_MENU.name)
+        self.gui.draw_button(self.dice_2, self.choose_dice_image(self.dice_values[1]), size,
+                             ((self.width - self.gui.size) / 6 + int(self.height * 0.18),
+                              self.height / 2 - 0.15 * self.height),
+                             Menu.GAME_MENU.name)
+
     def choose_dice_image(self, number):
         """
         A utility function which helps pick the right path to the image corresponding to each of the values on the die.
@@ -201,12 +359,13 @@ class Game:
         :param item: the piece to be dragged around
         """
         if self.slots[item.slot].pieces[-1].position == item.position \
+                and self.slots[item.slot].pieces[-1].color == item.color \
                 and self.status == Status.MOVE \
                 and self.turn == item.color:
             if (len(self.jail[self.turn]) > 0 and self.jail[self.turn][-1].position == item.position) \
                     or len(self.jail[self.turn]) == 0:
                 self.drag_data = DragData(item.slot, item.position, item.index, item.color, event.x, event.y)
-                self.slots[item.slot].pieces.remove(item)
+                self.slots[item.slot].pieces.pop(-1)
 
     def drag_stop(self, event):
         """
@@ -214,25 +373,27 @@ class Game:
         :param event: event which triggered the function, used for getting the x and y coordinates of the cursor
         """
         if self.drag_data.from_position is not None:
+            moves = list(self.moves)
             to_slot = self.position_is_valid(event)
 
             if self.drag_data.color == 'White':
-                if to_slot == -1:
-                    self.place(self.white_pieces[self.drag_data.from_position], self.slots[self.drag_data.from_slot])
-                else:
-                    self.place(self.white_pieces[self.drag_data.from_position], self.slots[to_slot])
+                piece = self.white_pieces[self.drag_data.from_position]
             else:
-                if to_slot == -1:
-                    self.place(self.black_pieces[self.drag_data.from_position], self.slots[self.drag_data.from_slot])
-                else:
-                    self.place(self.black_pieces[self.drag_data.from_position], self.slots[to_slot])
+                piece = self.black_pieces[self.drag_data.from_position]
 
-            if len(self.moves) == 0:
-                self.turn = change_turn(self.turn)
-                self.update_player()
+            if to_slot == -1:
+                self.place(piece, self.slots[self.drag_data.from_slot])
+            elif to_slot >= 26:
+                hit = self.bear_off(piece, to_slot)
+            else:
+                hit = self.place(piece, self.slots[to_slot])
 
-                self.status = Status.ROLL
-                self.update_status()
+            self.eliminate_impossible_moves()
+            if to_slot != -1:
+                self.history.append((piece, self.drag_data.from_slot, to_slot, hit, moves, list(self.moves)))
+                self.undone = []
+            if len(self.moves) == 0:
+                self.end_turn()
 
         self.drag_data = DragData()
 
@@ -244,52 +405,22 @@ class Game:
         if self.drag_data.index is not None:
             delta_x = event.x - self.drag_data.x
             delta_y = event.y - self.drag_data.y
-            self.gui.main_canvas.move(self.drag_data.index, delta_x, delta_y)
+            self.gui.renderer.move(self.drag_data.index, delta_x, delta_y)
             self.drag_data.x = event.x
             self.drag_data.y = event.y
 
-    def is_inside(self, slot, event):
-        """
-        Utility function to check if a piece is inside the domain or territory of a certain slot so that it can be snapped-in-place.
-        :param slot: slot to be checked for the aforementioned reasons
-        :param event: widget necessary for getting the x and y coordinates of the cursor
-        :return: True is the piece has its center in the boundaries of the slot and False, otherwise
-        """
-        if slot.position < 12:
-            y_down = self.y_down
-            y_up = y_down - (self.y_down - self.y_up) / 2
-
-            if slot.position < 6:
-                x_left = self.x_left + slot.position * self.gui.triangle_width
-            else:
-                x_left = self.x_right - (12 - slot.position) * self.gui.triangle_width
-            x_right = x_left + self.gui.triangle_width
-        else:
-            y_up = self.y_up
-            y_down = y_up + (self.y_down - self.y_up) / 2
-
-            if slot.position < 18:
-                x_left = self.x_right - (slot.position - 11) * self.gui.triangle_width
-            else:
-                x_left = self.x_left + (23 - slot.position) * self.gui.triangle_width
-            x_right = x_left + self.gui.triangle_width
-
-        if x_left <= event.x <= x_right and y_up <= event.y <= y_down:
-            return True
-        return False
-
     def choice_roll(self, player):
         """
         The first roll of the game for deciding which player moves first.
         :param player: integer representing the player which is at turn
         """
         if player == 1:
-            self.player_1 = [secrets.choice(range(1, 7)), secrets.choice(range(1, 7))]
+            self.player_1 = list(self.dice.roll())
             self.turn = 'none_2'
             self.update_player()
             self.update_dice(self.player_1[0], self.player_1[1])
         else:
-            self.player_2 = [secrets.choice(range(1, 7)), secrets.choice(range(1, 7))]
+            self.player_2 = list(self.dice.roll())
             self.update_dice(self.player_2[0], self.player_2[1])
 
             if self.player_1[0] == self.player_1[1]:
@@ -320,399 +451,398 @@ class Game:
             self.choice_roll(2)
         else:
             if self.status == Status.ROLL:
-                first = secrets.choice(range(1, 7))
-                second = secrets.choice(range(1, 7))
+                first, second = self.dice.roll()
 
                 if first == second:
                     self.moves = 4 * [first]
                 else:
                     self.moves = [first, second]
-                # self.eliminate_impossible_moves()
+                self.eliminate_impossible_moves()
 
                 self.status = Status.MOVE
                 self.update_status()
+                self.update_hint()
                 self.update_dice(first, second)
 
+                if self.status == Status.MOVE and len(self.moves) == 0:
+                    self.end_turn()
+
     def position_is_valid(self, event):
         """
-        utility function to check if the position in which a piece was left is legal.
+        utility function to check if the position in which a piece was left is legal, the move having to begin one of the complete legal plays left in the turn. The lowest die allowing the move is used, and an enemy blot on the way is captured.
         :param event: widget used for getting the x and y coordinates of the cursor
         :return: the slot's position on the board if the position is valid and -1 otherwise
         """
-        if self.turn == 'White' and len(self.jail['White']) > 0:
-            for i in range(12, 18):
-                if self.is_inside(self.slots[i], event):
-                    if self.bail_is_valid(self.slots[i]):
-                        return i
-                    else:
-                        return -1
-        elif self.turn == 'Black' and len(self.jail['Black']) > 0:
-            for i in range(6, 12):
-                if self.is_inside(self.slots[i], event):
-                    if self.bail_is_valid(self.slots[i]):
-                        return i
-                    else:
-                        return -1
-        else:
-            for i in range(0, len(self.slots)):
-                if self.is_inside(self.slots[i], event):
-                    if self.move_is_valid(self.slots[i]):
-                        return i
-                    else:
-                        return -1
-
-        return -1
-
-    def move_is_valid(self, to_slot):
-        """
-        Utility function used to check if the rules of the game are respected with the currently on-going move.
-        :param to_slot: the slot to which the piece is intended to be moved
-        :return: true is it is a valid move and False otherwise
-        """
-        difference = to_slot.position - self.drag_data.from_slot
-
-        q_from = get_quadrant(self.drag_data.from_slot)
-        q_to = get_quadrant(to_slot.position)
+        cell = self.geometry.cell_at(event.x, event.y)
+        dice = first_moves(self.board, self.turn, self.moves).get((self.drag_data.from_slot, cell))
+        if dice is None:
+            return -1
 
-        if self.turn == 'White':
-            if q_from == 1:
-                if 1 <= q_to <= 2:
-                    if difference > 0 and difference in self.moves:
-                        return self.stack_is_valid(to_slot, difference)
-                    return False
-                return False
-            elif q_from == 2:
-                if q_to == 2 and difference > 0 and difference in self.moves:
-                    return self.stack_is_valid(to_slot, difference)
-                return False
-            elif q_from == 3:
-                if 3 <= q_to <= 4:
-                    if difference > 0 and difference in self.moves:
-                        return self.stack_is_valid(to_slot, difference)
-                return False
-            elif q_from == 4:
-                if q_to == 4:
-                    if difference > 0 and difference in self.moves:
-                        return self.stack_is_valid(to_slot, difference)
-                    return False
-                elif q_to == 1:
-                    difference = to_slot.position + 24 - self.drag_data.from_slot
-                    if difference > 0 and difference in self.moves:
-                        return self.stack_is_valid(to_slot, difference)
-                    return False
-                return False
-        else:
-            if q_from == 1:
-                if q_to == 1:
-                    if difference < 0 and abs(difference) in self.moves:
-                        return self.stack_is_valid(to_slot, abs(difference))
-                    return False
-                elif q_to == 4:
-                    difference = self.drag_data.from_slot + 24 - to_slot.position
-                    if difference > 0 and difference in self.moves:
-                        return self.stack_is_valid(to_slot, difference)
-                return False
-            elif q_from == 2:
-                if 1 <= q_to <= 2:
-                    if difference < 0:
-                        if abs(difference) in self.moves:
-                            return self.stack_is_valid(to_slot, abs(difference))
-                        return False
-                    return False
-                return False
-            elif q_from == 3:
-                if q_to == 3:
-                    if difference < 0:
-                        if abs(difference) in self.moves:
-                            return self.stack_is_valid(to_slot, abs(difference))
-                        return False
-                    return False
-                return False
-            elif q_from == 4:
-                if 3 <= q_to <= 4:
-                    if difference < 0 and abs(difference) in self.moves:
-                        return self.stack_is_valid(to_slot, abs(difference))
-                    return False
-                return False
-
-        return False
-
-    def bail_is_valid(self, slot):
-        """
-        Utility function to check if a bail out of the jail has been done in a legal way.
-        :param slot: the slot intended for the piece
-        :return: True if the move was valid and False otherwise
-        """
-        if self.turn == 'White':
-            if 12 <= slot.position <= 17:
-                for i in range(12, 18):
-                    if slot.position == i and (i - 11) in self.moves:
-                        if self.stack_is_valid(slot, i - 11):
-                            self.jail['White'].remove(self.white_pieces[self.drag_data.from_position])
-                            return True
-                        return False
-                return False
-            return False
-        else:
-            if 6 <= slot.position <= 11:
-                for i in range(6, 12):
-                    if slot.position == i and (12 - i) in self.moves:
-                        if self.stack_is_valid(slot, 12 - i):
-                            self.jail['Black'].remove(self.black_pieces[self.drag_data.from_position])
-                            return True
-                        return False
-                return False
-            return False
-
-    def stack_is_valid(self, to_slot, difference, test=False):
-        """
-        Utility function to check if the stack on which a piece is meant to be positioned would allow for a legal move.
-        :param to_slot: the slot intended for the piece
-        :param difference: the difference between the initial and final positions of the piece, a move, essentially
-        :param test: if the move is to actually committed or just verified
-        :return: True if the move was valid and False otherwise
-        """
-        if len(to_slot.pieces) == 0:
-            if not test:
-                if difference in self.moves:
-                    self.moves.remove(difference)
-            return True
-        elif to_slot.pieces[-1].color == self.turn:
-            if not test:
-                if difference in self.moves:
-                    self.moves.remove(difference)
-            return True
-        elif len(to_slot.pieces) == 1:
-            if not test:
-                if difference in self.moves:
-                    self.moves.remove(difference)
-                    self.capture(to_slot)
-            return True
-        return False
+        self.moves.remove(dice[0])
+        if cell < 24 and self.board.is_blot(self.turn, cell):
+            self.capture(self.slots[cell])
+        if self.drag_data.from_slot >= 24:
+            self.jail[self.turn].remove(self.pieces(self.turn)[self.drag_data.from_position])
+        return cell
 
     def place(self, piece, slot):
         """
         Places the piece on the selected position.
         :param piece: The piece to be moved.
         :param slot: The slot to which the piece is intended to be moved.
+        :return: True if the move hit an enemy piece, as returned by the board, and False otherwise
         """
-        if 24 <= slot.position <= 25:
-            self.capture(slot, False)
+        piece = self.pieces(piece.color)[piece.position]
+        hit = False
+        if slot.position >= 24:
+            self.draw_checker(piece, self.jail_coordinates(piece.color, self.jail[piece.color].index(piece)))
+        else:
+            if piece.slot is not None and piece.slot != slot.position:
+                hit = self.board.apply_move(piece.color, piece.slot, slot.position)
+                self.played.append((piece.slot, slot.position))
+            self.draw_checker(piece, self.piece_coordinates(slot.position, len(slot.pieces)))
+        piece.slot = slot.position
+        slot.pieces.append(piece)
+        return hit
 
-        position = piece.position
-        color = piece.color
-        self.gui.main_canvas.delete(piece.index)
+    def pieces(self, color):
+        """
+        Gets the pieces of a player, indexed by their position in the initial configuration.
+        :param color: White or Black
+        :return: the list of the 15 pieces
+        """
+        if color == 'White':
+            return self.white_pieces
+        return self.black_pieces
 
-        if slot.position < 12:
-            y_down = self.y_down - len(slot.pieces) * self.diameter
+    def draw_checker(self, piece, coordinates):
+        """
+        Moves the canvas item of a piece, which is only created the first time the piece is drawn.
+        :param piece: the piece to be drawn
+        :param coordinates: a tuple with the left, upper, right and lower coordinates of the piece
+        """
+        created = piece.index is None
+        piece.index = self.gui.renderer.draw(piece.index, 'oval', coordinates, tags=(Menu.GAME_MENU.name, 'checker'),
+                                             fill=self.piece_fill(piece.color))
+        if created:
+            self.checkers[piece.index] = piece
+
+    def piece_coordinates(self, position, height):
+        """
+        Computes where a piece is drawn on a slot.
+        :param position: the slot's position on the board
+        :param height: the number of pieces below it on the slot
+        :return: a tuple with the left, upper, right and lower coordinates of the piece
+        """
+        if position < 12:
+            y_down = self.y_down - height * self.diameter
             y_up = y_down - self.diameter
 
-            if slot.position < 6:
-                x_left = self.x_left + (2 * slot.position + 1) * self.margin + slot.position * self.diameter
+            if position < 6:
+                x_left = self.x_left + (2 * position + 1) * self.margin + position * self.diameter
             else:
-                x_left = self.x_right - (2 * (11 - slot.position) + 1) * self.margin - (
-                        12 - slot.position) * self.diameter
-            x_right = x_left + self.diameter
+                x_left = self.x_right - (2 * (11 - position) + 1) * self.margin - (12 - position) * self.diameter
         else:
-            y_up = self.y_up + len(slot.pieces) * self.diameter
+            y_up = self.y_up + height * self.diameter
             y_down = y_up + self.diameter
 
-            if slot.position < 18:
-                x_left = self.x_right - (2 * (slot.position - 12) + 1) * self.margin - (
-                        slot.position - 11) * self.diameter
+            if position < 18:
+                x_left = self.x_right - (2 * (position - 12) + 1) * self.margin - (position - 11) * self.diameter
             else:
-                x_left = self.x_left + (2 * (23 - slot.position) + 1) * self.margin + (
-                        23 - slot.position) * self.diameter
-            x_right = x_left + self.diameter
+                x_left = self.x_left + (2 * (23 - position) + 1) * self.margin + (23 - position) * self.diameter
+        return x_left, y_up, x_left + self.diameter, y_down
 
+    def jail_coordinates(self, color, height):
+        """
+        Computes where a captured piece is drawn in the jail, White pieces piling up from the bottom and Black ones from the top.
+        :param color: White or Black
+        :param height: the number of pieces of the same colour below it in the jail
+        :return: a tuple with the left, upper, right and lower coordinates of the piece
+        """
+        x_left = self.width / 2 - 0.025 * self.gui.size - 2 * self.margin
         if color == 'White':
-            self.white_pieces[position] = Piece(
-                index=self.gui.main_canvas.create_oval(x_left, y_up, x_right, y_down, fill=self.gui.theme.white_fill),
-                position=position, slot=slot.position, color=piece.color)
-            slot.pieces.append(self.white_pieces[position])
-            self.gui.main_canvas.tag_bind(self.white_pieces[position].index, '<ButtonPress-1>',
-                                          lambda event, item=self.white_pieces[position]: self.drag_start(event, item))
-            self.gui.main_canvas.tag_bind(self.white_pieces[position].index, '<ButtonRelease-1>', self.drag_stop)
-            self.gui.main_canvas.tag_bind(self.white_pieces[position].index, '<B1-Motion>', self.drag)
-        else:
-            self.black_pieces[position] = Piece(
-                index=self.gui.main_canvas.create_oval(x_left, y_up, x_right, y_down, fill=self.gui.theme.black_fill),
-                position=position, slot=slot.position, color=piece.color)
-            slot.pieces.append(self.black_pieces[position])
-            self.gui.main_canvas.tag_bind(self.black_pieces[position].index, '<ButtonPress-1>',
-                                          lambda event, item=self.black_pieces[position]: self.drag_start(event, item))
-            self.gui.main_canvas.tag_bind(self.black_pieces[position].index, '<ButtonRelease-1>', self.drag_stop)
-            self.gui.main_canvas.tag_bind(self.black_pieces[position].index, '<B1-Motion>', self.drag)
+            return x_left, self.y_down - (height + 1) * self.diameter, x_left + self.diameter, \
+                self.y_down - height * self.diameter
+        return x_left, self.y_up + height * self.diameter, x_left + self.diameter, \
+            self.y_up + (height + 1) * self.diameter
+
+    def piece_fill(self, color):
+        """
+        Gets the colour the pieces of a player are filled with in the current theme.
+        :param color: White or Black
+        :return: string representing the fill colour
+        """
+        if color == 'White':
+            return self.gui.theme.white_fill
+        return self.gui.theme.black_fill
 
-    def capture(self, to_slot, popping=True):
+    def capture(self, to_slot):
         """
         Logic for capturing an enemy piece.
         :param to_slot: The slot on which the enemy piece resides.
-        :param popping: If the piece taken is to be eliminated from the corresponding slot or it is just a verification.
         """
-        test_1 = 'White'
-
-        if not popping:
-            test_1 = 'Black'
-
         piece_position = to_slot.pieces[-1].position
 
-        if self.turn == test_1:
-            self.gui.main_canvas.delete(self.black_pieces[piece_position].index)
-
-            self.black_pieces[piece_position] = Piece(
-                index=self.gui.main_canvas.create_oval(
-                    self.width / 2 - 0.025 * self.gui.size - 2 * self.margin,
-                    self.y_up + len(self.jail['Black']) * self.diameter,
-                    self.width / 2 - 0.025 * self.gui.size + self.diameter - 2 * self.margin,
-                    self.y_up + (len(self.jail['Black']) + 1) * self.diameter,
-                    fill=self.gui.theme.black_fill),
-                position=piece_position, slot=24, color='Black')
-
-            self.gui.main_canvas.tag_bind(self.black_pieces[piece_position].index, '<ButtonPress-1>',
-                                          lambda event, item=self.black_pieces[piece_position]: self.drag_start(event,
-                                                                                                                item))
-            self.gui.main_canvas.tag_bind(self.black_pieces[piece_position].index, '<ButtonRelease-1>', self.drag_stop)
-            self.gui.main_canvas.tag_bind(self.black_pieces[piece_position].index, '<B1-Motion>', self.drag)
-            self.jail['Black'].append(self.black_pieces[piece_position])
-            self.slots[24].pieces.append(self.black_pieces[piece_position])
+        if self.turn == 'White':
+            piece = self.black_pieces[piece_position]
+            self.draw_checker(piece, self.jail_coordinates('Black', len(self.jail['Black'])))
+            piece.slot = 24
+            self.jail['Black'].append(piece)
+            self.slots[24].pieces.append(piece)
         else:
-            self.gui.main_canvas.delete(self.white_pieces[piece_position].index)
-
-            self.white_pieces[piece_position] = Piece(
-                index=self.gui.main_canvas.create_oval(
-                    self.width / 2 - 0.025 * self.gui.size - 2 * self.margin,
-                    self.y_down - (len(self.jail['White']) + 1) * self.diameter,
-                    self.width / 2 - 0.025 * self.gui.size + self.diameter - 2 * self.margin,
-                    self.y_down - len(self.jail['White']) * self.diameter,
-                    fill=self.gui.theme.white_fill),
-                position=piece_position, slot=25, color='White')
-
-            self.gui.main_canvas.tag_bind(self.white_pieces[piece_position].index, '<ButtonPress-1>',
-                                          lambda event, item=self.white_pieces[piece_position]: self.drag_start(event,
-                                                                                                                item))
-            self.gui.main_canvas.tag_bind(self.white_pieces[piece_position].index, '<ButtonRelease-1>', self.drag_stop)
-            self.gui.main_canvas.tag_bind(self.white_pieces[piece_position].index, '<B1-Motion>', self.drag)
-            self.jail['White'].append(self.white_pieces[piece_position])
-            self.slots[25].pieces.append(self.white_pieces[piece_position])
-
-        if popping:
-            to_slot.pieces.pop(-1)
+            piece = self.white_pieces[piece_position]
+            self.draw_checker(piece, self.jail_coordinates('White', len(self.jail['White'])))
+            piece.slot = 25
+            self.jail['White'].append(piece)
+            self.slots[25].pieces.append(piece)
+
+        to_slot.pieces.pop(-1)
 
     def eliminate_impossible_moves(self):
         """
-        Eliminates moves that cannot be done due to illegality.
+        Eliminates moves that cannot be done due to illegality, keeping only the dice that a complete legal play uses.
         """
-        if self.turn == 'White':
-            for j in range(0, len(self.moves)):
-                is_possible = False
-                for i in range(0, len(self.white_pieces)):
-                    if self.check_move(self.white_pieces[i], self.moves[j]) != -1:
-                        is_possible = True
-                if not is_possible:
-                    self.moves.pop(j)
-        else:
-            for j in range(0, len(self.moves)):
-                is_possible = False
-                for i in range(0, len(self.black_pieces)):
-                    if self.check_move(self.black_pieces[i], self.moves[j]) != -1:
-                        is_possible = True
-                if not is_possible:
-                    self.moves.pop(j)
+        self.moves = playable_dice(self.board, self.turn, self.moves)
 
-    def check_move(self, piece, distance, test=False):
+    def move_piece(self, from_slot, to_slot):
         """
-        Verifies if a move would be valid.
-        :param piece: The piece to be moved.
-        :param distance: The distance to be crossed.
-        :param test: If the move is to be committed or just verified.
-        :return: -1 if not valid or the distance to be crossed if yes
+        Moves the top piece of a slot, or the last piece taken to the jail, as decided by the computer.
+        :param from_slot: the slot's position on the board, or the index of the jail
+        :param to_slot: the slot's position on the board, or the index of the pieces that were borne off
         """
-        q_from = get_quadrant(piece.slot)
+        if from_slot >= 24:
+            piece = self.jail[self.turn].pop(-1)
+            for item in self.slots[from_slot].pieces:
+                if item.position == piece.position and item.color == piece.color:
+                    self.slots[from_slot].pieces.remove(item)
+                    break
+        else:
+            piece = self.slots[from_slot].pieces.pop(-1)
 
-        if self.turn == 'White':
-            if q_from == 1 or q_from == 3:
-                if self.stack_is_valid(self.slots[piece.slot + distance], distance, test):
-                    return piece.slot + distance
-            elif q_from == 2:
-                if piece.slot + distance < 12 and \
-                        self.stack_is_valid(self.slots[piece.slot + distance], distance, test):
-                    return piece.slot + distance
-            elif q_from == 4:
-                if self.stack_is_valid(self.slots[(piece.slot + distance) % 24], distance, test):
-                    return (piece.slot + distance) % 24
-            return -1
+        if to_slot >= 24:
+            self.bear_off(piece, to_slot)
         else:
-            if q_from == 1:
-                if self.stack_is_valid(self.slots[piece.slot - distance + 24], distance, test):
-                    return piece.slot - distance + 24
-            elif q_from == 2 or q_from == 4:
-                if self.stack_is_valid(self.slots[piece.slot - distance], distance, test):
-                    return piece.slot - distance
-            elif q_from == 3:
-                if piece.slot - distance > 11 and \
-                        self.stack_is_valid(self.slots[piece.slot - distance], distance, test):
-                    return piece.slot - distance
-            return -1
+            if self.board.is_blot(piece.color, to_slot):
+                self.capture(self.slots[to_slot])
+            self.place(piece, self.slots[to_slot])
+
+    def bear_off(self, piece, to_slot):
+        """
+        Takes a piece off the board once it has gone all the way around it.
+        :param piece: the piece to be borne off, which is no longer in its slot's list of pieces
+        :param to_slot: the index of the pieces borne off by the piece's colour
+        :return: False, as bearing off never hits
+        """
+        piece = self.pieces(piece.color)[piece.position]
+        hit = self.board.apply_move(piece.color, piece.slot, to_slot)
+        self.played.append((piece.slot, to_slot))
+        self.erase_checker(piece)
+        piece.slot = to_slot
+        return hit
+
+    def can_take_back(self, stack):
+        """
+        Checks if a move may be taken back or replayed, which is only while the player is moving and no piece is being dragged.
+        :param stack: the list of moves which would be taken back or replayed
+        :return: True if the move may be taken back or replayed and False otherwise
+        """
+        return len(stack) > 0 and self.status == Status.MOVE and self.drag_data.from_position is None
+
+    def undo(self):
+        """
+        Takes back the last move of the turn, from what the move changed alone: the board undoes it from its delta, the moved piece goes back to its slot or to the jail, the piece it hit leaves the jail, and the dice it used can be played again.
+        """
+        if not self.can_take_back(self.history):
+            return
+        piece, from_slot, to_slot, hit, moves, left = self.history.pop(-1)
+        self.undone.append((piece, from_slot, to_slot, hit, moves, left))
+        self.board.undo_move(piece.color, from_slot, to_slot, hit)
+        self.played.pop(-1)
+        self.moves = list(moves)
+
+        if to_slot < 24:
+            self.slots[to_slot].pieces.pop(-1)
+        if hit:
+            enemy = self.jail[change_turn(piece.color)].pop(-1)
+            self.slots[enemy.slot].pieces.remove(enemy)
+            self.draw_checker(enemy, self.piece_coordinates(to_slot, 0))
+            enemy.slot = to_slot
+            self.slots[to_slot].pieces.append(enemy)
+
+        if from_slot >= 24:
+            self.jail[piece.color].append(piece)
+            self.draw_checker(piece, self.jail_coordinates(piece.color, len(self.jail[piece.color]) - 1))
+        else:
+            self.draw_checker(piece, self.piece_coordinates(from_slot, len(self.slots[from_slot].pieces)))
+        piece.slot = from_slot
+        self.slots[from_slot].pieces.append(piece)
+
+    def redo(self):
+        """
+        Makes again the last move taken back, as long as no other move has been made since.
+        """
+        if not self.can_take_back(self.undone):
+            return
+        piece, from_slot, to_slot, hit, moves, left = self.undone.pop(-1)
+        self.history.append((piece, from_slot, to_slot, hit, moves, left))
+        self.move_piece(from_slot, to_slot)
+        self.moves = list(left)
+        if len(self.moves) == 0:
+            self.end_turn()
+
+    def erase_checker(self, piece):
+        """
+        Removes the canvas item of a piece which has left the board.
+        :param piece: the piece to be erased
+        """
+        self.checkers.pop(piece.index, None)
+        self.gui.renderer.delete(piece.index)
+        piece.index = None
 
     def computer_move(self):
         """
-        Function to simulate the computer's movements, depending on its selected level of difficulty.
+        Function to simulate the computer's movements, depending on its selected level of difficulty. The play is chosen in the background while the window stays responsive, the status showing that the computer is thinking until its pieces have been moved.
         """
-        if self.gui.game_mode == GameMode.EASY:
-            while len(self.moves) > 0:
-                move = secrets.choice(self.moves)
-                ascending = secrets.choice(range(0, 2))
+        self.status = Status.THINK
+        self.update_status()
+        self.worker.start(self.board, self.turn, self.moves, self.gui.game_mode, self.animate_play, self.computer_failed)
 
-                if ascending == 1:
-                    for i in range(0, len(self.black_pieces)):
-                        answer = self.check_move(self.black_pieces[i], move)
-                        if answer != -1 and self.slots[self.black_pieces[i].slot].pieces[-1] == self.black_pieces[i]:
-                            self.place(self.black_pieces[i], self.slots[answer])
-                            break
-                else:
-                    for i in range(len(self.black_pieces) - 1, -1, -1):
-                        answer = self.check_move(self.black_pieces[i], move)
-                        if answer != -1 and self.slots[self.black_pieces[i].slot].pieces[-1] == self.black_pieces[i]:
-                            self.place(self.black_pieces[i], self.slots[answer])
-                            break
-        elif self.gui.game_mode == GameMode.MEDIUM:
-            answers = []
-            for j in range(0, len(self.moves)):
-                for i in range(0, len(self.black_pieces)):
-                    answer = self.check_move(self.black_pieces[i], self.moves[j], True)
-                    if answer != -1 and self.slots[self.black_pieces[i].slot].pieces[-1] == self.black_pieces[i]:
-                        answers.append([i, j])
-
-            answers.sort(reverse=True)
-
-            for i in range(0, len(self.moves)):
-                answer = self.check_move(self.black_pieces[answers[i][0]], self.moves[answers[i][1]])
-                self.place(self.black_pieces[answers[i][0]], self.slots[answer])
-        elif self.gui.game_mode == GameMode.HARD:
-            pass
+    def computer_failed(self, error):
+        """
+        Reports an error raised while the computer was choosing its play and makes the first legal play instead, so that the game goes on.
+        :param error: the exception raised by the search
+        """
+        traceback.print_exception(type(error), error, error.__traceback__)
+        self.animate_play(next(legal_plays(self.board, self.turn, self.moves)))
+
+    def stop_computer(self):
+        """
+        Cancels the computer's search and the animation of its play, if they are going on.
+        """
+        self.worker.cancel()
+        self.animation = []
+        if self.frame is not None:
+            self.gui.root.after_cancel(self.frame)
+            self.frame = None
+
+    def animate_play(self, play):
+        """
+        Starts moving the pieces of the play chosen by the computer, one after the other.
+        :param play: a tuple of (from_slot, to_slot) pairs
+        """
+        self.animation = list(play)
+        self.animate_move(0)
+
+    def animate_move(self, frame):
+        """
+        Slides the piece of the next move of the computer one frame further, from the event loop, and makes the move once the piece has arrived. The turn ends after the last move.
+        :param frame: the number of frames the piece has already been moved for
+        """
+        self.frame = None
+        if len(self.animation) == 0:
+            self.moves = []
+            self.end_turn()
+            return
+
+        from_slot, to_slot = self.animation[0]
+        if frame == ANIMATION_FRAMES:
+            self.animation.pop(0)
+            self.move_piece(from_slot, to_slot)
+            self.animate_move(0)
+            return
+
+        if from_slot >= 24:
+            piece = self.jail[self.turn][-1]
+            start = self.jail_coordinates(self.turn, len(self.jail[self.turn]) - 1)
+        else:
+            piece = self.slots[from_slot].pieces[-1]
+            start = self.piece_coordinates(from_slot, len(self.slots[from_slot].pieces) - 1)
+
+        if to_slot >= 24:
+            end = self.off_coordinates(self.turn)
+        elif self.board.is_blot(self.turn, to_slot):
+            end = self.piece_coordinates(to_slot, 0)
+        else:
+            end = self.piece_coordinates(to_slot, len(self.slots[to_slot].pieces))
+
+        progress = (frame + 1) / ANIMATION_FRAMES
+        self.gui.renderer.draw(piece.index, 'oval', tuple(first + (last - first) * progress
+                                                          for first, last in zip(start, end)))
+        self.frame = self.gui.root.after(FRAME_INTERVAL, self.animate_move, frame + 1)
+
+    def off_coordinates(self, color):
+        """
+        Computes where a piece being borne off leaves the board, to the right of the home board of its player.
+        :param color: White or Black
+        :return: a tuple with the left, upper, right and lower coordinates of the piece
+        """
+        x_left = self.x_right + self.margin
+        if color == 'White':
+            return x_left, self.y_down - self.diameter, x_left + self.diameter, self.y_down
+        return x_left, self.y_up, x_left + self.diameter, self.y_up + self.diameter
+
+    def end_turn(self):
+        """
+        Passes the turn to the other player, who now has to roll the dice, unless the game is over.
+        """
+        self.record_turn()
+        self.history = []
+        self.undone = []
+        if self.board.winner() is not None:
+            if self.recording:
+                self.recorder.end_game(self.board.winner(), self.board.result(self.board.winner()))
+                self.recorder.close()
+                self.recorder = None
+            self.status = Status.WIN
+            self.update_status()
+            return
 
         self.turn = change_turn(self.turn)
         self.update_player()
 
         self.status = Status.ROLL
         self.update_status()
+        self.update_hint()
 
+    def record_turn(self):
+        """
+        Appends the roll and the moves of the turn which has just ended to the game record, which is started by the first turn.
+        """
+        if self.recording:
+            if self.recorder is None:
+                self.recorder = RecordWriter(RECORD_PATH)
+                self.recorder.start_game(0, self.turn)
+            self.recorder.add_turn(dice_to_moves(*self.dice_values), self.played)
+            self.recorder.flush()
+        self.played = []
 
-def get_quadrant(number):
-    """
-    Gets the quadrant of the board in which a slot resides.
-    :param number: the slot's position on the board
-    :return: the quadrant number, 1 for bottom-left, 2 for bottom-right, 3 for upper-right, 4 for upper-left
-    """
-    if 0 <= number <= 5:
-        return 1
-    elif 6 <= number <= 11:
-        return 2
-    elif 12 <= number <= 17:
-        return 3
-    elif 18 <= number <= 23:
-        return 4
+    def discard_record(self):
+        """
+        Drops the game being recorded, if it has not ended, so that the record file only keeps games played from the initial position to their end.
+        """
+        if self.recorder is not None:
+            self.recorder.discard_game()
+            self.recorder.close()
+            self.recorder = None
+
+    def update_hint(self):
+        """
+        Shows the bear-off odds of the player who has to roll below the Roll button, once both players have all of their pieces in their home boards.
+        """
+        text = ''
+        if bearoff_database is not None and self.status == Status.ROLL and is_bearoff(self.board):
+            probability = bearoff_database.win_probability(self.board, self.turn)
+            rolls = bearoff_database.expected_rolls(home_counts(self.board, self.turn))
+            text = f'{100 * probability:.1f}% to win\n{rolls:.1f} rolls to bear off'
+
+        font = 'Century ' + str(int(min(self.width / 64, self.height / 24))) + ' bold'
+        self.hint_index = self.gui.renderer.draw(self.hint_index, 'text',
+                                                 ((self.width - self.gui.size) / 4,
+                                                  self.height / 2 + 0.3 * self.height),
+                                                 tags=Menu.GAME_MENU.name,
+                                                 fill=self.gui.theme.font_color,
+                                                 font=font,
+                                                 text=text)
 
 
 def change_turn(current):
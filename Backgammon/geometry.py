@@ -0,0 +1,53 @@
+from board import WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+
+# The cells under each of the 14 columns of the board, from left to right: six points, the bar, six more points and
+# the tray to the right of the board where the pieces are borne off.
+BOTTOM_CELLS = (0, 1, 2, 3, 4, 5, WHITE_BAR, 6, 7, 8, 9, 10, 11, WHITE_OFF)
+TOP_CELLS = (23, 22, 21, 20, 19, 18, BLACK_BAR, 17, 16, 15, 14, 13, 12, BLACK_OFF)
+
+
+class BoardGeometry:
+    def __init__(self, x_left, y_up, x_right, y_down, triangle_width, tray_width):
+        """
+        The layout of the board for one window size, built once whenever the board is laid out, which finds the cell
+        under any point of the canvas with a few comparisons and one division instead of testing every slot in turn.
+        :param x_left: the left side of the board
+        :param y_up: the upper side of the board
+        :param x_right: the right side of the board
+        :param y_down: the lower side of the board
+        :param triangle_width: the width of a slot (triangle)
+        :param tray_width: the width of the tray to the right of the board, where the pieces leave it when borne off
+        """
+        self.x_left = x_left
+        self.y_up = y_up
+        self.x_right = x_right
+        self.y_down = y_down
+        self.triangle_width = triangle_width
+        self.tray_right = x_right + tray_width
+        self.middle = (y_up + y_down) / 2
+        self.bar_left = x_left + 6 * triangle_width
+        self.bar_right = x_right - 6 * triangle_width
+
+    def cell_at(self, x, y):
+        """
+        Finds the cell of the board under a point, the lower half of the board holding the slots 0 to 11 and the upper
+        half the slots 12 to 23, with the bar and the borne off pieces of White below those of Black.
+        :param x: the x coordinate of the point
+        :param y: the y coordinate of the point
+        :return: the index of the cell, as in the cells of a Board, or None if the point is not on any of them
+        """
+        if not self.x_left <= x <= self.tray_right or not self.y_up <= y <= self.y_down:
+            return None
+
+        if x > self.x_right:
+            column = 13
+        elif x <= self.bar_left:
+            column = min(int((x - self.x_left) / self.triangle_width), 5)
+        elif x < self.bar_right:
+            column = 6
+        else:
+            column = 12 - min(int((self.x_right - x) / self.triangle_width), 5)
+
+        if y >= self.middle:
+            return BOTTOM_CELLS[column]
+        return TOP_CELLS[column]
@@ -2,11 +2,16 @@ import tkinter as tk
 
 from game import *
 from menus import Menu
-from copy import deepcopy
+from renderer import Renderer
+from image_cache import ImageCache
+from scheduler import RenderScheduler
 from player import Player
-from PIL import Image, ImageTk
 from ui_button import UIButton
 from game_modes import GameMode
+from themes import DarkTheme, LightTheme
+
+# The title is shared by every menu but the game itself.
+TITLE_TAGS = (Menu.MAIN_MENU.name, Menu.DIFFICULTY_MENU.name, Menu.NAME_MENU.name)
 
 
 class GUI:
@@ -20,15 +25,20 @@ class GUI:
         self.theme = theme
         self.scale = 0.8
         self.size = None
+        self.width = None
+        self.height = None
 
         self.game = Game(self)
         self.game_mode = GameMode.VS
         self.current_menu = Menu.MAIN_MENU
 
-        self.background_image = ImageTk.PhotoImage(file=self.theme.background_image_path)
+        self.images = ImageCache()
+        self.background_image = self.images.get(self.theme.background_image_path, None, self.theme)
         self.screen = {'width': self.root.winfo_screenwidth(), 'height': self.root.winfo_screenheight()}
         self.main_canvas = tk.Canvas(self.root, width=self.screen['width'], height=self.screen['height'], cursor='circle')
-        self.main_canvas.create_image(0, 0, image=self.background_image, anchor='nw')
+        self.renderer = Renderer(self.main_canvas)
+        self.scheduler = RenderScheduler(self.root, self.redraw)
+        self.background = self.renderer.draw(None, 'image', (0, 0), image=self.background_image, anchor='nw')
 
         self.game_title = None
         self.player_buttons = [UIButton(), UIButton()]
@@ -51,63 +61,108 @@ class GUI:
 
         self.main_canvas.pack(fill='both', expand=True)
         self.main_canvas.bind('<Configure>', self.update)
+        self.root.bind('<Control-t>', lambda event: self.toggle_theme())
 
     def update(self, event):
         """
         A centralised function for updating the UI depending on the actions occurring on the screen.
+        The redraw itself is left to the scheduler, which merges the many Configure events of a resize into one.
         :param event: the event triggering the update, used for getting the x and y coordinates
         """
-        self.clean()
+        self.width = event.widget.winfo_width()
+        self.height = event.widget.winfo_height()
+        self.request_redraw()
+
+    def request_redraw(self):
+        """
+        Asks the scheduler for a redraw, which is skipped if the window's size, the menu and the theme are unchanged.
+        """
+        self.scheduler.request((self.width, self.height, self.current_menu, self.theme))
+
+    def redraw(self):
+        """
+        Brings the current menu up to date with the window's size and the theme. Nothing is deleted: the items of the
+        other menus are hidden, and those of the current one are only moved or changed where they differ.
+        """
+        self.renderer.show_only(self.current_menu.name, [menu.name for menu in Menu])
 
         if self.current_menu == Menu.MAIN_MENU:
-            self.update_main_menu(event)
+            self.update_main_menu(self.width, self.height)
         elif self.current_menu == Menu.DIFFICULTY_MENU:
-            self.update_difficulty_menu(event)
+            self.update_difficulty_menu(self.width, self.height)
         elif self.current_menu == Menu.GAME_MENU:
-            self.update_game_menu(event)
+            self.update_game_menu(self.width, self.height)
         elif self.current_menu == Menu.NAME_MENU:
-            self.update_name_menu(event)
+            self.update_name_menu(self.width, self.height)
 
-    def clean(self):
+    def set_theme(self, theme):
         """
-        Cleans the entire UI, but redraws the background gradient..
+        Switches to another theme, changing the colours and images of the items already on the canvas.
+        :param theme: the new theme
         """
-        self.main_canvas.delete('all')
-        self.main_canvas.create_image(0, 0, image=self.background_image, anchor='nw')
+        self.theme = theme
+        self.background_image = self.images.get(self.theme.background_image_path, None, self.theme)
+        self.renderer.draw(self.background, 'image', (0, 0), image=self.background_image, anchor='nw')
+        self.request_redraw()
 
-    def update_main_menu(self, event):
+    def toggle_theme(self):
+        """
+        Switches between the dark and the light themes, whichever the window started with.
+        """
+        self.set_theme(LightTheme if self.theme == DarkTheme else DarkTheme)
+
+    def draw_button(self, button, path, size, position, tags, command=None):
+        """
+        Draws the image of a button, taken from the image cache, and binds the button's command when it is first created.
+        :param button: the UIButton to be drawn
+        :param path: the path to the image file
+        :param size: the width and height of the image
+        :param position: the x and y coordinates of the button's centre
+        :param tags: the tags given to the button when it is created
+        :param command: the function called when the button is clicked, if any
+        """
+        button.image = self.images.get(path, (int(size[0]), int(size[1])), self.theme)
+        created = button.index is None
+        button.index = self.renderer.draw(button.index, 'image', position, tags=tags, image=button.image)
+        if created and command is not None:
+            self.main_canvas.tag_bind(button.index, '<Button-1>', command)
+
+    def update_main_menu(self, width, height):
         """
         Updates the Title and Player buttons to be resized according to the window.
-        :param event: widget used for getting the current width and height of the screen
+        :param width: the width of the window
+        :param height: the height of the window
         """
-        self.update_title(event.widget.winfo_width(), event.widget.winfo_height())
-        self.update_player_buttons(event.widget.winfo_width(), event.widget.winfo_height())
+        self.update_title(width, height)
+        self.update_player_buttons(width, height)
 
-    def update_difficulty_menu(self, event):
+    def update_difficulty_menu(self, width, height):
         """
         Updates the difficulty menu with its corresponding title and buttons in order to fit the new sizes.
-        :param event: widget used for getting the current width and height of the screen
+        :param width: the width of the window
+        :param height: the height of the window
         """
-        self.update_title(event.widget.winfo_width(), event.widget.winfo_height())
-        self.update_difficulty_buttons(event.widget.winfo_width(), event.widget.winfo_height())
+        self.update_title(width, height)
+        self.update_difficulty_buttons(width, height)
 
-    def update_game_menu(self, event):
+    def update_game_menu(self, width, height):
         """
         Creates the board and calls the corresponding function in the Game menu.
-        :param event: widget used for getting the current width and height of the screen
+        :param width: the width of the window
+        :param height: the height of the window
         """
-        self.update_board(event.widget.winfo_width(), event.widget.winfo_height())
-        self.game.update_game(event)
+        self.update_board(width, height)
+        self.game.update_game(width, height)
 
-    def update_name_menu(self, event):
+    def update_name_menu(self, width, height):
         """
         Updates the newly added name menu for users to type their names.
-        :param event: widget used for getting the width and height of the current window
+        :param width: the width of the window
+        :param height: the height of the window
         """
-        self.update_title(event.widget.winfo_width(), event.widget.winfo_height(),
-                          'Let\'s get to know each other!')
-        self.update_player_fields(event.widget.winfo_width(), event.widget.winfo_height())
-        self.update_confirm_button(event.widget.winfo_width(), event.widget.winfo_height())
+        self.update_title(width, height, 'Let\'s get to know each other!')
+        self.update_player_fields(width, height)
+        self.update_confirm_button(width, height)
 
     def update_player_fields(self, width, height):
         """
@@ -116,24 +171,24 @@ class GUI:
             :param height: the height of the current window
         """
         scale = int(0.04 * width)
-        self.player1_input = tk.Entry(self.root, font=('Helvetica', scale),
-                                      width=int(width/scale),
-                                      fg='#336d92', bd=0)
-        self.player1_input.insert(2, 'Player 1 Name')
-
-        self.player2_input = tk.Entry(self.root, font=('Helvetica', scale),
-                                      width=int(width/scale),
-                                      fg='#336d92', bd=0)
-        self.player2_input.insert(2, 'Player 2 Name')
-
-        self.player1_field = self.main_canvas.create_window(width / 2,
-                                                            2 * height / 5,
-                                                            anchor='center',
-                                                            window=self.player1_input)
-        self.player2_field = self.main_canvas.create_window(width / 2,
-                                                            3 * height / 5,
-                                                            anchor='center',
-                                                            window=self.player2_input)
+        if self.player1_input is None:
+            self.player1_input = tk.Entry(self.root, fg='#336d92', bd=0)
+            self.player1_input.insert(2, 'Player 1 Name')
+
+            self.player2_input = tk.Entry(self.root, fg='#336d92', bd=0)
+            self.player2_input.insert(2, 'Player 2 Name')
+
+        for field in (self.player1_input, self.player2_input):
+            field.config(font=('Helvetica', scale), width=int(width/scale))
+
+        self.player1_field = self.renderer.draw(self.player1_field, 'window', (width / 2, 2 * height / 5),
+                                                tags=Menu.NAME_MENU.name,
+                                                anchor='center',
+                                                window=self.player1_input)
+        self.player2_field = self.renderer.draw(self.player2_field, 'window', (width / 2, 3 * height / 5),
+                                                tags=Menu.NAME_MENU.name,
+                                                anchor='center',
+                                                window=self.player2_input)
 
     def update_confirm_button(self, width, height):
         """
@@ -141,14 +196,8 @@ class GUI:
         :param width:  the width of the current window
         :param height: the height of the current window
         """
-        self.confirm_button.image = ImageTk.PhotoImage(
-            Image.open(self.theme.confirm_button_path).resize((int(width / 2), int(height / 7)), Image.ANTIALIAS))
-
-        self.confirm_button.index = self.main_canvas.create_image(width / 2,
-                                                                  6 * height / 7,
-                                                                  image=self.confirm_button.image)
-
-        self.main_canvas.tag_bind(self.confirm_button.index, '<Button-1>', self.confirm)
+        self.draw_button(self.confirm_button, self.theme.confirm_button_path, (width / 2, height / 7),
+                         (width / 2, 6 * height / 7), Menu.NAME_MENU.name, self.confirm)
 
     def confirm(self, event):
         """
@@ -168,11 +217,11 @@ class GUI:
         :param height: the height of the window
         """
         font = 'Century ' + str(int(min(width / 16, height / 6))) + ' bold'
-        self.game_title = self.main_canvas.create_text(width / 2,
-                                                       height / 6,
-                                                       fill=self.theme.font_color,
-                                                       font=font,
-                                                       text=text)
+        self.game_title = self.renderer.draw(self.game_title, 'text', (width / 2, height / 6),
+                                             tags=TITLE_TAGS,
+                                             fill=self.theme.font_color,
+                                             font=font,
+                                             text=text)
 
     def update_player_buttons(self, width, height):
         """
@@ -180,20 +229,10 @@ class GUI:
         :param width: the width of the window
         :param height: the height of the window
         """
-        self.player_buttons[0].image = ImageTk.PhotoImage(
-            Image.open(self.theme.single_button_path).resize((int(width / 2), int(height / 7)), Image.ANTIALIAS))
-        self.player_buttons[1].image = ImageTk.PhotoImage(
-            Image.open(self.theme.two_button_path).resize((int(width / 2), int(height / 7)), Image.ANTIALIAS))
-
-        self.player_buttons[0].index = self.main_canvas.create_image(width / 2,
-                                                                     3 * height / 7,
-                                                                     image=self.player_buttons[0].image)
-        self.player_buttons[1].index = self.main_canvas.create_image(width / 2,
-                                                                     5 * height / 7,
-                                                                     image=self.player_buttons[1].image)
-
-        self.main_canvas.tag_bind(self.player_buttons[0].index, '<Button-1>', self.play_single)
-        self.main_canvas.tag_bind(self.player_buttons[1].index, '<Button-1>', self.play_two)
+        self.draw_button(self.player_buttons[0], self.theme.single_button_path, (width / 2, height / 7),
+                         (width / 2, 3 * height / 7), Menu.MAIN_MENU.name, self.play_single)
+        self.draw_button(self.player_buttons[1], self.theme.two_button_path, (width / 2, height / 7),
+                         (width / 2, 5 * height / 7), Menu.MAIN_MENU.name, self.play_two)
 
     def update_difficulty_buttons(self, width, height):
         """
@@ -201,26 +240,12 @@ class GUI:
         :param width: the width of the window
         :param height: the height of the window
         """
-        self.difficulty_buttons[0].image = ImageTk.PhotoImage(
-            Image.open(self.theme.easy_button_path).resize((int(width / 6), int(2 * height / 7)), Image.ANTIALIAS))
-        self.difficulty_buttons[1].image = ImageTk.PhotoImage(
-            Image.open(self.theme.medium_button_path).resize((int(width / 6), int(2 * height / 7)), Image.ANTIALIAS))
-        self.difficulty_buttons[2].image = ImageTk.PhotoImage(
-            Image.open(self.theme.hard_button_path).resize((int(width / 6), int(2 * height / 7)), Image.ANTIALIAS))
-
-        self.difficulty_buttons[0].index = self.main_canvas.create_image(1 * width / 6,
-                                                                         height / 2,
-                                                                         image=self.difficulty_buttons[0].image)
-        self.difficulty_buttons[1].index = self.main_canvas.create_image(3 * width / 6,
-                                                                         height / 2,
-                                                                         image=self.difficulty_buttons[1].image)
-        self.difficulty_buttons[2].index = self.main_canvas.create_image(5 * width / 6,
-                                                                         height / 2,
-                                                                         image=self.difficulty_buttons[2].image)
-
-        self.main_canvas.tag_bind(self.difficulty_buttons[0].index, '<Button-1>', self.easy)
-        self.main_canvas.tag_bind(self.difficulty_buttons[1].index, '<Button-1>', self.medium)
-        self.main_canvas.tag_bind(self.difficulty_buttons[2].index, '<Button-1>', self.hard)
+        self.draw_button(self.difficulty_buttons[0], self.theme.easy_button_path, (width / 6, 2 * height / 7),
+                         (1 * width / 6, height / 2), Menu.DIFFICULTY_MENU.name, self.easy)
+        self.draw_button(self.difficulty_buttons[1], self.theme.medium_button_path, (width / 6, 2 * height / 7),
+                         (3 * width / 6, height / 2), Menu.DIFFICULTY_MENU.name, self.medium)
+        self.draw_button(self.difficulty_buttons[2], self.theme.hard_button_path, (width / 6, 2 * height / 7),
+                         (5 * width / 6, height / 2), Menu.DIFFICULTY_MENU.name, self.hard)
 
     def update_board(self, width, height):
         """
@@ -234,35 +259,37 @@ class GUI:
         self.game.x_right = (width + self.size) / 2 - 0.025 * self.size
         self.game.y_down = (height + self.size) / 2 - 0.025 * self.size
 
-        self.border = self.main_canvas.create_rectangle((width - self.size) / 2,
-                                                        (height - self.size) / 2,
-                                                        (width + self.size) / 2,
-                                                        (height + self.size) / 2,
-                                                        fill=self.theme.border_fill,
-                                                        width=0)
-        self.board = self.main_canvas.create_rectangle(self.game.x_left,
-                                                       self.game.y_up,
-                                                       self.game.x_right,
-                                                       self.game.y_down,
-                                                       fill=self.theme.board_fill,
-                                                       width=0)
-        self.separator = self.main_canvas.create_rectangle(width / 2 - 0.025 * self.size,
-                                                           (height - self.size) / 2,
-                                                           width / 2 + 0.025 * self.size,
-                                                           (height + self.size) / 2,
-                                                           fill=self.theme.border_fill,
-                                                           width=0)
+        self.border = self.renderer.draw(self.border, 'rectangle', ((width - self.size) / 2,
+                                                                     (height - self.size) / 2,
+                                                                     (width + self.size) / 2,
+                                                                     (height + self.size) / 2),
+                                         tags=Menu.GAME_MENU.name,
+                                         fill=self.theme.border_fill,
+                                         width=0)
+        self.board = self.renderer.draw(self.board, 'rectangle', (self.game.x_left,
+                                                                   self.game.y_up,
+                                                                   self.game.x_right,
+                                                                   self.game.y_down),
+                                        tags=Menu.GAME_MENU.name,
+                                        fill=self.theme.board_fill,
+                                        width=0)
+        self.separator = self.renderer.draw(self.separator, 'rectangle', (width / 2 - 0.025 * self.size,
+                                                                           (height - self.size) / 2,
+                                                                           width / 2 + 0.025 * self.size,
+                                                                           (height + self.size) / 2),
+                                            tags=Menu.GAME_MENU.name,
+                                            fill=self.theme.border_fill,
+                                            width=0)
 
         self.update_triangles(width, height)
 
     def update_triangles(self, width, height):
         """
-        Resizes the slots (triangles) to fit the window size.
+        Resizes the slots (triangles) to fit the window size. Only the triangles are drawn here, the slots of the game
+        and their pieces being left as they are.
         :param width: the width of the window
         :param height: the height of the window
         """
-        backup = deepcopy(self.game.slots)
-
         self.size = self.scale * min(width, height)
         offsets = [self.game.x_left, width / 2 + 0.025 * self.size]
         bases = [self.game.y_down, self.game.y_up]
@@ -271,17 +298,15 @@ class GUI:
 
         for i in range(0, 4):
             for j in range(0, 6):
-                self.triangles[i * 6 + j] = self.main_canvas.create_polygon(offsets[i % 2] + j * self.triangle_width,
-                                                                            bases[int(bool(i > 1))],
-                                                                            offsets[i % 2] + (2 * j + 1) * self.triangle_width / 2,
-                                                                            tops[int(bool(i > 1))],
-                                                                            offsets[i % 2] + (j + 1) * self.triangle_width,
-                                                                            bases[int(bool(i > 1))],
-                                                                            fill=self.theme.triangle_fill)
-                self.game.slots[i * 6 + j] = Slot(index=self.triangles[i * 6 + j], position=i * 6 + j)
-
-        for i in range(0, len(backup)):
-            self.game.slots[i].pieces = deepcopy(backup[i].pieces)
+                self.triangles[i * 6 + j] = self.renderer.draw(self.triangles[i * 6 + j], 'polygon',
+                                                               (offsets[i % 2] + j * self.triangle_width,
+                                                                bases[int(bool(i > 1))],
+                                                                offsets[i % 2] + (2 * j + 1) * self.triangle_width / 2,
+                                                                tops[int(bool(i > 1))],
+                                                                offsets[i % 2] + (j + 1) * self.triangle_width,
+                                                                bases[int(bool(i > 1))]),
+                                                               tags=Menu.GAME_MENU.name,
+                                                               fill=self.theme.triangle_fill)
 
     def play_single(self, event):
         """
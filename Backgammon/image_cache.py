@@ -0,0 +1,52 @@
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+
+class ImageCache:
+    def __init__(self, capacity=64):
+        """
+        Keeps the images of the UI ready to be drawn: every file is decoded from the disk only once, and the most recently
+        used resized versions are kept as PhotoImages, so that redrawing a button at the same size costs nothing.
+        :param capacity: the number of resized images kept before the least recently used one is dropped
+        """
+        self.capacity = capacity
+        self.sources = {}
+        self.images = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def source(self, path):
+        """
+        Gets the decoded image of a file, reading it from the disk the first time.
+        :param path: the path to the image file
+        :return: the PIL Image
+        """
+        if path not in self.sources:
+            image = Image.open(path)
+            image.load()
+            self.sources[path] = image
+        return self.sources[path]
+
+    def get(self, path, size, theme):
+        """
+        Gets an image resized with the Lanczos filter, only resizing it the first time it is asked for at that size.
+        :param path: the path to the image file
+        :param size: the width and height of the image, or None for its original size
+        :param theme: the theme the image belongs to
+        :return: the PhotoImage
+        """
+        key = (path, size, theme.__name__)
+        if key in self.images:
+            self.hits += 1
+            self.images.move_to_end(key)
+            return self.images[key]
+
+        self.misses += 1
+        image = self.source(path)
+        if size is not None and size != image.size:
+            image = image.resize(size, Image.LANCZOS)
+        self.images[key] = ImageTk.PhotoImage(image)
+        if len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+        return self.images[key]
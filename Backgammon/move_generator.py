@@ -0,0 +1,178 @@
+from itertools import permutations
+
+from board import Board, BAR, OFF, SIGN, PATH, PATH_INDEX, OPPONENT
+
+
+def single_moves(cells, color, die, start=0):
+    """
+    Lists every checker move a colour can make with one die, without looking at the other dice.
+    :param cells: the 28 cells of a board
+    :param color: White or Black
+    :param die: integer representing the value of the die
+    :param start: the first index on the colour's path from which checkers are considered
+    :return: a list of (from_slot, to_slot) pairs
+    """
+    sign = SIGN[color]
+    path = PATH[color]
+    bar = BAR[color]
+
+    if cells[bar] > 0:
+        to_slot = path[die - 1]
+        if cells[to_slot] * sign >= -1:
+            return [(bar, to_slot)]
+        return []
+
+    moves = []
+    farthest = -1
+    for i in range(0, 24):
+        from_slot = path[i]
+        if cells[from_slot] * sign <= 0:
+            continue
+        if farthest == -1:
+            farthest = i
+        if i < start:
+            continue
+
+        end = i + die
+        if end < 24:
+            to_slot = path[end]
+            if cells[to_slot] * sign >= -1:
+                moves.append((from_slot, to_slot))
+        elif farthest >= 18 and (end == 24 or i == farthest):
+            moves.append((from_slot, OFF[color]))
+    return moves
+
+
+def apply_to_cells(cells, color, from_slot, to_slot):
+    """
+    Moves a checker on a copy of the cells, the same way Board.apply_move does it in place.
+    :param cells: the 28 cells of a board
+    :param color: White or Black
+    :param from_slot: the slot's position on the board, or the colour's bar index
+    :param to_slot: the slot's position on the board, or the colour's off index
+    :return: the new list of cells
+    """
+    cells = cells[:]
+    sign = SIGN[color]
+
+    if from_slot >= 24:
+        cells[from_slot] -= 1
+    else:
+        cells[from_slot] -= sign
+
+    if to_slot >= 24:
+        cells[to_slot] += 1
+    else:
+        if cells[to_slot] == -sign:
+            cells[to_slot] = 0
+            cells[BAR[OPPONENT[color]]] += 1
+        cells[to_slot] += sign
+    return cells
+
+
+def generate(cells, color, dice):
+    """
+    Expands every order in which the dice can be played and keeps only the plays using as many dice as possible,
+    one per distinct resulting position. When a single die out of two different ones can be played, the higher
+    one has to be used if that is possible.
+    :param cells: the 28 cells of a board
+    :param color: White or Black
+    :param dice: the list of dice still to be played (2 or 4 values at the start of a turn)
+    :return: a tuple formed of a dictionary from position key to (play, cells) and the tuple of dice used
+    """
+    best = 0
+    used = ()
+    results = {tuple(cells): ((), cells)}
+
+    path_index = PATH_INDEX[color]
+    doubles = len(set(dice)) == 1
+
+    for sequence in sorted(set(permutations(dice)), reverse=True):
+        frontier = [((), cells, 0)]
+        level = 0
+
+        for die in sequence:
+            seen = {}
+            for play, current, start in frontier:
+                for from_slot, to_slot in single_moves(current, color, die, start):
+                    after = apply_to_cells(current, color, from_slot, to_slot)
+                    key = tuple(after)
+                    # Moves made with equal dice commute, so they are only generated from the back forwards.
+                    next_start = path_index[from_slot] if doubles and from_slot < 24 else start
+                    if key not in seen or next_start < seen[key][2]:
+                        seen[key] = (play + ((from_slot, to_slot),), after, next_start)
+            if len(seen) == 0:
+                break
+            frontier = list(seen.values())
+            level += 1
+
+        # The sequences are tried from the highest first die down, so a single higher die is never replaced.
+        if level > best:
+            best = level
+            used = sequence[:level]
+            results = {}
+        if level == best and level > 0 and (level > 1 or sequence[0] == used[0]):
+            for play, after, start in frontier:
+                key = tuple(after)
+                if key not in results:
+                    results[key] = (play, after)
+
+    return results, used
+
+
+def legal_plays(board, color, dice):
+    """
+    Yields every distinct legal play of a colour for the given dice, as tuples of (from_slot, to_slot) pairs.
+    A single empty play is yielded when no die can be used.
+    :param board: the Board on which the play would be made
+    :param color: White or Black
+    :param dice: the list of dice still to be played
+    """
+    results, _ = generate(board.cells, color, dice)
+    for play, _ in results.values():
+        yield play
+
+
+def legal_positions(board, color, dice):
+    """
+    Yields every distinct legal play of a colour together with the Board it leads to.
+    :param board: the Board on which the play would be made
+    :param color: White or Black
+    :param dice: the list of dice still to be played
+    """
+    results, _ = generate(board.cells, color, dice)
+    for play, after in results.values():
+        yield play, Board(after)
+
+
+def playable_dice(board, color, dice):
+    """
+    Gets the dice which a complete legal play uses, which is every die unless some of them are blocked.
+    :param board: the Board on which the play would be made
+    :param color: White or Black
+    :param dice: the list of dice still to be played
+    :return: the list of dice that have to be played
+    """
+    _, used = generate(board.cells, color, dice)
+    return list(used)
+
+
+def first_moves(board, color, dice):
+    """
+    Finds the checker moves which begin a legal play, that is after which the remaining dice can still be played as
+    far as the complete plays go. A play being made of such moves one after the other is legal.
+    :param board: the Board on which the play would be made
+    :param color: White or Black
+    :param dice: the list of dice still to be played
+    :return: a dictionary from (from_slot, to_slot) pairs to the sorted list of the dice each move can be made with
+    """
+    _, used = generate(board.cells, color, dice)
+    moves = {}
+    for die in sorted(set(used)):
+        rest = list(dice)
+        rest.remove(die)
+        for from_slot, to_slot in single_moves(board.cells, color, die):
+            after = apply_to_cells(board.cells, color, from_slot, to_slot)
+            if len(generate(after, color, rest)[1]) == len(used) - 1:
+                moves.setdefault((from_slot, to_slot), []).append(die)
+    return moves
@@ -0,0 +1,139 @@
+import numpy as np
+
+from batch_evaluation import to_array
+from board import BAR, OFF, SIGN, PATH, OPPONENT
+
+INPUTS = 196
+OUTPUTS = 3
+HEADER = 3
+
+
+def encode(positions, color):
+    """
+    Turns a batch of positions into the network's inputs, as seen by the colour which has just moved.
+    Every point of each side takes four units (at least one, two and three checkers, then half of the extra ones),
+    followed by the side's bar and borne-off counters, the colour's own side coming first.
+    :param positions: a 2-D array of cells, one position per row
+    :param color: the colour which has just moved, its opponent being on roll
+    :return: a 2-D float32 array of shape (number of positions, INPUTS)
+    """
+    columns = []
+    for side in (color, OPPONENT[color]):
+        checkers = np.maximum(positions[:, PATH[side]].astype(np.float32) * SIGN[side], 0)
+        columns.append(checkers >= 1)
+        columns.append(checkers >= 2)
+        columns.append(checkers >= 3)
+        columns.append(np.maximum(checkers - 3, 0) / 2)
+        columns.append(positions[:, BAR[side]:BAR[side] + 1] / 2)
+        columns.append(positions[:, OFF[side]:OFF[side] + 1] / 15)
+    return np.concatenate(columns, axis=1, dtype=np.float32)
+
+
+def sigmoid(values):
+    """
+    The logistic function, applied element-wise.
+    :param values: an array of any shape
+    :return: an array of the same shape with values between 0 and 1
+    """
+    return 1 / (1 + np.exp(-values))
+
+
+class NeuralNetwork:
+    def __init__(self, hidden=80, seed=None, parameters=None):
+        """
+        A TD-Gammon style value network with a single hidden layer, written with plain NumPy matrix products.
+        Its three outputs are the probabilities of winning, winning a gammon and losing a gammon for the colour
+        which has just moved. All parameters live in one flat float32 array, so that they can be saved to and
+        memory-mapped from a single .npy file.
+        :param hidden: the number of hidden units
+        :param seed: the seed used for the random initial weights
+        :param parameters: a flat array of parameters (header included) to be used instead of random weights
+        """
+        if parameters is None:
+            generator = np.random.default_rng(seed)
+            parameters = np.concatenate([np.array([INPUTS, hidden, OUTPUTS], dtype=np.float32),
+                                         generator.normal(0, 0.1, hidden * INPUTS + hidden * OUTPUTS + hidden
+                                                          + OUTPUTS).astype(np.float32)])
+        self.parameters = parameters
+        self.inputs, self.hidden, self.outputs = (int(value) for value in parameters[:HEADER])
+
+        # The layers are views into the flat array, so nothing is copied when the array is memory-mapped.
+        offset = HEADER
+        self.hidden_weights = parameters[offset:offset + self.hidden * self.inputs].reshape(self.hidden, self.inputs)
+        offset += self.hidden * self.inputs
+        self.hidden_bias = parameters[offset:offset + self.hidden]
+        offset += self.hidden
+        self.output_weights = parameters[offset:offset + self.outputs * self.hidden].reshape(self.outputs, self.hidden)
+        offset += self.outputs * self.hidden
+        self.output_bias = parameters[offset:offset + self.outputs]
+
+    def save(self, path):
+        """
+        Writes every parameter of the network to a single .npy file.
+        :param path: the path of the file
+        """
+        np.save(path, np.asarray(self.parameters, dtype=np.float32))
+
+    def forward(self, inputs):
+        """
+        Runs a batch of encoded positions through the network in two matrix products.
+        :param inputs: a 2-D array of shape (number of positions, INPUTS)
+        :return: a 2-D array of shape (number of positions, OUTPUTS) with the win, gammon win and gammon loss
+        probabilities
+        """
+        hidden = sigmoid(inputs @ self.hidden_weights.T + self.hidden_bias)
+        return sigmoid(hidden @ self.output_weights.T + self.output_bias)
+
+    def train(self, inputs, targets, learning_rate):
+        """
+        Moves the parameters one gradient step towards the targets of a batch, back-propagating the squared error.
+        The gradients of the batch are summed, so a batch of positions counts as many single-position updates.
+        :param inputs: a 2-D array of shape (number of positions, INPUTS)
+        :param targets: a 2-D array of shape (number of positions, OUTPUTS)
+        :param learning_rate: the size of the step
+        :return: the mean squared error of the batch before the update
+        """
+        hidden = sigmoid(inputs @ self.hidden_weights.T + self.hidden_bias)
+        outputs = sigmoid(hidden @ self.output_weights.T + self.output_bias)
+
+        error = outputs - targets
+        output_delta = error * outputs * (1 - outputs)
+        hidden_delta = (output_delta @ self.output_weights) * hidden * (1 - hidden)
+
+        self.output_weights -= learning_rate * (output_delta.T @ hidden)
+        self.output_bias -= learning_rate * output_delta.sum(axis=0)
+        self.hidden_weights -= learning_rate * (hidden_delta.T @ inputs)
+        self.hidden_bias -= learning_rate * hidden_delta.sum(axis=0)
+        return float((error ** 2).mean())
+
+    def evaluate_boards(self, boards, color):
+        """
+        Scores several boards in a single forward pass, as a batch evaluator for the search.
+        :param boards: a list of Board objects reached by plays of the colour
+        :param color: the colour which has just moved
+        :return: a 1-D array of values between -1 and 1, being twice the win probability minus one
+        """
+        positions = to_array(boards)
+        values = 2 * self.forward(encode(positions, color))[:, 0] - 1
+
+        values[positions[:, OFF[color]] == 15] = 1.0
+        values[positions[:, OFF[OPPONENT[color]]] == 15] = -1.0
+        return values
+
+    def evaluate(self, board, color):
+        """
+        Scores a single board, as the evaluator at the leaves of the search.
+        :param board: the Board reached by a play of the colour
+        :param color: the colour which has just moved
+        :return: a float between -1 and 1, being twice the win probability minus one
+        """
+        return float(self.evaluate_boards([board], color)[0])
+
+
+def load_network(path):
+    """
+    Memory-maps the parameters of a network saved with NeuralNetwork.save, without reading them into memory.
+    :param path: the path of the .npy file
+    :return: the NeuralNetwork using the mapped parameters
+    """
+    return NeuralNetwork(parameters=np.load(path, mmap_mode='r'))
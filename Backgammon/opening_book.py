@@ -0,0 +1,176 @@
+import os
+import time
+import struct
+import argparse
+import multiprocessing
+
+import bots
+from board import Board, WHITE, BLACK, OPPONENT
+from dice import ROLLS
+from simulation import dice_to_moves
+from move_generator import legal_positions
+from zobrist import SIDE_KEYS, roll_key
+
+MAGIC = b'BOOK'
+HEADER = struct.Struct('<4sI')
+# A record is the key, the number of moves and up to four (from_slot, to_slot) pairs.
+RECORD = struct.Struct('<QB8B')
+
+
+def book_key(board, color, dice):
+    """
+    Computes the key of a book entry from the position, the colour on roll and its roll.
+    :param board: the Board holding the position
+    :param color: the colour on roll
+    :param dice: the list of dice to be played
+    :return: a 64-bit integer
+    """
+    return board.zobrist_key() ^ SIDE_KEYS[color] ^ roll_key(dice)
+
+
+def is_full_roll(dice):
+    """
+    Checks if the dice are those of a whole roll, the book knowing nothing of rolls that cannot be played fully.
+    :param dice: the list of dice to be played
+    :return: True if the dice are two different values or four equal ones and False otherwise
+    """
+    return (len(dice) == 2 and dice[0] != dice[1]) or len(dice) == 4
+
+
+class OpeningBook:
+    def __init__(self, path):
+        """
+        The precomputed plays of the first plies of the game, read from the file written by write_book the first time
+        a play is looked up.
+        :param path: the path of the file, which may not exist
+        """
+        self.path = path
+        self.plays = None
+
+    def load(self):
+        """
+        Reads every entry of the book file into a dictionary, which stays empty if there is no such file.
+        """
+        self.plays = {}
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as file:
+            magic, count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f'{self.path} is not an opening book.')
+            data = file.read(count * RECORD.size)
+
+        for key, length, *slots in RECORD.iter_unpack(data):
+            self.plays[key] = tuple((slots[2 * i], slots[2 * i + 1]) for i in range(0, length))
+
+    def lookup(self, board, color, dice):
+        """
+        Looks up the book play for a position and roll.
+        :param board: the Board holding the position
+        :param color: the colour on roll
+        :param dice: the list of dice to be played
+        :return: a tuple of (from_slot, to_slot) pairs, or None if the book has no entry for them
+        """
+        if self.plays is None:
+            self.load()
+        if not self.plays or not is_full_roll(dice):
+            return None
+        return self.plays.get(book_key(board, color, dice))
+
+
+def write_book(path, plays):
+    """
+    Writes the entries of a book to a compact binary file, as fixed-size records sorted by key.
+    :param path: the path of the file
+    :param plays: a dictionary from book keys to plays
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(plays)))
+        for key in sorted(plays):
+            play = plays[key]
+            slots = [slot for move in play for slot in move]
+            file.write(RECORD.pack(key, len(play), *(slots + (8 - len(slots)) * [0])))
+
+
+def search_position(task):
+    """
+    Finds the HARD computer's play for one position and roll of the book, in a worker process.
+    :param task: a tuple of the cells of the position, the colour on roll, the dice, the time budget and the maximum
+    depth of the search
+    :return: the chosen play
+    """
+    cells, color, dice, hard_time, hard_depth = task
+    bots.hard_search.time_budget = hard_time
+    bots.hard_search.max_depth = hard_depth
+    bots.hard_search.table.clear()
+    return bots.hard_search.choose_play(Board(cells), color, dice)
+
+
+def generate_book(plies, processes, hard_time, hard_depth):
+    """
+    Searches every roll of every position the HARD computer can reach in the first plies, either colour starting the
+    game and either player starting it. At the plies of the computer only its book play is followed, while at the
+    plies of its opponent every legal reply to every roll is, so that the next ply of the book holds the positions
+    real opponents reach. The book thus holds 42 entries for the computer's first ply and 21 for every position
+    reached by one of the opponent's replies.
+    :param plies: the number of plies covered by the book
+    :param processes: the number of worker processes
+    :param hard_time: the time budget of the search, in seconds
+    :param hard_depth: the maximum depth of the search
+    :return: a dictionary from book keys to plays
+    """
+    plays = {}
+    # Every position is paired with True if the computer is on roll and False if its opponent is.
+    frontier = [(Board(), WHITE, True), (Board(), BLACK, True), (Board(), WHITE, False), (Board(), BLACK, False)]
+
+    with multiprocessing.Pool(processes) as pool:
+        for ply in range(0, plies):
+            entries = [(board, color, dice_to_moves(*dice)) for board, color, computer in frontier if computer
+                       for dice, probability in ROLLS]
+            tasks = [(board.cells, color, dice, hard_time, hard_depth) for board, color, dice in entries]
+
+            following = {}
+            for (board, color, dice), play in zip(entries, pool.map(search_position, tasks)):
+                plays[book_key(board, color, dice)] = play
+
+                after = board.copy()
+                for from_slot, to_slot in play:
+                    after.apply_move(color, from_slot, to_slot)
+                following[(after.zobrist_key() ^ SIDE_KEYS[OPPONENT[color]], False)] = (after, OPPONENT[color], False)
+
+            if ply + 1 < plies:
+                for board, color, computer in frontier:
+                    if computer:
+                        continue
+                    for dice, probability in ROLLS:
+                        for play, after in legal_positions(board, color, dice_to_moves(*dice)):
+                            following[(after.zobrist_key() ^ SIDE_KEYS[OPPONENT[color]], True)] = \
+                                (after, OPPONENT[color], True)
+            frontier = list(following.values())
+            print(f'ply {ply + 1}: {len(plays)} entries')
+    return plays
+
+
+def main():
+    """
+    Command line entry point generating the opening book.
+    """
+    parser = argparse.ArgumentParser(description='Generates the opening book of the HARD computer.')
+    parser.add_argument('--plies', type=int, default=2)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--hard-time', type=float, default=10 * bots.HARD_TIME_BUDGET,
+                        help='time budget of the search of every position in seconds')
+    parser.add_argument('--hard-depth', type=int, default=bots.HARD_MAX_DEPTH)
+    parser.add_argument('--output', default=bots.OPENING_BOOK_PATH)
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    plays = generate_book(arguments.plies, arguments.processes, arguments.hard_time, arguments.hard_depth)
+    write_book(arguments.output, plays)
+    print(f'{len(plays)} entries written to {arguments.output} in {time.perf_counter() - start:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
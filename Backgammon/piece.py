@@ -1,4 +1,6 @@
 class Piece:
+    __slots__ = ('index', 'position', 'slot', 'color')
+
     def __init__(self, index=None, position=None, slot=None, color=None):
         """
         An object representing a backgammon piece.
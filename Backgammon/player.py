@@ -1,4 +1,6 @@
 class Player:
+    __slots__ = ('name', 'color')
+
     def __init__(self, name=None, color=None):
         """
         An object that holds the name as well as the color for each player.
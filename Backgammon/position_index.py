@@ -0,0 +1,210 @@
+import os
+import time
+import sqlite3
+import argparse
+
+from board import WHITE, BAR, OFF, PATH, PATH_INDEX, OPPONENT, CELLS
+from zobrist import zobrist_hash
+from record import RecordReader, encode_move, decode_move
+
+DATABASE_PATH = 'records/positions.db'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    winner TEXT,
+    points INTEGER NOT NULL,
+    UNIQUE (path, number)
+);
+CREATE TABLE IF NOT EXISTS positions (
+    key INTEGER NOT NULL,
+    game INTEGER NOT NULL,
+    ply INTEGER NOT NULL,
+    roll INTEGER NOT NULL,
+    play BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS positions_by_key ON positions (key, roll);
+'''
+
+
+def mirror_slot(color, slot):
+    """
+    Finds the slot which plays the same part for White as the given slot does for a colour.
+    :param color: White or Black
+    :param slot: the slot's position on the board, or one of the bar/off indices
+    :return: the slot seen from White's side
+    """
+    if color == WHITE:
+        return slot
+    if slot == BAR[color]:
+        return BAR[WHITE]
+    if slot == OFF[color]:
+        return OFF[WHITE]
+    if slot == BAR[WHITE]:
+        return BAR[color]
+    if slot == OFF[WHITE]:
+        return OFF[color]
+    return PATH[WHITE][PATH_INDEX[color][slot]]
+
+
+def canonical_key(board, color):
+    """
+    Hashes a position as seen by the colour on roll, so that a position and its mirror image with the colours swapped
+    share their key.
+    :param board: the Board holding the position
+    :param color: the colour on roll
+    :return: a signed 64-bit integer, as stored by SQLite
+    """
+    if color == WHITE:
+        key = board.zobrist_key()
+    else:
+        cells = CELLS * [0]
+        for slot in range(0, CELLS):
+            cells[mirror_slot(color, slot)] = -board.cells[slot] if slot < 24 else board.cells[slot]
+        key = zobrist_hash(cells)
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def roll_code(dice):
+    """
+    Names a roll whatever the order of its dice, such as 31 for a 3 and a 1.
+    :param dice: the list of dice rolled
+    :return: an integer
+    """
+    return 10 * max(dice[0], dice[1]) + min(dice[0], dice[1])
+
+
+def encode_play(color, play):
+    """
+    Packs a play as seen from White's side, one byte per move.
+    :param color: the colour which made the play
+    :param play: a sequence of (from_slot, to_slot) pairs
+    :return: the bytes of the play
+    """
+    return bytes(encode_move(WHITE, mirror_slot(color, from_slot), mirror_slot(color, to_slot))
+                 for from_slot, to_slot in play)
+
+
+def decode_play(color, data):
+    """
+    Unpacks a play packed by encode_play for the colour which is to make it.
+    :param color: White or Black
+    :param data: the bytes of the play
+    :return: a tuple of (from_slot, to_slot) pairs
+    """
+    moves = (decode_move(WHITE, value) for value in data)
+    return tuple((mirror_slot(color, from_slot), mirror_slot(color, to_slot)) for from_slot, to_slot in moves)
+
+
+class PositionIndex:
+    def __init__(self, path=DATABASE_PATH):
+        """
+        An SQLite index of every position reached in archived game records, keyed by the canonical hash of the
+        position and the colour on roll, which finds the games and plies where a position occurred without reading
+        the archives again.
+        :param path: the path of the database, which is created if it does not exist
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def add_records(self, path):
+        """
+        Indexes the games of a record file, skipping those already indexed, since record files are only appended to.
+        The last game is left out while it is unfinished, as more of its turns may still be appended, and is indexed
+        once it has ended. Every game is replayed on a headless board and every position where a colour rolled is
+        stored, together with the roll and the play made.
+        :param path: the path of the record file
+        :return: the number of games added
+        """
+        path = os.path.abspath(path)
+        reader = RecordReader(path)
+        first = self.connection.execute('SELECT COALESCE(MAX(number) + 1, 0) FROM games WHERE path = ?',
+                                        (path,)).fetchone()[0]
+        count = reader.count()
+        if count > first and reader.read(count - 1).winner is None:
+            count -= 1
+
+        with self.connection:
+            for number in range(first, count):
+                record = reader.read(number)
+                game = self.connection.execute('INSERT INTO games (path, number, seed, winner, points) '
+                                               'VALUES (?, ?, ?, ?, ?)',
+                                               (path, number, record.seed, record.winner, record.points)).lastrowid
+                rows = []
+                board = record.replay(0)
+                color = record.color
+                for ply, (dice, play) in enumerate(record.turns):
+                    rows.append((canonical_key(board, color), game, ply, roll_code(dice), encode_play(color, play)))
+                    for from_slot, to_slot in play:
+                        board.apply_move(color, from_slot, to_slot)
+                    color = OPPONENT[color]
+                self.connection.executemany('INSERT INTO positions VALUES (?, ?, ?, ?, ?)', rows)
+        return count - first
+
+    def games_reaching(self, board, color, limit=None):
+        """
+        Finds the games in which a position was reached with a colour on roll.
+        :param board: the Board holding the position
+        :param color: the colour on roll
+        :param limit: the largest number of references returned, every one being returned if it is None
+        :return: a list of (path, number, ply) references, number being the game's number in its record file and ply
+        the number of turns played before the position
+        """
+        return self.connection.execute('SELECT games.path, games.number, positions.ply FROM positions '
+                                       'JOIN games ON games.id = positions.game WHERE positions.key = ? '
+                                       'ORDER BY positions.game, positions.ply LIMIT ?',
+                                       (canonical_key(board, color), -1 if limit is None else limit)).fetchall()
+
+    def play_counts(self, board, color, dice):
+        """
+        Counts how often every play was chosen in a position for a roll.
+        :param board: the Board holding the position
+        :param color: the colour on roll
+        :param dice: the list of dice rolled
+        :return: a list of (play, count) tuples, the most frequent play first
+        """
+        rows = self.connection.execute('SELECT play, COUNT(*) FROM positions WHERE key = ? AND roll = ? '
+                                       'GROUP BY play ORDER BY COUNT(*) DESC',
+                                       (canonical_key(board, color), roll_code(dice))).fetchall()
+        return [(decode_play(color, play), count) for play, count in rows]
+
+    def statistics(self):
+        """
+        Counts what the index holds.
+        :return: a tuple of the number of games, of positions and of distinct positions
+        """
+        games = self.connection.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+        positions, distinct = self.connection.execute('SELECT COUNT(*), COUNT(DISTINCT key) FROM positions').fetchone()
+        return games, positions, distinct
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        self.connection.close()
+
+
+def main():
+    """
+    Command line entry point indexing record files into the position database.
+    """
+    parser = argparse.ArgumentParser(description='Indexes the positions of game records.')
+    parser.add_argument('records', nargs='+', help='paths of the record files')
+    parser.add_argument('--database', default=DATABASE_PATH)
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    index = PositionIndex(arguments.database)
+    added = sum(index.add_records(path) for path in arguments.records)
+    games, positions, distinct = index.statistics()
+    index.close()
+    print(f'{added} games added in {time.perf_counter() - start:.1f} s, the index holds {games} games, '
+          f'{positions} positions and {distinct} distinct ones')
+
+
+if __name__ == '__main__':
+    main()
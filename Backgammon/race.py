@@ -0,0 +1,86 @@
+import math
+
+import numpy as np
+
+from board import OFF, SIGN, PATH, OPPONENT
+from dice import ROLLS
+
+# Above any effective pip count, 15 checkers on the bar being 375 pips.
+MAX_PIPS = 400
+
+# The Keith count adds the pips wasted by stacking checkers deep in the home board: for each of the 1, 2 and 3-points,
+# the number of checkers allowed there without a penalty and the penalty of every extra one.
+STACK_PENALTIES = ((1, 1, 2), (2, 1, 1), (3, 3, 1))
+GAP_POINTS = (4, 5, 6)
+
+ROLL_PIPS = [(4 * dice[0] if dice[0] == dice[1] else sum(dice), probability) for dice, probability in ROLLS]
+MEAN_PIPS = sum(pips * probability for pips, probability in ROLL_PIPS)
+PIPS_VARIANCE = sum((pips - MEAN_PIPS) ** 2 * probability for pips, probability in ROLL_PIPS)
+
+
+def build_win_table():
+    """
+    Precomputes the chance of the colour on roll to win a race for every pair of effective pip counts.
+    The number of rolls a side needs is taken as normally distributed, with the mean and variance renewal theory
+    gives for rolls of MEAN_PIPS pips on average, and the side on roll wins if it needs no more rolls than the other.
+    :return: a 2-D float32 array, indexed by the count of the colour on roll and the count of its opponent
+    """
+    counts = np.arange(0, MAX_PIPS + 1, dtype=np.float64)
+    means = counts / MEAN_PIPS
+    variances = counts * PIPS_VARIANCE / MEAN_PIPS ** 3
+
+    spread = np.sqrt(variances[:, None] + variances[None, :])
+    margin = means[None, :] - means[:, None] + 0.5
+    erf = np.vectorize(math.erf)
+    table = 0.5 * (1 + erf(margin / np.maximum(spread, 1e-9) / math.sqrt(2)))
+    return table.astype(np.float32)
+
+
+WIN_TABLE = build_win_table()
+
+
+def effective_pip_count(board, color):
+    """
+    Computes the Keith count of a colour: its pip count, plus the wasted pips of the checkers stacked on its three
+    lowest points and one pip for every empty point among the 4, 5 and 6-points.
+    :param board: the Board holding the position
+    :param color: White or Black
+    :return: the effective pip count
+    """
+    cells = board.cells
+    sign = SIGN[color]
+    path = PATH[color]
+
+    count = board.pip_count(color)
+    for point, allowed, penalty in STACK_PENALTIES:
+        checkers = cells[path[24 - point]] * sign
+        if checkers > allowed:
+            count += penalty * (checkers - allowed)
+    for point in GAP_POINTS:
+        if cells[path[24 - point]] * sign <= 0:
+            count += 1
+    return count
+
+
+def race_win_probability(board, color):
+    """
+    Looks up the chance of the colour on roll to win a race, from the effective pip counts of both colours.
+    :param board: the Board holding the position, which has no contact left
+    :param color: the colour on roll, which has not rolled yet
+    :return: the probability of winning
+    """
+    if board.cells[OFF[color]] == 15:
+        return 1.0
+    if board.cells[OFF[OPPONENT[color]]] == 15:
+        return 0.0
+    return float(WIN_TABLE[effective_pip_count(board, color), effective_pip_count(board, OPPONENT[color])])
+
+
+def evaluate_race(board, color):
+    """
+    Scores a race position in constant time, with the same scale and point of view as evaluation.evaluate.
+    :param board: the Board reached by a play of the colour, which has no contact left
+    :param color: the colour which has just moved
+    :return: a float between -1 and 1, being twice the win probability minus one
+    """
+    return 1 - 2 * race_win_probability(board, OPPONENT[color])
@@ -0,0 +1,448 @@
+import os
+import re
+import mmap
+import time
+import struct
+import argparse
+import multiprocessing
+
+from board import Board, WHITE, BLACK, BAR, OFF, PATH, PATH_INDEX, OPPONENT
+from move_generator import legal_positions
+from simulation import dice_to_moves
+
+RECORD_PATH = 'records/games.bgr'
+
+MAGIC = b'BGRC'
+VERSION = 1
+HEADER = struct.Struct('<4sH')
+# A game starts with the START byte, the seed of its dice and its first colour, and ends with the END byte followed
+# by the winner and the points won. Every turn in between is one byte for the roll and the number of moves, and one
+# byte for every move.
+START = 0xFE
+END = 0xFF
+GAME = struct.Struct('<QB')
+RESULT = struct.Struct('<BB')
+COLORS = (WHITE, BLACK)
+
+# The column of a match file at which the moves of the second player start, and the one before which the text of a
+# line is taken as the first player's when reading a match file.
+COLUMN = 34
+MIDDLE = COLUMN // 2
+
+
+def encode_move(color, from_slot, to_slot):
+    """
+    Packs a move in one byte, as the slot it starts from and the number of pips it travels.
+    :param color: the colour which moves
+    :param from_slot: the slot's position on the board, or the colour's bar index
+    :param to_slot: the slot's position on the board, or the colour's off index
+    :return: an integer below 150
+    """
+    start = -1 if from_slot == BAR[color] else PATH_INDEX[color][from_slot]
+    end = 24 if to_slot == OFF[color] else PATH_INDEX[color][to_slot]
+    return 6 * (24 if from_slot == BAR[color] else from_slot) + end - start - 1
+
+
+def decode_move(color, value):
+    """
+    Unpacks a move packed by encode_move.
+    :param color: the colour which moves
+    :param value: the byte of the move
+    :return: a (from_slot, to_slot) pair
+    """
+    slot, pips = divmod(value, 6)
+    from_slot = BAR[color] if slot == 24 else slot
+    end = (-1 if slot == 24 else PATH_INDEX[color][slot]) + pips + 1
+    return from_slot, OFF[color] if end >= 24 else PATH[color][end]
+
+
+class GameRecord:
+    def __init__(self, seed=0, color=WHITE, turns=None, winner=None, points=0):
+        """
+        A recorded game, played from the initial position, the colours taking turns from the first one.
+        :param seed: the seed the dice were drawn from, 0 if it is not known
+        :param color: the colour which moved first
+        :param turns: a list of (dice, play) tuples, dice being the two values rolled and play a tuple of
+        (from_slot, to_slot) pairs
+        :param winner: the colour which won, or None if the game was not finished
+        :param points: the points won (1, 2 or 3)
+        """
+        if turns is None:
+            turns = []
+        self.seed = seed
+        self.color = color
+        self.turns = turns
+        self.winner = winner
+        self.points = points
+
+    def replay(self, turns=None):
+        """
+        Plays the recorded moves on a new board.
+        :param turns: the number of turns to be played, every turn being played if it is None
+        :return: the Board holding the position reached
+        """
+        board = Board()
+        color = self.color
+        for dice, play in self.turns[:turns]:
+            for from_slot, to_slot in play:
+                board.apply_move(color, from_slot, to_slot)
+            color = OPPONENT[color]
+        return board
+
+
+class RecordWriter:
+    def __init__(self, path):
+        """
+        Appends games to a record file as they are played, a turn at a time, so that an interrupted run leaves every
+        turn played until then on the disk. The header is written when the file is created.
+        :param path: the path of the file
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.color = None
+        self.start = None
+
+    def start_game(self, seed, color):
+        """
+        Starts recording a new game, leaving the previous one unfinished if it has not been ended.
+        :param seed: the seed the dice were drawn from, 0 if it is not known
+        :param color: the colour moving first
+        """
+        self.start = self.file.tell()
+        self.file.write(bytes((START,)) + GAME.pack(seed, COLORS.index(color)))
+        self.color = color
+
+    def add_turn(self, dice, play):
+        """
+        Records the play of the colour at turn.
+        :param dice: the dice rolled, of which only the first two are written
+        :param play: a sequence of (from_slot, to_slot) pairs
+        """
+        self.file.write(bytes([5 * (6 * (dice[0] - 1) + dice[1] - 1) + len(play)] +
+                              [encode_move(self.color, from_slot, to_slot) for from_slot, to_slot in play]))
+        self.color = OPPONENT[self.color]
+
+    def end_game(self, winner, points):
+        """
+        Records the result of the game and flushes it to the disk.
+        :param winner: the colour which has won
+        :param points: the points won (1, 2 or 3)
+        """
+        self.file.write(bytes((END,)) + RESULT.pack(COLORS.index(winner), points))
+        self.file.flush()
+        self.start = None
+
+    def discard_game(self):
+        """
+        Removes the game being recorded from the file, if it has not been ended, leaving the file as it was before it
+        was started.
+        """
+        if self.start is not None:
+            self.file.flush()
+            self.file.truncate(self.start)
+            self.start = None
+
+    def flush(self):
+        """
+        Writes every turn recorded so far to the disk.
+        """
+        self.file.flush()
+
+    def close(self):
+        """
+        Closes the file.
+        """
+        self.file.close()
+
+
+class RecordReader:
+    def __init__(self, path):
+        """
+        Reads the games of a record file, which is mapped into memory rather than read, so that a single game can be
+        read without going through the ones before it once the offsets of the games have been indexed.
+        :param path: the path of the file
+        """
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) > 0 else b''
+        magic, version = HEADER.unpack_from(self.data) if len(self.data) >= HEADER.size else (None, None)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a game record.')
+        self.offsets = None
+
+    def index(self):
+        """
+        Finds where every game starts by skipping over the turns, without decoding them.
+        :return: the list of the offsets of the games
+        """
+        if self.offsets is None:
+            self.offsets = []
+            data = self.data
+            size = len(data)
+            position = HEADER.size
+            while position < size:
+                if data[position] != START:
+                    raise ValueError(f'Corrupt game record at byte {position}.')
+                self.offsets.append(position)
+                position += 1 + GAME.size
+                while position < size and data[position] != START:
+                    if data[position] == END:
+                        position += 1 + RESULT.size
+                        break
+                    position += 1 + data[position] % 5
+        return self.offsets
+
+    def count(self):
+        """
+        Counts the games of the file.
+        :return: the number of games
+        """
+        return len(self.index())
+
+    def read(self, number):
+        """
+        Decodes one game.
+        :param number: the number of the game in the file, starting from 0
+        :return: the GameRecord
+        """
+        data = self.data
+        position = self.index()[number] + 1
+        seed, color = GAME.unpack_from(data, position)
+        record = GameRecord(seed, COLORS[color])
+        position += GAME.size
+
+        color = record.color
+        while position < len(data) and data[position] != START:
+            if data[position] == END:
+                winner, record.points = RESULT.unpack_from(data, position + 1)
+                record.winner = COLORS[winner]
+                break
+            roll, length = divmod(data[position], 5)
+            moves = data[position + 1:position + 1 + length]
+            record.turns.append(([roll // 6 + 1, roll % 6 + 1], tuple(decode_move(color, value) for value in moves)))
+            position += 1 + length
+            color = OPPONENT[color]
+        return record
+
+    def games(self):
+        """
+        Decodes every game of the file, one after the other.
+        """
+        for number in range(0, self.count()):
+            yield self.read(number)
+
+
+def point_name(color, slot):
+    """
+    Names a slot the way match files do, by its point number for the colour which moves.
+    :param color: the colour which moves
+    :param slot: the slot's position on the board, or the colour's bar or off index
+    :return: a string such as '13', 'bar' or 'off'
+    """
+    if slot == BAR[color]:
+        return 'bar'
+    if slot == OFF[color]:
+        return 'off'
+    return str(24 - PATH_INDEX[color][slot])
+
+
+def point_slot(color, name):
+    """
+    Finds the slot named by a point of a match file.
+    :param color: the colour which moves
+    :param name: a point number, 'bar' or 'off', the bar also being written as 25 and off as 0
+    :return: the slot's position on the board, or the colour's bar or off index
+    """
+    if name == 'bar' or name == '25':
+        return BAR[color]
+    if name == 'off' or name == '0':
+        return OFF[color]
+    return PATH[color][24 - int(name)]
+
+
+def turn_text(board, color, dice, play):
+    """
+    Writes a turn the way match files do, such as '31: 8/5 6/5*', and makes its moves on the board.
+    :param board: the Board before the play, which is changed in place
+    :param color: the colour which moves
+    :param dice: the two dice rolled
+    :param play: a sequence of (from_slot, to_slot) pairs
+    :return: the text of the turn
+    """
+    moves = []
+    for from_slot, to_slot in play:
+        hit = board.apply_move(color, from_slot, to_slot)
+        moves.append(point_name(color, from_slot) + '/' + point_name(color, to_slot) + ('*' if hit else ''))
+    return ' '.join([f'{dice[0]}{dice[1]}:'] + moves)
+
+
+def game_text(task):
+    """
+    Writes a game in the text match format, in a worker process.
+    :param task: a tuple of the GameRecord, the number of the game in the match and the points of White and Black
+    before it
+    :return: the text of the game
+    """
+    record, number, scores = task
+    lines = [f' Game {number}', f' {WHITE} : {scores[0]}'.ljust(COLUMN) + f'{BLACK} : {scores[1]}']
+
+    board = Board()
+    texts = [] if record.color == WHITE else ['']
+    color = record.color
+    for dice, play in record.turns:
+        texts.append(turn_text(board, color, dice, play))
+        color = OPPONENT[color]
+
+    for i in range(0, len(texts), 2):
+        line = f'{i // 2 + 1:3d}) ' + texts[i].ljust(COLUMN - 6) + ' '
+        if i + 1 < len(texts):
+            line += texts[i + 1]
+        lines.append(line.rstrip())
+
+    if record.winner is not None:
+        wins = f'Wins {record.points} point' + ('s' if record.points > 1 else '')
+        lines.append(' ' * (5 if record.winner == WHITE else COLUMN) + wins)
+    return '\n'.join(lines) + '\n\n'
+
+
+def parse_play(board, color, dice, text):
+    """
+    Finds the legal play written in a match file, which may join the moves of one checker, as in '13/7*', or repeat
+    a move, as in '8/4(2)'.
+    :param board: the Board before the play
+    :param color: the colour which moves
+    :param dice: the two dice rolled
+    :param text: the moves of the turn, without the roll
+    :return: a tuple of (from_slot, to_slot) pairs
+    """
+    after = board.copy()
+    for move in text.split():
+        move = move.lower()
+        repeat = re.search(r'\((\d)\)$', move)
+        points = [point.rstrip('*') for point in re.sub(r'\(\d\)$', '', move).split('/')]
+        for i in range(0, int(repeat.group(1)) if repeat else 1):
+            for from_name, to_name in zip(points, points[1:]):
+                after.apply_move(color, point_slot(color, from_name), point_slot(color, to_name))
+
+    for play, position in legal_positions(board, color, dice_to_moves(*dice)):
+        if position.key() == after.key():
+            return play
+    raise ValueError(f'Illegal play {dice[0]}{dice[1]}: {text}')
+
+
+def parse_game(text):
+    """
+    Reads a game written in the text match format, in a worker process. Doubling cube actions are left out.
+    :param text: the lines of the game, from its 'Game' line on
+    :return: the GameRecord
+    """
+    turns = []
+    first = None
+    winner = None
+    for line in text.splitlines():
+        numbered = re.match(r'\s*\d+\)', line)
+        if numbered:
+            for roll in re.finditer(r'(\d)(\d):((?:\s+(?:bar|off|\d+)(?:\*?/(?:bar|off|\d+))+\*?(?:\(\d\))?)*)',
+                                    line, re.IGNORECASE):
+                if first is None:
+                    first = WHITE if roll.start() < MIDDLE else BLACK
+                turns.append(([int(roll.group(1)), int(roll.group(2))], roll.group(3)))
+        elif 'Wins' in line:
+            result = re.search(r'Wins (\d+)', line)
+            if result is None:
+                raise ValueError(f'Unreadable result: {line.strip()}')
+            winner = WHITE if result.start() < MIDDLE else BLACK
+            points = int(result.group(1))
+
+    record = GameRecord(color=first or WHITE)
+    board = Board()
+    color = record.color
+    for dice, moves in turns:
+        play = parse_play(board, color, dice, moves)
+        for from_slot, to_slot in play:
+            board.apply_move(color, from_slot, to_slot)
+        record.turns.append((dice, play))
+        color = OPPONENT[color]
+
+    if winner is not None:
+        record.winner = winner
+        record.points = min(points, 3) if board.winner() is None else board.result(board.winner())
+    return record
+
+
+def export_match(records_path, text_path, processes):
+    """
+    Writes every game of a record file as one money session in the text match format, formatting the games in
+    parallel.
+    :param records_path: the path of the record file
+    :param text_path: the path of the match file
+    :param processes: the number of worker processes
+    :return: the number of games written
+    """
+    def tasks():
+        scores = [0, 0]
+        for number, record in enumerate(RecordReader(records_path).games()):
+            yield record, number + 1, tuple(scores)
+            if record.winner is not None:
+                scores[COLORS.index(record.winner)] += record.points
+
+    count = 0
+    with open(text_path, 'w') as file, multiprocessing.Pool(processes) as pool:
+        file.write(' 0 point match\n\n')
+        for text in pool.imap(game_text, tasks(), chunksize=64):
+            file.write(text)
+            count += 1
+    return count
+
+
+def import_match(text_path, records_path, processes):
+    """
+    Appends every game of a file in the text match format to a record file, parsing the games in parallel.
+    :param text_path: the path of the match file
+    :param records_path: the path of the record file
+    :param processes: the number of worker processes
+    :return: the number of games read
+    """
+    with open(text_path) as file:
+        games = re.split(r'^\s*Game \d+\s*$', file.read(), flags=re.MULTILINE)[1:]
+
+    writer = RecordWriter(records_path)
+    with multiprocessing.Pool(processes) as pool:
+        for record in pool.imap(parse_game, games, chunksize=64):
+            writer.start_game(record.seed, record.color)
+            for dice, play in record.turns:
+                writer.add_turn(dice, play)
+            if record.winner is not None:
+                writer.end_game(record.winner, record.points)
+    writer.close()
+    return len(games)
+
+
+def main():
+    """
+    Command line entry point converting game records to and from the text match format.
+    """
+    parser = argparse.ArgumentParser(description='Converts game records to and from the text match format.')
+    parser.add_argument('command', choices=['export', 'import', 'info'])
+    parser.add_argument('--records', default=RECORD_PATH, help='path of the binary game record file')
+    parser.add_argument('--match', default='records/games.mat', help='path of the text match file')
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    if arguments.command == 'export':
+        count = export_match(arguments.records, arguments.match, arguments.processes)
+        print(f'{count} games written to {arguments.match} in {time.perf_counter() - start:.1f} s')
+    elif arguments.command == 'import':
+        count = import_match(arguments.match, arguments.records, arguments.processes)
+        print(f'{count} games appended to {arguments.records} in {time.perf_counter() - start:.1f} s')
+    else:
+        reader = RecordReader(arguments.records)
+        records = list(reader.games())
+        turns = sum(len(record.turns) for record in records)
+        print(f'{len(records)} games, {turns} turns, {len(reader.data) / max(len(records), 1):.1f} bytes/game')
+
+
+if __name__ == '__main__':
+    main()
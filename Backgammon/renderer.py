@@ -0,0 +1,68 @@
+class Renderer:
+    def __init__(self, canvas):
+        """
+        A retained-mode layer over the tkinter canvas: every item is created once and then only updated. It remembers
+        the coordinates and options each item was last drawn with, so that nothing which did not change is sent to
+        the canvas again.
+        :param canvas: the tkinter canvas on which the items are drawn
+        """
+        self.canvas = canvas
+        self.items = {}
+
+    def draw(self, index, kind, coordinates, tags=(), **options):
+        """
+        Creates an item the first time it is drawn, and afterwards only moves it or changes the options that differ.
+        :param index: the canvas widget index of the item, or None if it has not been created yet
+        :param kind: the kind of item, such as 'rectangle', 'polygon', 'oval', 'text', 'image' or 'window'
+        :param coordinates: a tuple with the coordinates of the item
+        :param tags: the tags given to the item when it is created
+        :param options: the options of the item, such as fill, text or image
+        :return: the canvas widget index of the item
+        """
+        if index is None or index not in self.items:
+            index = getattr(self.canvas, 'create_' + kind)(*coordinates, tags=tags, **options)
+            self.items[index] = (coordinates, options)
+            return index
+
+        old_coordinates, old_options = self.items[index]
+        if coordinates != old_coordinates:
+            self.canvas.coords(index, *coordinates)
+
+        changed = {name: value for name, value in options.items() if old_options.get(name) != value}
+        if changed:
+            self.canvas.itemconfig(index, **changed)
+        self.items[index] = (coordinates, {**old_options, **changed})
+        return index
+
+    def move(self, index, delta_x, delta_y):
+        """
+        Moves an item by an offset, as while it is being dragged, keeping the remembered coordinates up to date.
+        :param index: the canvas widget index of the item
+        :param delta_x: the horizontal offset
+        :param delta_y: the vertical offset
+        """
+        self.canvas.move(index, delta_x, delta_y)
+        if index in self.items:
+            coordinates, options = self.items[index]
+            coordinates = tuple(value + (delta_y if i % 2 else delta_x) for i, value in enumerate(coordinates))
+            self.items[index] = (coordinates, options)
+
+    def delete(self, index):
+        """
+        Removes an item from the canvas.
+        :param index: the canvas widget index of the item, or None if there is nothing to remove
+        """
+        if index is not None:
+            self.canvas.delete(index)
+            self.items.pop(index, None)
+
+    def show_only(self, tag, tags):
+        """
+        Hides every group of items except one, without deleting any of them.
+        :param tag: the tag of the items to be shown
+        :param tags: the tags of all the groups of items
+        """
+        for other in tags:
+            if other != tag:
+                self.canvas.itemconfig(other, state='hidden')
+        self.canvas.itemconfig(tag, state='normal')
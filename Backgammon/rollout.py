@@ -0,0 +1,158 @@
+import os
+import math
+import time
+import random
+import argparse
+import multiprocessing
+
+import numpy as np
+
+import bots
+from game_modes import GameMode
+from board import Board, WHITE, OPPONENT
+from dice import SeededDice
+from simulation import dice_to_moves, play_out
+from tournament import BOTS
+from move_generator import legal_positions
+from batch_evaluation import to_array, evaluate_batch
+
+# The 36 ordered rolls, which the first rolls of consecutive trials go through in turn.
+FIRST_ROLLS = [(first, second) for first in range(1, 7) for second in range(1, 7)]
+
+
+class RolloutResult:
+    def __init__(self, outcomes):
+        """
+        The statistics of a rollout, seen by the colour whose equity was rolled out.
+        The standard error is the one of plain Monte Carlo sampling, an upper bound when the first rolls are
+        stratified.
+        :param outcomes: a 1-D array with the signed points of every trial, positive when the colour won
+        """
+        self.outcomes = outcomes
+        self.trials = len(outcomes)
+        self.equity = float(outcomes.mean())
+        self.standard_error = float(outcomes.std(ddof=1) / math.sqrt(self.trials)) if self.trials > 1 else 0.0
+        self.win = float((outcomes > 0).mean())
+        self.gammon_win = float((outcomes >= 2).mean())
+        self.backgammon_win = float((outcomes == 3).mean())
+        self.gammon_loss = float((outcomes <= -2).mean())
+        self.backgammon_loss = float((outcomes == -3).mean())
+
+    def __str__(self):
+        """
+        Formats the result on a single line.
+        :return: the string describing the result
+        """
+        return (f'equity {self.equity:+.3f} (+/- {self.standard_error:.3f}), win {100 * self.win:.1f}%, '
+                f'gammons {100 * self.gammon_win:.1f}% / {100 * self.gammon_loss:.1f}%, '
+                f'backgammons {100 * self.backgammon_win:.1f}% / {100 * self.backgammon_loss:.1f}%, '
+                f'{self.trials} trials')
+
+
+def rollout_trials(task):
+    """
+    Plays a chunk of the trials of a rollout in a worker process. Trial number t starts with the roll
+    FIRST_ROLLS[t % 36] and every chunk has its own dice, derived from the rollout seed and its first trial.
+    :param task: a tuple of the cells of the position, the colour on roll, the first trial number, the number of
+    trials, the rollout seed and the GameMode of the policy playing both colours
+    :return: a 1-D array with the signed points of every trial, positive when the colour on roll won
+    """
+    cells, color, first_trial, count, seed, game_mode = task
+    dice_source = SeededDice([seed, first_trial])
+    rng = random.Random(f'{seed}-{first_trial}')
+
+    def policy(board, turn, dice):
+        return bots.choose_play(board, turn, dice, game_mode, rng)
+    policies = {color: policy, OPPONENT[color]: policy}
+
+    outcomes = np.empty(count, dtype=np.int8)
+    for i in range(0, count):
+        dice = dice_to_moves(*FIRST_ROLLS[(first_trial + i) % len(FIRST_ROLLS)])
+        winner, points, history = play_out(Board(cells), color, dice, policies, dice_source)
+        outcomes[i] = points if winner == color else -points
+    return outcomes
+
+
+def rollout(board, color, trials=1296, processes=None, seed=0, game_mode=GameMode.MEDIUM, chunk=36,
+            target_error=None):
+    """
+    Estimates the equity of a position by playing it out many times across a process pool.
+    The trials are sent to the workers in chunks and gathered in order, so the result only depends on the seed and
+    the chunk size. When a target error is given, the rollout stops at the first chunk boundary where the standard
+    error is below it.
+    :param board: the Board holding the position
+    :param color: the colour on roll, which has not rolled yet
+    :param trials: the maximum number of trials, best kept a multiple of 36
+    :param processes: the number of worker processes, all the CPUs being used if none is given
+    :param seed: the rollout seed
+    :param game_mode: the GameMode of the computer playing both colours
+    :param chunk: the number of trials sent to a worker at once, best kept a multiple of 36
+    :param target_error: the standard error below which the rollout stops early
+    :return: the RolloutResult, seen by the colour on roll
+    """
+    tasks = [(list(board.cells), color, start, min(chunk, trials - start), seed, game_mode)
+             for start in range(0, trials, chunk)]
+
+    outcomes = []
+    with multiprocessing.Pool(processes) as pool:
+        for chunk_outcomes in pool.imap(rollout_trials, tasks):
+            outcomes.append(chunk_outcomes)
+            if target_error is not None and sum(len(values) for values in outcomes) > 1:
+                if RolloutResult(np.concatenate(outcomes)).standard_error < target_error:
+                    break
+    return RolloutResult(np.concatenate(outcomes))
+
+
+def rollout_play(board, color, play, **options):
+    """
+    Estimates the equity of a play by rolling out the position it reaches, with the opponent on roll.
+    :param board: the Board before the play
+    :param color: the colour making the play
+    :param play: a tuple of (from_slot, to_slot) pairs
+    :param options: the keyword arguments of rollout
+    :return: the RolloutResult, seen by the colour making the play
+    """
+    after = board.copy()
+    for from_slot, to_slot in play:
+        after.apply_move(color, from_slot, to_slot)
+
+    winner = after.winner()
+    if winner is not None:
+        return RolloutResult(np.full(1, after.result(winner), dtype=np.int8))
+    return RolloutResult(-rollout(after, OPPONENT[color], **options).outcomes)
+
+
+def main():
+    """
+    Command line entry point of the rollout engine, rolling out the opening position or the best plays of a roll.
+    """
+    parser = argparse.ArgumentParser(description='Rolls out the starting position or the plays of an opening roll.')
+    parser.add_argument('--dice', type=int, nargs=2, help='roll out the plays of this roll for White')
+    parser.add_argument('--candidates', type=int, default=5, help='number of plays rolled out, best ones first')
+    parser.add_argument('--trials', type=int, default=1296)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk', type=int, default=36, help='number of trials sent to a worker at once')
+    parser.add_argument('--target-error', type=float, help='stop once the standard error is below this value')
+    parser.add_argument('--policy', choices=sorted(BOTS), default='medium')
+    arguments = parser.parse_args()
+
+    options = {'trials': arguments.trials, 'processes': arguments.processes, 'seed': arguments.seed,
+               'game_mode': BOTS[arguments.policy], 'chunk': arguments.chunk,
+               'target_error': arguments.target_error}
+    board = Board()
+    begin = time.perf_counter()
+
+    if arguments.dice is None:
+        print(f'starting position, White on roll: {rollout(board, WHITE, **options)}')
+    else:
+        candidates = list(legal_positions(board, WHITE, dice_to_moves(*arguments.dice)))
+        values = evaluate_batch(to_array(after for play, after in candidates), WHITE)
+        for index in values.argsort()[::-1][:arguments.candidates]:
+            play = candidates[index][0]
+            print(f'{play}: {rollout_play(board, WHITE, play, **options)}')
+    print(f'{time.perf_counter() - begin:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
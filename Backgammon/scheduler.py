@@ -0,0 +1,74 @@
+import time
+
+
+class RenderScheduler:
+    def __init__(self, root, render, interval=16):
+        """
+        Merges bursts of redraw requests, such as the Configure events of a window being dragged to a new size, into at
+        most one redraw per frame, run from the tkinter event loop with root.after. A redraw is skipped altogether when
+        the state it was requested for is the one already drawn.
+        :param root: the root of tkinter
+        :param render: the function doing the redraw
+        :param interval: the shortest time between two redraws in milliseconds, about one frame at 60 frames per second
+        """
+        self.root = root
+        self.render = render
+        self.interval = interval
+        self.pending = None
+        self.key = None
+        self.rendered_key = None
+
+        self.requests = 0
+        self.frames = 0
+        self.skipped = 0
+        self.frame_time = 0.0
+        self.total_time = 0.0
+        self.worst_time = 0.0
+
+    def request(self, key):
+        """
+        Asks for a redraw, which is run once the current frame is over together with every other request made until then.
+        When the last redraw took longer than a frame, the next one waits as long, so that a slow machine or a remote
+        display is not flooded with redraws.
+        :param key: a hashable value describing the state to be drawn, such as the window's size and the current menu
+        """
+        self.requests += 1
+        self.key = key
+        if self.pending is None:
+            self.pending = self.root.after(max(self.interval, int(1000 * self.frame_time)), self.run)
+
+    def run(self):
+        """
+        Does the redraw for the last state requested, unless that state is already on the screen.
+        """
+        self.pending = None
+        if self.key == self.rendered_key:
+            self.skipped += 1
+            return
+
+        start = time.perf_counter()
+        self.render()
+        self.frame_time = time.perf_counter() - start
+        self.rendered_key = self.key
+
+        self.frames += 1
+        self.total_time += self.frame_time
+        self.worst_time = max(self.worst_time, self.frame_time)
+
+    def flush(self):
+        """
+        Runs a pending redraw right away instead of waiting for the end of the frame.
+        """
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.run()
+
+    def statistics(self):
+        """
+        Collects the counters used for checking how responsive the UI is.
+        :return: a dictionary with the number of requests, redraws, skipped and coalesced requests, and the last, mean and
+        worst frame times in seconds
+        """
+        return {'requests': self.requests, 'frames': self.frames, 'skipped': self.skipped,
+                'coalesced': self.requests - self.frames - self.skipped, 'frame_time': self.frame_time,
+                'mean_time': self.total_time / self.frames if self.frames > 0 else 0.0, 'worst_time': self.worst_time}
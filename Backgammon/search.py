@@ -0,0 +1,293 @@
+import time
+
+from board import OPPONENT
+from dice import ROLLS
+from move_generator import legal_positions
+from simulation import dice_to_moves
+from zobrist import SIDE_KEYS, roll_key
+from evaluation import evaluate, LOWER, UPPER
+from transposition_table import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+class SearchTimeout(Exception):
+    """
+    Raised from inside the search when its time budget has been used up or it has been cancelled.
+    """
+    pass
+
+
+class SearchLimit:
+    __slots__ = ('deadline', 'cancel', 'nodes')
+
+    def __init__(self, deadline, cancel=None):
+        """
+        The state of one call of the search, which is passed down the recursion rather than kept by the search, so
+        that a call made while another one is still stopping does not change its deadline or its token.
+        :param deadline: the time.perf_counter() value after which the search stops deepening
+        :param cancel: optional threading.Event which stops the search like the deadline once it is set
+        """
+        self.deadline = deadline
+        self.cancel = cancel
+        self.nodes = 0
+
+    def check(self):
+        """
+        Counts a node and stops the search if its deadline has passed or it has been cancelled.
+        """
+        self.nodes += 1
+        if time.perf_counter() > self.deadline or (self.cancel is not None and self.cancel.is_set()):
+            raise SearchTimeout()
+
+
+class ExpectiminimaxSearch:
+    def __init__(self, evaluator=evaluate, max_depth=3, time_budget=1.0, probing=True, table=None,
+                 batch_evaluator=None):
+        """
+        A depth-limited expectiminimax search over the headless board, alternating max nodes (the plays of a roll)
+        and chance nodes (the 21 outcomes of the next roll), with Star1/Star2 pruning at the chance nodes.
+        The search deepens one ply at a time and returns the best play of the last completed depth once the time
+        budget runs out. It works on a single copy of the board, every play being made on it and then taken back.
+        Results are shared through a transposition table, which also remembers the best play of every max node for
+        ordering the next, deeper searches. The table is shared by the calls, which must therefore not run at once.
+        :param evaluator: function scoring a Board between LOWER and UPPER for the colour which has just moved
+        :param max_depth: the maximum number of plies to be searched, 1 meaning a plain static evaluation
+        :param time_budget: the number of seconds after which the search stops deepening
+        :param probing: if the Star2 probing phase is used before searching a chance node fully
+        :param table: the TranspositionTable to be used, a new one being created if none is given
+        :param batch_evaluator: optional function scoring a list of Boards at once, used for ordering the plays
+        """
+        self.evaluator = evaluator
+        self.batch_evaluator = batch_evaluator
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.probing = probing
+        self.table = table if table is not None else TranspositionTable()
+
+        self.nodes = 0
+        self.depth_reached = 0
+
+    def choose_play(self, board, color, dice, cancel=None):
+        """
+        Searches for the best play of a colour for the given dice.
+        :param board: the Board on which the play would be made
+        :param color: White or Black
+        :param dice: the list of dice to be played
+        :param cancel: optional threading.Event which stops the search like the end of its time budget once it is set
+        :return: a tuple of (from_slot, to_slot) pairs, which is empty when no die can be played
+        """
+        limit = SearchLimit(time.perf_counter() + self.time_budget, cancel)
+        depth_reached = 1
+
+        # A timeout leaves the plays being searched made on the board, which is why it is a copy.
+        board = board.copy()
+        candidates = self.order(board, color, dice)
+        for depth in range(2, self.max_depth + 1):
+            if len(candidates) == 1:
+                break
+            try:
+                candidates = self.search_root(board, candidates, color, depth, limit)
+            except SearchTimeout:
+                break
+            depth_reached = depth
+
+        self.nodes = limit.nodes
+        self.depth_reached = depth_reached
+        return candidates[0][1]
+
+    def search_root(self, board, candidates, color, depth, limit):
+        """
+        Searches every play at the root, in the order found by the previous depth.
+        :param board: the Board at the root
+        :param candidates: the list of (value, play) tuples, best first
+        :param color: the colour at turn
+        :param depth: the number of plies to be searched
+        :param limit: the SearchLimit of the call
+        :return: the candidates re-ordered by their new values
+        """
+        alpha = LOWER
+        results = []
+        for score, play in candidates:
+            value = self.child_value(board, play, color, depth, alpha, UPPER, limit)
+            if value > alpha:
+                alpha = value
+            results.append((value, play))
+
+        results.sort(key=lambda result: result[0], reverse=True)
+        return results
+
+    def order(self, board, color, dice):
+        """
+        Generates the plays of a roll and orders them by the static evaluation of the positions they lead to. Only the
+        plays are kept, the positions being made again on the board when they are searched.
+        :param board: the Board on which the play would be made
+        :param color: the colour at turn
+        :param dice: the list of dice to be played
+        :return: a list of (value, play) tuples, best first
+        """
+        positions = list(legal_positions(board, color, dice))
+        if self.batch_evaluator is not None:
+            values = self.batch_evaluator([after for play, after in positions], color)
+            candidates = [(float(values[i]), play) for i, (play, after) in enumerate(positions)]
+        else:
+            candidates = [(self.evaluator(after, color), play) for play, after in positions]
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return candidates
+
+    def child_value(self, board, play, color, depth, alpha, beta, limit):
+        """
+        Computes the value of a play for the colour which makes it, by making it on the board, searching the
+        opponent's chance node and taking it back.
+        :param board: the Board on which the play is made
+        :param play: the tuple of (from_slot, to_slot) pairs
+        :param color: the colour which makes the play
+        :param depth: the number of plies left, the play included
+        :param alpha: the lower bound of the search window
+        :param beta: the upper bound of the search window
+        :param limit: the SearchLimit of the call
+        :return: the value of the play
+        """
+        hits = board.apply_play(color, play)
+        value = -self.chance(board, OPPONENT[color], depth - 1, -beta, -alpha, limit)
+        board.undo_play(color, play, hits)
+        return value
+
+    def max_node(self, board, candidates, color, depth, alpha, beta, key, limit):
+        """
+        Computes the value of the best play of a roll, with alpha-beta cut-offs between the plays.
+        :param board: the Board on which the roll is played
+        :param candidates: the ordered list of (value, play) tuples of the roll
+        :param color: the colour at turn
+        :param depth: the number of plies left
+        :param alpha: the lower bound of the search window
+        :param beta: the upper bound of the search window
+        :param key: the Zobrist hash of the position, the colour at turn and the roll
+        :param limit: the SearchLimit of the call
+        :return: the value of the best play, or a bound of it when it falls outside the window
+        """
+        if depth == 1:
+            return candidates[0][0]
+
+        entry = self.table.probe(key)
+        if entry is not None:
+            if entry[1] >= depth and cuts_off(entry, alpha, beta):
+                return entry[3]
+            for i in range(1, len(candidates)):
+                if candidates[i][1] == entry[4]:
+                    candidates.insert(0, candidates.pop(i))
+                    break
+
+        best = LOWER
+        best_play = candidates[0][1]
+        for score, play in candidates:
+            value = self.child_value(board, play, color, depth, max(alpha, best), beta, limit)
+            if value > best:
+                best = value
+                best_play = play
+                if best >= beta:
+                    break
+
+        self.table.store(key, depth, bound_type(best, alpha, beta), best, best_play)
+        return best
+
+    def chance(self, board, color, depth, alpha, beta, limit):
+        """
+        Computes the expected value of a position over the 21 rolls of the colour at turn.
+        :param board: the Board at the chance node
+        :param color: the colour about to roll
+        :param depth: the number of plies left
+        :param alpha: the lower bound of the search window
+        :param beta: the upper bound of the search window
+        :param limit: the SearchLimit of the call
+        :return: the expected value, or a bound of it when it falls outside the window
+        """
+        limit.check()
+
+        if depth == 0 or board.winner() is not None:
+            return -self.evaluator(board, OPPONENT[color])
+
+        key = board.zobrist_key() ^ SIDE_KEYS[color]
+        entry = self.table.probe(key)
+        if entry is not None and entry[1] >= depth and cuts_off(entry, alpha, beta):
+            return entry[3]
+
+        value = self.expand_chance(board, color, depth, alpha, beta, key, limit)
+        self.table.store(key, depth, bound_type(value, alpha, beta), value)
+        return value
+
+    def expand_chance(self, board, color, depth, alpha, beta, key, limit):
+        """
+        Searches the 21 rolls of a chance node which was not found in the transposition table.
+        :param board: the Board at the chance node
+        :param color: the colour about to roll
+        :param depth: the number of plies left
+        :param alpha: the lower bound of the search window
+        :param beta: the upper bound of the search window
+        :param key: the Zobrist hash of the position and the colour at turn
+        :param limit: the SearchLimit of the call
+        :return: the expected value, or a bound of it when it falls outside the window
+        """
+        outcomes = [(probability, self.order(board, color, dice_to_moves(*dice)), key ^ roll_key(dice))
+                    for dice, probability in ROLLS]
+        lower = len(outcomes) * [LOWER]
+        lower_total = LOWER
+
+        # Star2: the first play of every roll gives a lower bound of that roll's value, which may already fail high.
+        if self.probing and depth > 1:
+            for i, (probability, candidates, roll_hash) in enumerate(outcomes):
+                needed = (beta - lower_total + probability * lower[i]) / probability
+                value = self.child_value(board, candidates[0][1], color, depth, LOWER, min(needed, UPPER), limit)
+                lower_total += probability * (value - lower[i])
+                lower[i] = value
+                if lower_total >= beta:
+                    return lower_total
+
+        # Star1: the outcomes left to be searched are bounded by UPPER and by their probed lower bounds.
+        exact = 0.0
+        upper_rest = UPPER
+        lower_rest = lower_total
+        for i, (probability, candidates, roll_hash) in enumerate(outcomes):
+            upper_rest -= probability * UPPER
+            lower_rest -= probability * lower[i]
+            child_alpha = (alpha - exact - upper_rest) / probability
+            child_beta = (beta - exact - lower_rest) / probability
+
+            if lower[i] >= child_beta:
+                value = lower[i]
+            else:
+                value = self.max_node(board, candidates, color, depth, max(child_alpha, lower[i]),
+                                      min(child_beta, UPPER), roll_hash, limit)
+                value = max(value, lower[i])
+            exact += probability * value
+            if value <= child_alpha:
+                return exact + upper_rest
+            if value >= child_beta:
+                return exact + lower_rest
+        return exact
+
+
+def bound_type(value, alpha, beta):
+    """
+    Tells what a value returned by a search with the given window means for the true value of the node.
+    :param value: the value returned by the search
+    :param alpha: the lower bound of the search window
+    :param beta: the upper bound of the search window
+    :return: UPPER_BOUND if the search failed low, LOWER_BOUND if it failed high and EXACT otherwise
+    """
+    if value <= alpha:
+        return UPPER_BOUND
+    elif value >= beta:
+        return LOWER_BOUND
+    return EXACT
+
+
+def cuts_off(entry, alpha, beta):
+    """
+    Checks if a transposition table entry is enough for answering a search with the given window.
+    :param entry: the (key, depth, bound, value, best_play) entry
+    :param alpha: the lower bound of the search window
+    :param beta: the upper bound of the search window
+    :return: True if the stored value can be returned without searching and False otherwise
+    """
+    bound = entry[2]
+    value = entry[3]
+    return bound == EXACT or (bound == LOWER_BOUND and value >= beta) or (bound == UPPER_BOUND and value <= alpha)
@@ -0,0 +1,70 @@
+from board import Board, WHITE, BLACK, OPPONENT
+
+
+def dice_to_moves(first, second):
+    """
+    Turns a roll into the list of dice to be played, doubles being played four times.
+    :param first: integer representing the value of the first die
+    :param second: integer representing the value of the second die
+    :return: the list of dice
+    """
+    if first == second:
+        return 4 * [first]
+    return [first, second]
+
+
+def play_game(white_policy, black_policy, dice_source, writer=None, seed=0):
+    """
+    Plays a whole game on the headless board, without any GUI.
+    The opening roll is made with one die per player, the higher one moving first with both dice.
+    :param white_policy: function (board, color, dice) returning the play of White
+    :param black_policy: function (board, color, dice) returning the play of Black
+    :param dice_source: the DiceSource used for rolling the dice
+    :param writer: optional record.RecordWriter to which the game is appended
+    :param seed: the seed of the dice source, kept in the game record
+    :return: a tuple of the winner, the points won (1, 2 or 3) and the history, a list holding a
+    (color, dice, play, position) tuple for every turn, position being the Board.pack of the position reached after
+    the play
+    """
+    white_die = black_die = 0
+    while white_die == black_die:
+        white_die, black_die = dice_source.roll()
+    color = WHITE if white_die > black_die else BLACK
+
+    if writer is not None:
+        writer.start_game(seed, color)
+    return play_out(Board(), color, [white_die, black_die], {WHITE: white_policy, BLACK: black_policy}, dice_source,
+                    writer)
+
+
+def play_out(board, color, dice, policies, dice_source, writer=None):
+    """
+    Plays a game on from a given position until one of the colours has borne off all of its checkers.
+    :param board: the Board to start from, which is changed in place
+    :param color: the colour on roll
+    :param dice: the list of dice of the colour's first play
+    :param policies: a dictionary holding the function (board, color, dice) returning the play of each colour
+    :param dice_source: the DiceSource used for rolling the following dice
+    :param writer: optional record.RecordWriter to which every turn and the result are written, the game having been
+    started on it
+    :return: a tuple of the winner, the points won (1, 2 or 3) and the history, a list holding a
+    (color, dice, play, position) tuple for every turn, position being the Board.pack of the position reached after
+    the play
+    """
+    history = []
+    while True:
+        play = policies[color](board, color, dice)
+        for from_slot, to_slot in play:
+            board.apply_move(color, from_slot, to_slot)
+        history.append((color, dice, play, board.pack()))
+        if writer is not None:
+            writer.add_turn(dice, play)
+
+        winner = board.winner()
+        if winner is not None:
+            if writer is not None:
+                writer.end_game(winner, board.result(winner))
+            return winner, board.result(winner), history
+
+        color = OPPONENT[color]
+        dice = dice_to_moves(*dice_source.roll())
@@ -1,4 +1,6 @@
 class Slot:
+    __slots__ = ('index', 'position', 'pieces')
+
     def __init__(self, index=None, position=None, pieces=None):
         """
         An object representing a slot (triangle).
@@ -0,0 +1,63 @@
+import os
+import struct
+
+from board import Board
+from status import Status
+
+SAVE_PATH = 'records/saved_game.bin'
+
+MAGIC = b'BGSV'
+TURNS = ('none_1', 'none_2', 'White', 'Black')
+STATUSES = tuple(Status)
+# The 28 cells, the two dice last rolled, the number of moves left and up to four of them, the turn and the status.
+SNAPSHOT = struct.Struct('<28b2BB4BBB')
+
+
+def pack_snapshot(board, dice, moves, turn, status):
+    """
+    Packs the state of a game in a fixed-layout buffer of SNAPSHOT.size bytes.
+    :param board: the Board holding the position
+    :param dice: the two dice last rolled, which during the opening roll are those of the first player
+    :param moves: the list of dice still to be played
+    :param turn: the player at turn, White, Black or one of the two opening rolls
+    :param status: the Status of the game
+    :return: the bytes of the snapshot
+    """
+    return SNAPSHOT.pack(*board.cells, dice[0], dice[1], len(moves), *(moves + (4 - len(moves)) * [0]),
+                         TURNS.index(turn), STATUSES.index(status))
+
+
+def unpack_snapshot(data):
+    """
+    Unpacks a snapshot made by pack_snapshot, reading it in place from any buffer such as bytes, a bytearray or an
+    mmap.
+    :param data: the buffer holding the snapshot
+    :return: a tuple of the Board, the two dice, the list of moves left, the turn and the Status
+    """
+    values = SNAPSHOT.unpack_from(data)
+    return Board(values[0:28]), list(values[28:30]), list(values[31:31 + values[30]]), TURNS[values[35]], \
+        STATUSES[values[36]]
+
+
+def write_snapshot(path, data):
+    """
+    Saves a snapshot to a file.
+    :param path: the path of the file
+    :param data: the bytes of the snapshot
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(MAGIC + data)
+
+
+def read_snapshot(path):
+    """
+    Loads a snapshot saved by write_snapshot.
+    :param path: the path of the file
+    :return: the bytes of the snapshot
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[0:4] != MAGIC or len(data) != 4 + SNAPSHOT.size:
+        raise ValueError(f'{path} is not a saved game.')
+    return data[4:]
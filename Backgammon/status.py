@@ -4,3 +4,5 @@ from enum import Enum
 class Status(Enum):
     ROLL = 'Roll'
     MOVE = 'Move'
+    THINK = 'Thinking'
+    WIN = 'Wins!'
@@ -0,0 +1,56 @@
+import random
+
+from board import Board, WHITE, BLACK, OPPONENT
+from move_generator import legal_plays
+
+
+def random_dice(rng):
+    """
+    Rolls two dice, a double being played four times.
+    :param rng: the random.Random rolling the dice
+    :return: the list of dice to be played
+    """
+    first, second = rng.randint(1, 6), rng.randint(1, 6)
+    return 4 * [first] if first == second else [first, second]
+
+
+def random_policy(rng):
+    """
+    Creates a policy picking one of the legal plays at random.
+    :param rng: the random.Random choosing the plays
+    :return: a function (board, color, dice) returning a play
+    """
+    return lambda board, color, dice: rng.choice(list(legal_plays(board, color, dice)))
+
+
+def random_game(seed):
+    """
+    Plays a whole game of random legal plays on the headless board.
+    :param seed: the seed of the dice and of the choices
+    :return: a list of (board, color, dice, play) tuples, board holding the position before the play
+    """
+    rng = random.Random(seed)
+    policy = random_policy(rng)
+    board = Board()
+    color = rng.choice((WHITE, BLACK))
+    turns = []
+    while board.winner() is None:
+        dice = random_dice(rng)
+        play = policy(board, color, dice)
+        turns.append((board.copy(), color, dice, play))
+        for from_slot, to_slot in play:
+            board.apply_move(color, from_slot, to_slot)
+        color = OPPONENT[color]
+    return turns
+
+
+def random_positions(games, every=3):
+    """
+    Collects positions of random games, each with a colour on roll and a random roll.
+    :param games: the number of games played
+    :param every: the number of turns between two positions taken from a game
+    :return: a list of (board, color, dice) tuples
+    """
+    rng = random.Random(games)
+    return [(board, rng.choice((WHITE, BLACK)), random_dice(rng))
+            for seed in range(0, games) for board, color, dice, play in random_game(seed)[::every]]
@@ -0,0 +1,24 @@
+import pytest
+
+from board import WHITE, BLACK
+from evaluation import evaluate
+from batch_evaluation import to_array, evaluate_batch
+from helpers import random_game, random_positions
+
+
+def final_position(seed):
+    """
+    Plays the last turn of a random game, leaving a position won by one of the colours.
+    """
+    board, color, dice, play = random_game(seed)[-1]
+    board.apply_play(color, play)
+    return board
+
+
+def test_batch_matches_evaluate():
+    boards = [board for board, color, dice in random_positions(20)] + [final_position(seed) for seed in range(0, 4)]
+    for color in (WHITE, BLACK):
+        values = evaluate_batch(to_array(boards), color)
+        assert len(values) == len(boards)
+        for board, value in zip(boards, values):
+            assert float(value) == pytest.approx(evaluate(board, color), abs=1e-9)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from bearoff import POINTS, CHECKERS, POSITIONS, position_index, generate_database, BearoffDatabase
+
+
+@pytest.fixture(scope='module')
+def database(tmp_path_factory):
+    """
+    Generates the bear-off database once for the tests of the module, which takes about a minute.
+    """
+    path = str(tmp_path_factory.mktemp('databases') / 'bearoff.bin')
+    generate_database(path)
+    return BearoffDatabase(path)
+
+
+def test_position_index_is_one_to_one():
+    positions = [()]
+    for point in range(0, POINTS):
+        positions = [position + (count,) for position in positions
+                     for count in range(0, CHECKERS - sum(position) + 1)]
+    indices = [position_index(counts) for counts in positions]
+    assert POSITIONS == 54264
+    assert len(indices) == POSITIONS
+    assert sorted(indices) == list(range(0, POSITIONS))
+    assert position_index(POINTS * (0,)) == 0
+
+
+def test_single_checker(database):
+    assert database.expected_rolls((0, 0, 0, 0, 0, 0)) == 0
+    assert database.expected_rolls((1, 0, 0, 0, 0, 0)) == pytest.approx(1.0)
+    assert database.distribution((1, 0, 0, 0, 0, 0))[1] == pytest.approx(1.0)
+
+    assert database.expected_rolls((0, 0, 0, 0, 0, 1)) == pytest.approx(1.25)
+    distribution = database.distribution((0, 0, 0, 0, 0, 1))
+    assert distribution[1] == pytest.approx(0.75, abs=1e-4)
+    assert distribution[2] == pytest.approx(0.25, abs=1e-4)
+    assert np.sum(distribution) == pytest.approx(1.0, abs=1e-3)
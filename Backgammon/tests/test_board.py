@@ -0,0 +1,69 @@
+import random
+
+from board import Board, WHITE, BLACK, OPPONENT, unpack_board
+from move_generator import legal_plays
+from zobrist import zobrist_hash
+from helpers import random_dice, random_game
+
+
+def assert_consistent(board):
+    """
+    Checks that the Zobrist hash and the pip counts kept up to date by the moves are those of the cells.
+    """
+    fresh = Board(list(board.cells))
+    assert board.zobrist_key() == zobrist_hash(board.cells)
+    assert board.pip_count(WHITE) == fresh.pip_count(WHITE)
+    assert board.pip_count(BLACK) == fresh.pip_count(BLACK)
+    assert sum(abs(value) for value in board.cells) == 30
+
+
+def test_pack_round_trip():
+    for board, color, dice, play in random_game(0):
+        assert unpack_board(board.pack()).cells == board.cells
+        assert len(board.pack()) == 28
+
+
+def test_apply_and_undo_every_play():
+    for seed in range(0, 20):
+        rng = random.Random(seed)
+        board = Board()
+        # The hash and the pip counts are only updated incrementally once they have been computed.
+        board.zobrist_key()
+        board.pip_count(WHITE)
+        color = WHITE
+        while board.winner() is None:
+            dice = random_dice(rng)
+            cells = list(board.cells)
+            key = board.zobrist_key()
+            pips = board.pip_count(WHITE), board.pip_count(BLACK)
+
+            plays = list(legal_plays(board, color, dice))
+            for play in plays:
+                hits = board.apply_play(color, play)
+                assert_consistent(board)
+                board.undo_play(color, play, hits)
+                assert board.cells == cells
+                assert board.zobrist_key() == key
+                assert (board.pip_count(WHITE), board.pip_count(BLACK)) == pips
+
+            board.apply_play(color, rng.choice(plays))
+            assert_consistent(board)
+            color = OPPONENT[color]
+
+
+def test_undo_restores_hits():
+    cells = 28 * [0]
+    cells[5] = -1
+    cells[3] = 14
+    cells[2] = 1
+    cells[0] = -14
+    board = Board(cells)
+    board.zobrist_key()
+    board.pip_count(WHITE)
+    hit = board.apply_move(WHITE, 2, 5)
+    assert hit
+    assert board.cells[5] == 1
+    assert_consistent(board)
+    board.undo_move(WHITE, 2, 5, hit)
+    assert board.cells == cells
+    assert_consistent(board)
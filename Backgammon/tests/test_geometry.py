@@ -0,0 +1,55 @@
+from board import WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+from geometry import BoardGeometry, BOTTOM_CELLS, TOP_CELLS
+
+# Six slots of width 10 on each side of a bar as wide as a slot, and a tray of width 12.
+GEOMETRY = BoardGeometry(0, 0, 130, 100, 10, 12)
+EPSILON = 0.01
+
+
+def column_center(column):
+    """
+    Finds the x coordinate of the middle of one of the 14 columns of GEOMETRY.
+    """
+    return 136 if column == 13 else 10 * column + 5
+
+
+def test_column_centers():
+    for column in range(0, 14):
+        assert GEOMETRY.cell_at(column_center(column), 75) == BOTTOM_CELLS[column]
+        assert GEOMETRY.cell_at(column_center(column), 25) == TOP_CELLS[column]
+
+    cells = [GEOMETRY.cell_at(column_center(column), y) for column in range(0, 14) if column not in (6, 13)
+             for y in (25, 75)]
+    assert sorted(cells) == list(range(0, 24))
+
+
+def test_slot_edges():
+    for column in range(0, 6):
+        left = 10 * column
+        assert GEOMETRY.cell_at(left + EPSILON, 75) == BOTTOM_CELLS[column]
+        assert GEOMETRY.cell_at(left + 10 - EPSILON, 75) == BOTTOM_CELLS[column]
+    for column in range(7, 13):
+        left = 10 * column
+        assert GEOMETRY.cell_at(left + EPSILON, 25) == TOP_CELLS[column]
+        assert GEOMETRY.cell_at(left + 10 - EPSILON, 25) == TOP_CELLS[column]
+
+    assert GEOMETRY.cell_at(40, 50 - EPSILON) == TOP_CELLS[4]
+    assert GEOMETRY.cell_at(40, 50) == BOTTOM_CELLS[4]
+
+
+def test_bars_and_tray():
+    assert GEOMETRY.cell_at(60 + EPSILON, 75) == WHITE_BAR
+    assert GEOMETRY.cell_at(70 - EPSILON, 25) == BLACK_BAR
+    assert GEOMETRY.cell_at(60 - EPSILON, 75) == 5
+    assert GEOMETRY.cell_at(70 + EPSILON, 25) == 17
+
+    assert GEOMETRY.cell_at(130 + EPSILON, 75) == WHITE_OFF
+    assert GEOMETRY.cell_at(142, 25) == BLACK_OFF
+    assert GEOMETRY.cell_at(130 - EPSILON, 75) == 11
+
+
+def test_outside_the_board():
+    for x, y in ((-EPSILON, 50), (142 + EPSILON, 50), (65, -EPSILON), (65, 100 + EPSILON)):
+        assert GEOMETRY.cell_at(x, y) is None
+    for x, y in ((0, 0), (0, 100), (142, 0), (142, 100)):
+        assert GEOMETRY.cell_at(x, y) is not None
@@ -0,0 +1,93 @@
+from board import Board, WHITE, BLACK
+from move_generator import generate, legal_plays, legal_positions, playable_dice, first_moves
+from helpers import random_positions
+
+
+def brute_force(board, color, dice):
+    """
+    Finds the positions of every legal play by trying every checker with every die in every order on the board
+    itself, following the rules as Board.is_legal states them.
+    :return: a tuple of the set of position keys and the number of dice used
+    """
+    leaves = []
+
+    def expand(current, rest, used):
+        moved = False
+        for die in set(rest):
+            left = list(rest)
+            left.remove(die)
+            for from_slot in range(0, 26):
+                to_slot = current.is_legal(color, from_slot, die)
+                if to_slot >= 0:
+                    after = current.copy()
+                    after.apply_move(color, from_slot, to_slot)
+                    expand(after, left, used + (die,))
+                    moved = True
+        if not moved:
+            leaves.append((current.key(), used))
+
+    expand(board, list(dice), ())
+    best = max(len(used) for key, used in leaves)
+    leaves = [(key, used) for key, used in leaves if len(used) == best]
+    # A single die out of two different ones has to be the higher one whenever that one can be played.
+    if best == 1 and len(dice) == 2:
+        high = max(used[0] for key, used in leaves)
+        leaves = [(key, used) for key, used in leaves if used[0] == high]
+    return {key for key, used in leaves}, best
+
+
+def test_opening_rolls():
+    for color in (WHITE, BLACK):
+        for first in range(1, 7):
+            for second in range(first, 7):
+                dice = 4 * [first] if first == second else [first, second]
+                keys, best = brute_force(Board(), color, dice)
+                assert {after.key() for play, after in legal_positions(Board(), color, dice)} == keys
+                assert len(playable_dice(Board(), color, dice)) == best
+
+
+def test_matches_brute_force():
+    for board, color, dice in random_positions(40):
+        keys, best = brute_force(board, color, dice)
+        results, used = generate(board.cells, color, dice)
+        assert set(results) == keys
+        assert len(used) == best
+
+
+def test_plays_lead_to_their_positions():
+    for board, color, dice in random_positions(10):
+        for play, after in legal_positions(board, color, dice):
+            replayed = board.copy()
+            for from_slot, to_slot in play:
+                replayed.apply_move(color, from_slot, to_slot)
+            assert replayed.key() == after.key()
+
+
+def test_first_moves_begin_legal_plays():
+    for board, color, dice in random_positions(10):
+        keys = {after.key() for play, after in legal_positions(board, color, dice)}
+        for play in legal_plays(board, color, dice):
+            current = board.copy()
+            rest = list(dice)
+            for move in play:
+                moves = first_moves(current, color, rest)
+                assert move in moves
+                rest.remove(moves[move][0])
+                current.apply_move(color, *move)
+            assert current.key() in keys
+
+
+def test_first_moves_keep_every_die():
+    # White on 12 and 14 with the rest of its checkers on 11, facing Black points on 19 and 20: after 12/13 the 6
+    # cannot be played, so only the plays using both dice may be started.
+    cells = 28 * [0]
+    cells[11] = 13
+    cells[12] = 1
+    cells[14] = 1
+    cells[19] = -2
+    cells[20] = -2
+    cells[0] = -11
+    moves = first_moves(Board(cells), WHITE, [6, 1])
+    assert (12, 13) not in moves
+    assert moves[(12, 18)] == [6]
+    assert moves[(14, 15)] == [1]
@@ -0,0 +1,41 @@
+import random
+
+from dice import SeededDice
+from position_index import PositionIndex
+from record import RecordWriter
+from simulation import play_game
+from helpers import random_policy, random_game
+
+
+def test_unfinished_game_is_indexed_once_ended(tmp_path):
+    path = str(tmp_path / 'games.bgr')
+    writer = RecordWriter(path)
+    for seed in range(0, 2):
+        rng = random.Random(seed)
+        play_game(random_policy(rng), random_policy(rng), SeededDice(seed), writer, seed)
+
+    turns = random_game(2)
+    writer.start_game(2, turns[0][1])
+    for board, color, dice, play in turns[0:10]:
+        writer.add_turn(dice, play)
+    writer.flush()
+
+    index = PositionIndex(str(tmp_path / 'positions.db'))
+    assert index.add_records(path) == 2
+    games, positions, distinct = index.statistics()
+    assert games == 2
+
+    for board, color, dice, play in turns[10:]:
+        writer.add_turn(dice, play)
+    board, color, dice, play = turns[-1]
+    for from_slot, to_slot in play:
+        board.apply_move(color, from_slot, to_slot)
+    writer.end_game(board.winner(), board.result(board.winner()))
+    writer.close()
+
+    assert index.add_records(path) == 1
+    assert index.add_records(path) == 0
+    assert index.statistics()[0:2] == (3, positions + len(turns))
+    board, color, dice, play = turns[20]
+    assert (path, 2, 20) in index.games_reaching(board, color)
+    index.close()
@@ -0,0 +1,80 @@
+import os
+import random
+
+import pytest
+
+from dice import SeededDice
+from record import RecordWriter, RecordReader, encode_move, decode_move, export_match, import_match, parse_game
+from simulation import play_game
+from helpers import random_policy, random_game
+
+
+def write_games(path, count):
+    """
+    Plays games between random policies and appends them to a record file.
+    :param path: the path of the record file
+    :param count: the number of games
+    :return: the list of the (winner, points, history) tuples of the games
+    """
+    writer = RecordWriter(path)
+    games = []
+    for seed in range(0, count):
+        rng = random.Random(seed)
+        games.append(play_game(random_policy(rng), random_policy(rng), SeededDice(seed), writer, seed))
+    writer.close()
+    return games
+
+
+def test_move_codes():
+    for seed in range(0, 10):
+        for board, color, dice, play in random_game(seed):
+            for from_slot, to_slot in play:
+                value = encode_move(color, from_slot, to_slot)
+                assert 0 <= value < 256
+                assert decode_move(color, value) == (from_slot, to_slot)
+
+
+def test_binary_round_trip(tmp_path):
+    path = str(tmp_path / 'games.bgr')
+    games = write_games(path, 30)
+    records = list(RecordReader(path).games())
+    assert len(records) == len(games)
+
+    for record, (winner, points, history) in zip(records, games):
+        assert record.winner == winner
+        assert record.points == points
+        assert record.color == history[0][0]
+        assert [play for dice, play in record.turns] == [tuple(play) for color, dice, play, position in history]
+        assert record.replay().pack() == history[-1][3]
+
+
+def test_match_round_trip(tmp_path):
+    path = str(tmp_path / 'games.bgr')
+    write_games(path, 30)
+    assert export_match(path, str(tmp_path / 'games.txt'), 2) == 30
+    assert import_match(str(tmp_path / 'games.txt'), str(tmp_path / 'imported.bgr'), 2) == 30
+
+    for record, imported in zip(RecordReader(path).games(), RecordReader(str(tmp_path / 'imported.bgr')).games()):
+        assert (imported.color, imported.winner, imported.points) == (record.color, record.winner, record.points)
+        assert len(imported.turns) == len(record.turns)
+        for turn in range(0, len(record.turns) + 1):
+            assert imported.replay(turn).key() == record.replay(turn).key()
+
+
+def test_discard_game(tmp_path):
+    path = str(tmp_path / 'games.bgr')
+    games = write_games(path, 2)
+    size = os.path.getsize(path)
+
+    writer = RecordWriter(path)
+    writer.start_game(0, 'White')
+    writer.add_turn([3, 1], ((0, 4), (0, 2)))
+    writer.discard_game()
+    writer.close()
+    assert os.path.getsize(path) == size
+    assert [record.winner for record in RecordReader(path).games()] == [winner for winner, points, history in games]
+
+
+def test_unreadable_result():
+    with pytest.raises(ValueError, match='Wins a point'):
+        parse_game(' Game 1\n  1) 31: 8/5 6/5\n                                  Wins a point\n')
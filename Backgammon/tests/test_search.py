@@ -0,0 +1,72 @@
+import random
+
+from board import Board, WHITE, BLACK, OPPONENT, WHITE_OFF, BLACK_OFF
+from dice import ROLLS
+from evaluation import evaluate, LOWER, UPPER
+from move_generator import legal_positions
+from search import ExpectiminimaxSearch, SearchLimit
+from simulation import dice_to_moves
+from helpers import random_positions
+
+
+def play_values(board, color, dice, depth):
+    """
+    Computes the value of every play of a roll with a plain expectimax, without any pruning or table.
+    :return: a dictionary from plays to their values for the colour making them
+    """
+    return {play: -chance_value(after, OPPONENT[color], depth - 1)
+            for play, after in legal_positions(board, color, dice)}
+
+
+def chance_value(board, color, depth):
+    """
+    Computes the expected value of a position over the rolls of the colour about to roll, for that colour.
+    """
+    if depth == 0 or board.winner() is not None:
+        return -evaluate(board, OPPONENT[color])
+    return sum(probability * max(play_values(board, color, dice_to_moves(*dice), depth).values())
+               for dice, probability in ROLLS)
+
+
+def small_positions(count):
+    """
+    Creates positions with a few checkers of each colour left in contact, the others being borne off, where a plain
+    expectimax can look three plies ahead quickly.
+    :return: a list of (board, color, dice) tuples
+    """
+    rng = random.Random(count)
+    positions = []
+    while len(positions) < count:
+        cells = 28 * [0]
+        for sign, off in ((1, WHITE_OFF), (-1, BLACK_OFF)):
+            for slot in rng.sample([slot for slot in range(0, 24) if cells[slot] == 0], 2):
+                cells[slot] = sign
+            cells[off] = 13
+        board = Board(cells)
+        if board.has_contact():
+            positions.append((board, rng.choice((WHITE, BLACK)), dice_to_moves(rng.randint(1, 6), rng.randint(1, 6))))
+    return positions
+
+
+def check_search(board, color, dice, depth):
+    values = play_values(board, color, dice, depth)
+    search = ExpectiminimaxSearch(max_depth=depth, time_budget=1e9)
+    play = search.choose_play(board, color, dice)
+    assert abs(values[play] - max(values.values())) < 1e-9
+    if len(values) > 1:
+        assert search.depth_reached == depth
+
+    # With the full window the pruned search is exact for every play, the table being reused from one to the next.
+    limit = SearchLimit(float('inf'))
+    for play, value in values.items():
+        assert abs(search.child_value(board.copy(), play, color, depth, LOWER, UPPER, limit) - value) < 1e-9
+
+
+def test_depth_2_matches_expectimax():
+    for board, color, dice in random_positions(3, every=15)[0:6]:
+        check_search(board, color, dice, 2)
+
+
+def test_depth_3_matches_expectimax():
+    for board, color, dice in small_positions(6):
+        check_search(board, color, dice, 3)
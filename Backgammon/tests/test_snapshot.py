@@ -0,0 +1,39 @@
+from board import Board, WHITE, BLACK, WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+from snapshot import pack_snapshot, unpack_snapshot, write_snapshot, read_snapshot
+from status import Status
+
+
+def mid_game_board():
+    """
+    Builds a position with checkers of both colours on the bar and borne off.
+    """
+    cells = 28 * [0]
+    for slot, count in ((6, 5), (4, 3), (23, 2), (WHITE_BAR, 2), (WHITE_OFF, 3)):
+        cells[slot] = count
+    for slot, count in ((0, -5), (17, -3), (19, -2)):
+        cells[slot] = count
+    cells[BLACK_BAR] = 1
+    cells[BLACK_OFF] = 4
+    return Board(cells)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'saved_game.bin')
+    board = mid_game_board()
+    write_snapshot(path, pack_snapshot(board, [4, 4], [4, 4, 4], BLACK, Status.MOVE))
+    restored, dice, moves, turn, status = unpack_snapshot(read_snapshot(path))
+
+    assert restored.cells == board.cells
+    assert (restored.cells[WHITE_BAR], restored.cells[BLACK_BAR]) == (2, 1)
+    assert (restored.cells[WHITE_OFF], restored.cells[BLACK_OFF]) == (3, 4)
+    assert restored.pip_count(WHITE) == board.pip_count(WHITE)
+    assert restored.pip_count(BLACK) == board.pip_count(BLACK)
+    assert (dice, moves, turn, status) == ([4, 4], [4, 4, 4], BLACK, Status.MOVE)
+
+
+def test_opening_roll_round_trip(tmp_path):
+    path = str(tmp_path / 'saved_game.bin')
+    write_snapshot(path, pack_snapshot(Board(), [5, 2], [], 'none_2', Status.ROLL))
+    board, dice, moves, turn, status = unpack_snapshot(read_snapshot(path))
+    assert board.cells == Board().cells
+    assert (dice, moves, turn, status) == ([5, 2], [], 'none_2', Status.ROLL)
@@ -0,0 +1,177 @@
+import os
+import math
+import time
+import random
+import argparse
+import itertools
+import multiprocessing
+
+import bots
+from game_modes import GameMode
+from board import WHITE
+from dice import SeededDice
+from simulation import play_game
+from record import RecordWriter
+
+BOTS = {'easy': GameMode.EASY, 'medium': GameMode.MEDIUM, 'hard': GameMode.HARD}
+
+
+class TimedPolicy:
+    def __init__(self, game_mode, rng):
+        """
+        A computer player for headless games which keeps track of the time spent choosing its plays.
+        :param game_mode: the GameMode of the computer
+        :param rng: the random.Random used for the EASY computer's choices
+        """
+        self.game_mode = game_mode
+        self.rng = rng
+        self.seconds = 0.0
+        self.moves = 0
+
+    def __call__(self, board, color, dice):
+        """
+        Chooses a play, as a policy of simulation.play_game.
+        :param board: the Board on which the play is made
+        :param color: the colour played by the computer
+        :param dice: the list of dice to be played
+        :return: the chosen play
+        """
+        start = time.perf_counter()
+        play = bots.choose_play(board, color, dice, self.game_mode, self.rng)
+        self.seconds += time.perf_counter() - start
+        self.moves += 1
+        return play
+
+
+def play_games(task):
+    """
+    Plays a chunk of the games of a pairing in a worker process. Every game has its own seed, derived from the
+    tournament seed, the pairing and the game's number, so the results do not depend on how the games are split.
+    The first bot plays White in the even games and Black in the odd ones, and the HARD search starts every game
+    with an empty transposition table.
+    :param task: a tuple of the two bot names, the first game number, the number of games, the tournament seed,
+    the time budget and the maximum depth of the HARD search, and the directory in which the games are recorded, or
+    None
+    :return: a tuple of the two bot names and a list of (first_won, points, first_seconds, first_moves,
+    second_seconds, second_moves) tuples
+    """
+    first, second, start, count, seed, hard_time, hard_depth, record = task
+    bots.hard_search.time_budget = hard_time
+    bots.hard_search.max_depth = hard_depth
+    writer = None if record is None else RecordWriter(os.path.join(record, f'{first}-{second}-{start}.bgr'))
+
+    results = []
+    for index in range(start, start + count):
+        name = f'{seed}-{first}-{second}-{index}'
+        policies = [TimedPolicy(BOTS[first], random.Random(name + '-first')),
+                    TimedPolicy(BOTS[second], random.Random(name + '-second'))]
+        white, black = policies if index % 2 == 0 else policies[::-1]
+        bots.hard_search.table.clear()
+
+        winner, points, history = play_game(white, black, SeededDice([seed, list(BOTS).index(first),
+                                                                      list(BOTS).index(second), index]),
+                                            writer, seed)
+        first_won = (winner == WHITE) == (index % 2 == 0)
+        results.append((first_won, points, policies[0].seconds, policies[0].moves, policies[1].seconds,
+                        policies[1].moves))
+
+    if writer is not None:
+        writer.close()
+    return first, second, results
+
+
+def wilson_interval(successes, trials, z=1.96):
+    """
+    Computes the Wilson score interval of a proportion.
+    :param successes: the number of successes
+    :param trials: the number of trials
+    :param z: the quantile of the normal distribution, 1.96 giving a 95% interval
+    :return: a (low, high) tuple
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    proportion = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (proportion + z * z / (2 * trials)) / denominator
+    spread = z * math.sqrt(proportion * (1 - proportion) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - spread, centre + spread
+
+
+def report(first, second, results):
+    """
+    Prints the strength and speed statistics of a pairing.
+    :param first: the name of the first bot
+    :param second: the name of the second bot
+    :param results: the list of result tuples returned by play_games
+    """
+    games = len(results)
+    wins = sum(1 for result in results if result[0])
+    gammons = [sum(1 for result in results if result[0] == won and result[1] >= 2) for won in (True, False)]
+    backgammons = [sum(1 for result in results if result[0] == won and result[1] == 3) for won in (True, False)]
+    points = sum(result[1] if result[0] else -result[1] for result in results)
+    low, high = wilson_interval(wins, games)
+
+    first_speed = 1000 * sum(result[2] for result in results) / max(sum(result[3] for result in results), 1)
+    second_speed = 1000 * sum(result[4] for result in results) / max(sum(result[5] for result in results), 1)
+
+    print(f'{first} vs {second}: {games} games, {first} wins {100 * wins / games:.1f}% '
+          f'(95% CI {100 * low:.1f}%-{100 * high:.1f}%), {points / games:+.3f} points/game')
+    print(f'    gammons {100 * gammons[0] / games:.1f}% / {100 * gammons[1] / games:.1f}%, '
+          f'backgammons {100 * backgammons[0] / games:.1f}% / {100 * backgammons[1] / games:.1f}%')
+    print(f'    {first} {first_speed:.2f} ms/move, {second} {second_speed:.2f} ms/move')
+
+
+def run_tournament(names, games, processes, seed, chunk, hard_time, hard_depth, record=None):
+    """
+    Plays every pairing of the given bots across a process pool and prints the results of each one.
+    :param names: the names of the bots, keys of BOTS
+    :param games: the number of games per pairing
+    :param processes: the number of worker processes
+    :param seed: the tournament seed
+    :param chunk: the number of games sent to a worker at once
+    :param hard_time: the time budget of the HARD search, in seconds
+    :param hard_depth: the maximum depth of the HARD search
+    :param record: the directory in which the games are recorded, one file per chunk, or None
+    """
+    tasks = []
+    for first, second in itertools.combinations(names, 2):
+        for start in range(0, games, chunk):
+            tasks.append((first, second, start, min(chunk, games - start), seed, hard_time, hard_depth, record))
+
+    results = {pairing: [] for pairing in itertools.combinations(names, 2)}
+    begin = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        for first, second, chunk_results in pool.imap_unordered(play_games, tasks):
+            results[(first, second)].extend(chunk_results)
+    elapsed = time.perf_counter() - begin
+
+    total = 0
+    for (first, second), pairing_results in results.items():
+        report(first, second, pairing_results)
+        total += len(pairing_results)
+    print(f'{total} games in {elapsed:.1f} s, {total / elapsed:.1f} games/s on {processes} processes')
+
+
+def main():
+    """
+    Command line entry point of the tournament runner.
+    """
+    parser = argparse.ArgumentParser(description='Plays the computer difficulties against each other.')
+    parser.add_argument('--bots', nargs='+', choices=sorted(BOTS), default=['easy', 'medium', 'hard'])
+    parser.add_argument('--games', type=int, default=100, help='number of games per pairing')
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk', type=int, default=10, help='number of games sent to a worker at once')
+    parser.add_argument('--hard-time', type=float, default=bots.HARD_TIME_BUDGET,
+                        help='time budget of the HARD search in seconds')
+    parser.add_argument('--hard-depth', type=int, default=bots.HARD_MAX_DEPTH,
+                        help='maximum depth of the HARD search, reproducible when reached within the time budget')
+    parser.add_argument('--record', help='directory in which the games are recorded')
+    arguments = parser.parse_args()
+
+    run_tournament(arguments.bots, arguments.games, arguments.processes, arguments.seed, arguments.chunk,
+                   arguments.hard_time, arguments.hard_depth, arguments.record)
+
+
+if __name__ == '__main__':
+    main()
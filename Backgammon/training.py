@@ -0,0 +1,166 @@
+import os
+import time
+import argparse
+import multiprocessing
+
+import numpy as np
+
+from board import OPPONENT, CELLS
+from dice import SeededDice
+from simulation import play_game
+from record import RecordWriter
+from move_generator import legal_positions
+from network import NeuralNetwork, INPUTS, encode, load_network
+
+
+def greedy_policy(network):
+    """
+    Builds a policy which plays the move the network values the most, scoring all candidates in one forward pass.
+    :param network: the NeuralNetwork used for scoring the positions
+    :return: a function (board, color, dice) returning the chosen play
+    """
+    def policy(board, color, dice):
+        candidates = list(legal_positions(board, color, dice))
+        values = network.evaluate_boards([after for play, after in candidates], color)
+        return candidates[int(values.argmax())][0]
+    return policy
+
+
+def self_play(task):
+    """
+    Plays a number of headless games of the network against itself, in a worker process.
+    :param task: a tuple of the flat network parameters, the number of games, the seed of the dice and the directory in
+    which the games are recorded, or None
+    :return: a list of (first_color, cells, points) trajectories, cells holding the position after every turn
+    """
+    parameters, games, seed, record = task
+    policy = greedy_policy(NeuralNetwork(parameters=parameters))
+    dice_source = SeededDice(seed)
+    writer = None if record is None else RecordWriter(os.path.join(record, f'self-play-{seed}.bgr'))
+
+    trajectories = []
+    for i in range(0, games):
+        winner, points, history = play_game(policy, policy, dice_source, writer, seed)
+        cells = np.frombuffer(b''.join(entry[3] for entry in history), dtype=np.int8).reshape(-1, CELLS)
+        trajectories.append((history[0][0], cells, points))
+
+    if writer is not None:
+        writer.close()
+    return trajectories
+
+
+def flip(values):
+    """
+    Turns outputs seen by one colour into the outputs seen by the other one.
+    :param values: an array whose last axis holds the win, gammon win and gammon loss probabilities
+    :return: the array of the same probabilities for the other colour
+    """
+    return np.stack([1 - values[..., 0], values[..., 2], values[..., 1]], axis=-1)
+
+
+def td_lambda_update(network, first_color, cells, points, trace_decay, learning_rate):
+    """
+    Applies the TD(lambda) update of a whole game, using the lambda-returns of its positions as targets.
+    Every position is seen by the colour which has just moved, the colours alternating from turn to turn, and the
+    last position is worth a win (and a gammon if more than one point was won) for the colour that reached it.
+    :param network: the NeuralNetwork being trained
+    :param first_color: the colour which made the first play of the game
+    :param cells: a 2-D array with the position reached after every turn
+    :param points: the points won at the end of the game
+    :param trace_decay: lambda, weighting the later returns against the immediate next estimate
+    :param learning_rate: the size of the gradient step
+    :return: the mean squared error of the game before the update
+    """
+    inputs = np.empty((len(cells), INPUTS), dtype=np.float32)
+    inputs[0::2] = encode(cells[0::2], first_color)
+    inputs[1::2] = encode(cells[1::2], OPPONENT[first_color])
+
+    following = flip(network.forward(inputs[1:]))
+    targets = np.empty((len(cells), 3), dtype=np.float32)
+    targets[-1] = [1, float(points >= 2), 0]
+    for t in range(len(cells) - 2, -1, -1):
+        targets[t] = (1 - trace_decay) * following[t] + trace_decay * flip(targets[t + 1])
+
+    return network.train(inputs, targets, learning_rate)
+
+
+def train(network, games, processes, games_per_task, trace_decay, learning_rate, checkpoint_every, checkpoint_dir,
+          seed=0, record=None):
+    """
+    Trains a network by self-play: the workers of a process pool play games with a copy of the current weights and
+    send their trajectories back, while this process applies the TD(lambda) updates and writes the checkpoints.
+    :param network: the NeuralNetwork to be trained, with writable parameters
+    :param games: the total number of games to be played
+    :param processes: the number of worker processes
+    :param games_per_task: the number of games a worker plays before the weights are refreshed
+    :param trace_decay: lambda of the TD(lambda) updates
+    :param learning_rate: the size of the gradient steps
+    :param checkpoint_every: the number of games between two checkpoints
+    :param checkpoint_dir: the directory in which the checkpoints are written
+    :param seed: the seed from which the dice of every task are derived
+    :param record: the directory in which the self-play games are recorded, one file per task, or None
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    played = 0
+    positions = 0
+    task_index = 0
+    next_checkpoint = checkpoint_every
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(processes) as pool:
+        while played < games:
+            tasks = []
+            for i in range(0, processes):
+                tasks.append((network.parameters, games_per_task, seed * 1000003 + task_index, record))
+                task_index += 1
+
+            error = 0.0
+            for trajectories in pool.imap_unordered(self_play, tasks):
+                for first_color, cells, points in trajectories:
+                    error += td_lambda_update(network, first_color, cells, points, trace_decay, learning_rate)
+                    played += 1
+                    positions += len(cells)
+
+            elapsed = time.perf_counter() - start
+            print(f'{played} games, {played / elapsed:.1f} games/s, {positions / elapsed:.0f} positions/s, '
+                  f'error {error / (processes * games_per_task):.4f}')
+
+            if played >= next_checkpoint:
+                network.save(os.path.join(checkpoint_dir, f'network-{played}.npy'))
+                next_checkpoint += checkpoint_every
+
+
+def main():
+    """
+    Command line entry point of the self-play trainer.
+    """
+    parser = argparse.ArgumentParser(description='Trains the HARD evaluator by TD(lambda) self-play.')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--processes', type=int, default=os.cpu_count())
+    parser.add_argument('--games-per-task', type=int, default=10)
+    parser.add_argument('--hidden', type=int, default=80)
+    parser.add_argument('--trace-decay', type=float, default=0.7)
+    parser.add_argument('--learning-rate', type=float, default=0.1)
+    parser.add_argument('--checkpoint-every', type=int, default=1000)
+    parser.add_argument('--checkpoint-dir', default='weights/checkpoints')
+    parser.add_argument('--output', default='weights/network.npy')
+    parser.add_argument('--resume', action='store_true', help='continue training from the weights in --output')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--record', help='directory in which the self-play games are recorded')
+    arguments = parser.parse_args()
+
+    if arguments.resume:
+        network = NeuralNetwork(parameters=np.array(load_network(arguments.output).parameters))
+    else:
+        network = NeuralNetwork(hidden=arguments.hidden, seed=arguments.seed)
+
+    train(network, arguments.games, arguments.processes, arguments.games_per_task, arguments.trace_decay,
+          arguments.learning_rate, arguments.checkpoint_every, arguments.checkpoint_dir, arguments.seed,
+          arguments.record)
+
+    os.makedirs(os.path.dirname(arguments.output) or '.', exist_ok=True)
+    network.save(arguments.output)
+
+
+if __name__ == '__main__':
+    main()
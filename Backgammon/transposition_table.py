@@ -0,0 +1,95 @@
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    def __init__(self, size=2 ** 16):
+        """
+        A bounded table of search results keyed by Zobrist hash. Every bucket holds two entries: one which is only
+        replaced by results searched at least as deep, and one which always takes the latest result.
+        Entries are (key, depth, bound, value, best_play) tuples.
+        :param size: the number of buckets, rounded down to a power of two
+        """
+        self.size = 1 << (max(size, 1).bit_length() - 1)
+        self.mask = self.size - 1
+        self.deep = self.size * [None]
+        self.recent = self.size * [None]
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def probe(self, key):
+        """
+        Looks a position up in the table.
+        :param key: the Zobrist hash of the node
+        :return: the (key, depth, bound, value, best_play) entry, or None if the node is not stored
+        """
+        self.probes += 1
+        index = key & self.mask
+
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, bound, value, best_play=None):
+        """
+        Stores the result of a search, in the depth-preferred entry of its bucket if it was searched at least as
+        deep as the result already there and in the always-replace entry otherwise.
+        :param key: the Zobrist hash of the node
+        :param depth: the number of plies which were searched below the node
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND, depending on how the value compared to the search window
+        :param value: the value found by the search
+        :param best_play: the best play found at a max node, None at chance nodes
+        """
+        self.stores += 1
+        index = key & self.mask
+        entry = (key, depth, bound, value, best_play)
+
+        deep = self.deep[index]
+        if deep is None or deep[0] == key or deep[1] <= depth:
+            if deep is not None and deep[0] != key:
+                self.overwrites += 1
+                self.recent[index] = deep
+            self.deep[index] = entry
+        else:
+            if self.recent[index] is not None and self.recent[index][0] != key:
+                self.overwrites += 1
+            self.recent[index] = entry
+
+    def clear(self):
+        """
+        Empties the table and resets its statistics.
+        """
+        self.deep = self.size * [None]
+        self.recent = self.size * [None]
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def hit_rate(self):
+        """
+        Gets the share of probes which found their node in the table.
+        :return: a float between 0 and 1
+        """
+        if self.probes == 0:
+            return 0.0
+        return self.hits / self.probes
+
+    def statistics(self):
+        """
+        Collects the counters used for tuning the size of the table against the memory it takes.
+        :return: a dictionary with the size, fill, probes, hits, hit rate, stores and overwrites of the table
+        """
+        filled = sum(1 for entry in self.deep + self.recent if entry is not None)
+        return {'buckets': self.size, 'filled': filled, 'probes': self.probes, 'hits': self.hits,
+                'hit_rate': self.hit_rate(), 'stores': self.stores, 'overwrites': self.overwrites}
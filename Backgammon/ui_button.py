@@ -1,4 +1,6 @@
 class UIButton:
+    __slots__ = ('index', 'image')
+
     def __init__(self, index=None, image=None):
         """
         An object for better managing the button-related information such as the image and the canvas widget index.
@@ -0,0 +1,30 @@
+import random
+
+# A fixed seed keeps the keys identical between runs, so that hashes can be stored in files such as the opening book.
+KEY_GENERATOR = random.Random(0x5EED)
+
+# One key for every cell and every value it can hold, points going from -15 (Black) to 15 (White).
+CELL_KEYS = [[KEY_GENERATOR.getrandbits(64) for value in range(0, 31)] for cell in range(0, 28)]
+SIDE_KEYS = {'White': KEY_GENERATOR.getrandbits(64), 'Black': KEY_GENERATOR.getrandbits(64)}
+ROLL_KEYS = {(first, second): KEY_GENERATOR.getrandbits(64) for first in range(1, 7) for second in range(first, 7)}
+
+
+def zobrist_hash(cells):
+    """
+    Computes the Zobrist hash of a position from scratch.
+    :param cells: the 28 cells of a board
+    :return: a 64-bit integer
+    """
+    key = 0
+    for cell, value in enumerate(cells):
+        key ^= CELL_KEYS[cell][value + 15]
+    return key
+
+
+def roll_key(dice):
+    """
+    Gets the key mixed into a position's hash for a roll, whatever the order of the dice.
+    :param dice: the list of dice of the roll, doubles being given either as two or four values
+    :return: a 64-bit integer
+    """
+    return ROLL_KEYS[(min(dice), max(dice))]